@@ -3,6 +3,7 @@ from pathlib import Path
 
 import dj_database_url
 
+from backend import sqlite
 from backend.settings import *  # noqa: F403
 
 DEBUG = False
@@ -14,11 +15,37 @@ EMAIL_INVITATION_BASE_URL = "https://osu-web.fly.dev"
 FRONTEND_URL = "https://osu-web.fly.dev"
 
 DATA_DIR = Path("/data")
+# Seconds that connections are kept open between requests, and checked before reuse. The ASGI
+# server runs each request's sync code in a thread of its own, which never reuses a connection,
+# so they are closed after each request. The jobs worker runs in one long-lived thread, and
+# deploy/start.sh has it keep its connection.
+CONN_MAX_AGE = int(os.environ.get("CONN_MAX_AGE", "0"))
 if os.environ.get("DATABASE_URL"):
-    DATABASES["default"] = dj_database_url.config()  # type: ignore[assignment]  # noqa: F405
+    DATABASES["default"] = dj_database_url.config(  # type: ignore[assignment]  # noqa: F405
+        conn_max_age=CONN_MAX_AGE, conn_health_checks=True
+    )
 else:
-    DATABASES["default"]["NAME"] = DATA_DIR / "production.db.sqlite"  # noqa: F405
+    DATABASES["default"] = sqlite.get_database(  # noqa: F405
+        DATA_DIR / "production.db.sqlite", CONN_MAX_AGE
+    )
+
+# Public reads go to a replica when there is one: the database of REPLICA_DATABASE_URL, or with
+# SQLITE_READ_REPLICA, a copy of the SQLite database kept by the refresh_read_replica command
+if os.environ.get("REPLICA_DATABASE_URL"):
+    DATABASES["replica"] = dj_database_url.config(  # type: ignore[assignment]  # noqa: F405
+        "REPLICA_DATABASE_URL", conn_max_age=CONN_MAX_AGE, conn_health_checks=True
+    )
+    READ_REPLICA_DATABASE = "replica"
+elif not os.environ.get("DATABASE_URL") and bool(int(os.environ.get("SQLITE_READ_REPLICA", "0"))):
+    READ_REPLICA_SQLITE_PATH = DATA_DIR / "replica.db.sqlite"
+    DATABASES["replica"] = sqlite.get_replica_database(READ_REPLICA_SQLITE_PATH)  # noqa: F405
+    READ_REPLICA_DATABASE = "replica"
+
 MEDIA_ROOT = DATA_DIR / "media"
+
+# Score submissions queue their recomputations for the worker started by deploy/start.sh
+TOURNAMENT_JOBS_EAGER = False
+SERIALIZE_WRITES = bool(int(os.environ.get("SERIALIZE_WRITES", "0")))
 MEDIA_URL = "/media/"
 
 SENTRY_DSN = os.environ.get("SENTRY_DSN")
@@ -11,6 +11,7 @@ https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
 import os
+import tempfile
 from pathlib import Path
 
 from dotenv import load_dotenv
@@ -56,6 +57,11 @@ INSTALLED_APPS = [
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "corsheaders.middleware.CorsMiddleware",
+    "osu.compression.CompressionMiddleware",
+    "django.middleware.http.ConditionalGetMiddleware",
+    # Before the sessions, whose middleware saves them after the view
+    "osu.writes.WriteQueueMiddleware",
+    "osu.replica.PrimaryPinMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "django.middleware.common.CommonMiddleware",
     "django.middleware.csrf.CsrfViewMiddleware",
@@ -105,10 +111,80 @@ DATABASES = {
     "default": {
         "ENGINE": "django.db.backends.sqlite3",
         "NAME": BASE_DIR / "db.sqlite3",
+        "OPTIONS": {
+            # Transactions take the write lock when they begin, which is how SQLite locks the
+            # rows that PostgreSQL locks with select_for_update. Concurrent transactions then
+            # wait for the lock, instead of failing when they read before they write.
+            "transaction_mode": "IMMEDIATE",
+        },
     }
 }
 
 
+# Database that the public reads of the API go to, see osu/replica.py
+READ_REPLICA_DATABASE: str | None = None
+DATABASE_ROUTERS = ["osu.replica.ReadReplicaRouter"]
+# Seconds after a write during which the client reads from the default database, which
+# needs to be longer than the replica takes to catch up
+READ_REPLICA_PIN_SECONDS = 15
+# SQLite copy kept as the replica by the refresh_read_replica command, and the seconds
+# between its refreshes
+READ_REPLICA_SQLITE_PATH: Path | None = None
+READ_REPLICA_REFRESH_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.1/topics/cache/
+
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+    }
+}
+
+# Cached public tournament pages are keyed by the tournament's version, so this only bounds
+# how long a change that does not bump the version (e.g. from the admin) can go unseen
+TOURNAMENT_CACHE_TIMEOUT = 5 * 60
+
+# Responses smaller than this many bytes are not compressed
+RESPONSE_COMPRESSION_MIN_BYTES = 1024
+# Brotli quality of compressed responses, from 0 to 11, where the higher levels cost far
+# more time for a little less size
+RESPONSE_BROTLI_QUALITY = 5
+
+# Seconds between checks of the version of a tournament with open event streams, which is how
+# the streams learn of changes made by other server processes
+TOURNAMENT_EVENTS_POLL_SECONDS = 2
+# Seconds without events after which a stream is sent a comment to keep it open
+TOURNAMENT_EVENTS_HEARTBEAT_SECONDS = 15
+# Seconds that published events are kept for the pollers, which read them every few seconds.
+# The jobs worker deletes the older ones.
+TOURNAMENT_EVENTS_RETENTION_SECONDS = 10 * 60
+
+# Run the recomputations that follow score submissions in the submitting request, instead of
+# queueing them for the run_tournament_jobs worker
+TOURNAMENT_JOBS_EAGER = True
+# Seconds between checks of the job queue by a worker that has run all the queued jobs
+TOURNAMENT_JOBS_POLL_SECONDS = 1
+# Runs of a job before it is given up. A match result that fails them all is then applied with
+# a full rescan of the tournament's fixtures instead.
+TOURNAMENT_JOB_MAX_ATTEMPTS = 3
+
+# Have the requests with unsafe methods, and the tournament jobs, write to the database one at
+# a time, in the order they arrive, across the server processes of the machine
+SERIALIZE_WRITES = False
+# Directory of the queue of the writers, shared by the processes
+WRITE_QUEUE_DIR = Path(tempfile.gettempdir()) / "osu-write-queue"
+# Seconds before a waiting writer checks the writer ahead of it again, doubled after each check
+# up to the maximum
+WRITE_QUEUE_POLL_SECONDS = 0.002
+WRITE_QUEUE_MAX_POLL_SECONDS = 0.05
+# Waits for a turn longer than this many seconds are logged as warnings
+WRITE_QUEUE_SLOW_SECONDS = 1
+# Seconds after which a writer stops waiting for its turn, and its request fails with a 503
+WRITE_QUEUE_TIMEOUT_SECONDS = 30
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
@@ -0,0 +1,62 @@
+"""
+Tuning of the SQLite database that production falls back to without a DATABASE_URL, and of
+its read replica.
+
+Django runs the pragmas on every new connection, through the backend's init_command option:
+
+- WAL journal: reads see the last commit while a transaction writes, instead of waiting for it
+- synchronous NORMAL: commits are synced at checkpoints only, which is durable with WAL
+  across crashes of the process, but can lose the last commits on a power loss
+- busy_timeout: a connection waits this many milliseconds for another one's write lock
+- cache_size: pages kept in memory per connection, negative values are in KiB
+- mmap_size: bytes of the database file read through memory mapping
+"""
+from pathlib import Path
+from typing import Any
+
+PRODUCTION_PRAGMAS: dict[str, str | int] = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "busy_timeout": 5000,
+    "cache_size": -20000,
+    "mmap_size": 128 * 1024 * 1024,
+}
+
+
+def get_init_command(pragmas: dict[str, str | int]) -> str:
+    return ";".join(f"PRAGMA {name}={value}" for name, value in pragmas.items())
+
+
+def get_options(pragmas: dict[str, str | int] = PRODUCTION_PRAGMAS) -> dict[str, Any]:
+    """Connection options of a database with the pragmas, and immediate transactions"""
+    return {
+        "transaction_mode": "IMMEDIATE",
+        "init_command": get_init_command(pragmas),
+    }
+
+
+def get_database(name: Path | str, conn_max_age: int) -> dict[str, Any]:
+    """Database of the profile, with connections kept open and checked before they are reused"""
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": name,
+        "OPTIONS": get_options(),
+        "CONN_MAX_AGE": conn_max_age,
+        "CONN_HEALTH_CHECKS": True,
+    }
+
+
+def get_replica_database(name: Path) -> dict[str, Any]:
+    """
+    Read-only database of a copy that is replaced when it is refreshed. Its connections are
+    not kept, so that each request reads the latest copy.
+    """
+    pragmas = {
+        pragma: PRODUCTION_PRAGMAS[pragma] for pragma in ["busy_timeout", "cache_size", "mmap_size"]
+    }
+    return {
+        "ENGINE": "django.db.backends.sqlite3",
+        "NAME": f"file:{name}?mode=ro",
+        "OPTIONS": {"init_command": get_init_command(pragmas)},
+        "CONN_MAX_AGE": 0,
+    }
@@ -3,5 +3,14 @@ from backend.settings import *  # noqa: F403
 db_name = str(BASE_DIR / "test.db.sqlite")  # noqa: F405
 DATABASES["default"]["NAME"] = db_name  # noqa: F405
 DATABASES["default"]["TEST"] = {"NAME": db_name}  # noqa: F405
+# Tests of the replica routing enable it with READ_REPLICA_DATABASE
+DATABASES["replica"] = {  # noqa: F405
+    "ENGINE": "django.db.backends.sqlite3",
+    "NAME": db_name,
+    "TEST": {"MIRROR": "default"},
+}
 
 EMAIL_BACKEND = "django.core.mail.backends.locmem.EmailBackend"
+
+# Tests that exercise caching enable a real cache backend themselves
+CACHES = {"default": {"BACKEND": "django.core.cache.backends.dummy.DummyCache"}}
@@ -16,6 +16,25 @@ python manage.py migrate
 # Ensure no security check errors
 python manage.py check --deploy
 
-# Start the server using gunicorn
+# Run a background command, and start it again whenever it exits
+supervise() {
+    while true; do
+        "$@" || echo "$* exited with status $?, restarting" >&2
+        sleep 1
+    done
+}
+
+# Copy the SQLite database for the public reads, and keep the copy fresh
+if [ "${SQLITE_READ_REPLICA:-0}" = "1" ]; then
+    python manage.py refresh_read_replica --once
+    supervise python manage.py refresh_read_replica &
+fi
+
+# Start the worker of the tournament jobs queued by score submissions
+CONN_MAX_AGE=600 supervise python manage.py run_tournament_jobs &
+
+# Start the ASGI server, which keeps the tournament event streams open. Each worker runs the
+# sync views of its requests concurrently, each request in a thread of its own with its own
+# database connection, which is closed after the request (see backend/production.py)
 export PATH="$HOME/.local/bin:$PATH"
-gunicorn -w 4 backend.wsgi
+uvicorn --workers 4 backend.asgi:application
@@ -807,6 +807,9 @@ const TournamentMatch = props => {
                   queryClient.invalidateQueries({
                     queryKey: ["matches", props.tournamentSlug]
                   });
+                  queryClient.invalidateQueries({
+                    queryKey: ["tournament-snapshot", props.tournamentSlug]
+                  });
                   queryClient.invalidateQueries({
                     queryKey: ["team-matches", props.tournamentSlug]
                   });
@@ -874,6 +877,9 @@ const TournamentMatch = props => {
                 queryClient.invalidateQueries({
                   queryKey: ["matches", props.tournamentSlug]
                 });
+                queryClient.invalidateQueries({
+                  queryKey: ["tournament-snapshot", props.tournamentSlug]
+                });
                 queryClient.invalidateQueries({
                   queryKey: ["team-matches", props.tournamentSlug]
                 });
@@ -16,11 +16,7 @@ import {
 import { createStore, reconcile } from "solid-js/store";
 
 import { matchCardColorToBorderColorMap } from "../colors";
-import {
-  fetchFieldsByTournamentId,
-  fetchMatches,
-  fetchTournamentBySlug
-} from "../queries";
+import { fetchTournamentSnapshot } from "../queries";
 // import DayScheduleSkeleton from "../skeletons/Schedule";
 // import { TournamentMatches as TournamentMatchesSkeleton } from "../skeletons/TournamentMatch";
 // import { getMatchCardColor } from "../utils";
@@ -48,21 +44,10 @@ const TournamentSchedule = () => {
   const [doneBuildingScheduleMap, setDoneBuildingScheduleMap] =
     createSignal(false);
 
-  const tournamentQuery = useQuery(() => ({
-    queryKey: ["tournaments", params.slug],
-    queryFn: () => fetchTournamentBySlug(params.slug)
-  }));
-
-  const matchesQuery = useQuery(() => ({
-    queryKey: ["matches", tournamentQuery.data?.id],
-    queryFn: () => fetchMatches(tournamentQuery.data?.id),
-    enabled: !!tournamentQuery.data?.id
-  }));
-
-  const fieldsQuery = useQuery(() => ({
-    queryKey: ["fields", tournamentQuery.data?.id],
-    queryFn: () => fetchFieldsByTournamentId(tournamentQuery.data?.id),
-    enabled: !!tournamentQuery.data?.id
+  // The tournament, its fields and its matches come in a single snapshot request
+  const snapshotQuery = useQuery(() => ({
+    queryKey: ["tournament-snapshot", params.slug],
+    queryFn: () => fetchTournamentSnapshot(params.slug)
   }));
 
   function sameDay(d1, d2) {
@@ -82,11 +67,11 @@ const TournamentSchedule = () => {
   };
 
   createEffect(() => {
-    if (matchesQuery.status === "success" && !matchesQuery.data?.message) {
+    if (snapshotQuery.status === "success") {
       setMatchDayTimeFieldMap(reconcile({}));
       setDayFieldMap(reconcile({}));
       let days = new Set();
-      matchesQuery.data?.map(match => {
+      snapshotQuery.data?.matches.map(match => {
         if (match.time && match.field) {
           const day = new Date(Date.parse(match.time)).toLocaleDateString(
             "en-US",
@@ -174,11 +159,11 @@ const TournamentSchedule = () => {
 
   return (
     <Show
-      when={!tournamentQuery.data?.message}
+      when={!snapshotQuery.isError}
       fallback={
         <div>
           Tournament could not be fetched. Error -{" "}
-          {tournamentQuery.data.message}
+          {snapshotQuery.error.message}
           <A href={"/tournaments"} class="text-blue-600 dark:text-blue-500">
             <br />
             Back to Tournaments Page
@@ -202,10 +187,10 @@ const TournamentSchedule = () => {
             <BreadcrumbSeparator class="mx-1" /> */}
             <BreadcrumbItem>
               <BreadcrumbLink
-                href={`/tournament/${tournamentQuery.data?.slug}`}
+                href={`/tournament/${snapshotQuery.data?.tournament.slug}`}
               >
                 <span class="rounded-lg px-2 text-base outline outline-1 outline-offset-2 outline-gray-400">
-                  {makeTitle(tournamentQuery.data?.slug || "")}
+                  {makeTitle(snapshotQuery.data?.tournament.slug || "")}
                 </span>
               </BreadcrumbLink>
             </BreadcrumbItem>
@@ -280,10 +265,10 @@ const TournamentSchedule = () => {
                               >
                                 <div class="relative mb-8 overflow-x-auto">
                                   <Switch>
-                                    <Match when={fieldsQuery.isError}>
-                                      <p>{fieldsQuery.error.message}</p>
+                                    <Match when={snapshotQuery.isError}>
+                                      <p>{snapshotQuery.error.message}</p>
                                     </Match>
-                                    <Match when={fieldsQuery.isSuccess}>
+                                    <Match when={snapshotQuery.isSuccess}>
                                       <ScheduleTable
                                         dayFieldMap={dayFieldMap}
                                         day={day2}
@@ -292,7 +277,7 @@ const TournamentSchedule = () => {
                                         }
                                         setFlash={setFlash}
                                         fieldsMap={mapFieldIdToField(
-                                          fieldsQuery.data
+                                          snapshotQuery.data?.fields
                                         )}
                                       />
                                     </Match>
@@ -306,7 +291,7 @@ const TournamentSchedule = () => {
                           </For>
                           <Show
                             when={
-                              matchesQuery.data?.filter(match =>
+                              snapshotQuery.data?.matches.filter(match =>
                                 sameDay(day, new Date(Date.parse(match.time)))
                               ).length === 0
                             }
@@ -336,7 +321,7 @@ const TournamentSchedule = () => {
                             // fallback={<TournamentMatchesSkeleton />}
                             fallback={"Loading matches..."}
                           > */}
-                          <For each={matchesQuery.data}>
+                          <For each={snapshotQuery.data?.matches}>
                             {match => (
                               <Show
                                 when={sameDay(
@@ -79,6 +79,44 @@ export const fetchTournamentBySlug = async tournamentSlug => {
   return apiRequest(`/api/tournaments/${tournamentSlug}`, "GET");
 };
 
+/**
+ * Fetch everything a tournament page shows in one request: the tournament, its teams,
+ * fields, pools, cross pools, brackets, position pools and matches. The snapshot refers
+ * to teams, fields and stages by id, so its matches are expanded here to the shape
+ * returned by the matches endpoint.
+ * @param {string} tournamentSlug - Tournament slug
+ * @returns {Promise<Object>} - Tournament snapshot
+ */
+export const fetchTournamentSnapshot = async tournamentSlug => {
+  const snapshot = await apiRequest(
+    `/api/tournaments/${tournamentSlug}/snapshot`,
+    "GET"
+  );
+
+  const byId = items => Object.fromEntries(items.map(item => [item.id, item]));
+  const teams = byId(snapshot.teams);
+  const fields = byId(snapshot.fields);
+  const pools = byId(snapshot.pools);
+  const crossPools = byId(snapshot.cross_pools);
+  const brackets = byId(snapshot.brackets);
+  const positionPools = byId(snapshot.position_pools);
+
+  return {
+    ...snapshot,
+    matches: snapshot.matches.map(match => ({
+      ...match,
+      tournament: snapshot.tournament,
+      team_1: teams[match.team_1_id] ?? null,
+      team_2: teams[match.team_2_id] ?? null,
+      field: fields[match.field_id] ?? null,
+      pool: pools[match.pool_id] ?? null,
+      cross_pool: crossPools[match.cross_pool_id] ?? null,
+      bracket: brackets[match.bracket_id] ?? null,
+      position_pool: positionPools[match.position_pool_id] ?? null
+    }))
+  };
+};
+
 /**
  * Fetch fields by tournament ID
  * @param {number} tournamentId - Tournament ID
@@ -1,3 +1,5 @@
+from typing import Any
+
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin as DjangoUserAdmin
 from django.db.models import CharField, Q, QuerySet, Value
@@ -16,6 +18,7 @@ from osu.tournament.models import (
     Tournament,
     TournamentField,
 )
+from osu.tournament.utils import bump_tournament_version, reindex_match_seeds
 from osu.user.models import User
 
 
@@ -143,6 +146,13 @@ class TournamentFieldAdmin(admin.ModelAdmin[TournamentField]):
     def get_name(self, obj: TournamentField) -> str:
         return obj.tournament.name
 
+    def save_model(
+        self, request: HttpRequest, obj: TournamentField, form: Any, change: bool
+    ) -> None:
+        super().save_model(request, obj, form, change)
+        # Fields are shown on the cached match pages and tournament snapshots
+        bump_tournament_version(obj.tournament_id)
+
 
 @admin.register(Pool)
 class PoolAdmin(admin.ModelAdmin[Pool]):
@@ -193,6 +203,11 @@ class MatchAdmin(admin.ModelAdmin[Match]):
     def get_name(self, obj: Match) -> str:
         return obj.tournament.name
 
+    def save_model(self, request: HttpRequest, obj: Match, form: Any, change: bool) -> None:
+        super().save_model(request, obj, form, change)
+        reindex_match_seeds(obj)
+        bump_tournament_version(obj.tournament_id)
+
 
 @admin.register(Registration)
 class RegistrationAdmin(admin.ModelAdmin[Registration]):
@@ -0,0 +1,124 @@
+import hashlib
+from collections.abc import Callable
+from functools import wraps
+from http import HTTPStatus
+from typing import Any
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
+from django.utils.cache import set_response_etag
+
+from osu.compression import compress_response, get_accepted_encoding
+from osu.renderers import get_renderer
+from osu.tournament.models import Tournament
+
+TournamentLookup = Callable[[HttpRequest, dict[str, Any]], list[dict[str, Any]]]
+
+# Headers of a page that are cached with its content
+CACHED_HEADERS = ["Content-Type", "Content-Encoding", "ETag", "Vary"]
+
+
+def tournament_from_path(param: str, or_id: bool = False) -> TournamentLookup:
+    """Lookup of the tournament whose slug, or optionally id, is the path parameter"""
+
+    def lookup(request: HttpRequest, kwargs: dict[str, Any]) -> list[dict[str, Any]]:
+        value = str(kwargs[param])
+        lookups: list[dict[str, Any]] = [{"slug": value}]
+        if or_id and value.isdigit():
+            lookups.append({"id": int(value)})
+        return lookups
+
+    return lookup
+
+
+def tournament_of_match(param: str) -> TournamentLookup:
+    """Lookup of the tournament of the match whose id is the path parameter"""
+
+    def lookup(request: HttpRequest, kwargs: dict[str, Any]) -> list[dict[str, Any]]:
+        value = str(kwargs[param])
+        return [{"matches__id": int(value)}] if value.isdigit() else []
+
+    return lookup
+
+
+def tournament_from_query(param: str) -> TournamentLookup:
+    """Lookup of the tournament whose id is the query parameter, if it is given"""
+
+    def lookup(request: HttpRequest, kwargs: dict[str, Any]) -> list[dict[str, Any]]:
+        value = request.GET.get(param, "")
+        return [{"id": int(value)}] if value.isdigit() else []
+
+    return lookup
+
+
+def get_tournament_version(lookups: list[dict[str, Any]]) -> tuple[int, int] | None:
+    """Id and version of the first tournament matching the lookups, tried in order"""
+    for lookup in lookups:
+        tournament = Tournament.objects.filter(**lookup).values_list("id", "version").first()
+        if tournament is not None:
+            return tournament
+
+    return None
+
+
+def get_tournament_cache_key(
+    tournament_id: int, version: int, request: HttpRequest, encoding: str | None
+) -> str:
+    path_hash = hashlib.md5(request.get_full_path().encode(), usedforsecurity=False).hexdigest()
+    # Pages are cached in each media type and encoding that clients ask for
+    media_type = get_renderer(request).media_type
+    return f"tournament:{tournament_id}:{version}:{media_type}:{encoding}:{path_hash}"
+
+
+def cache_tournament_response(
+    tournament_lookup: TournamentLookup,
+) -> Callable[[Callable[..., HttpResponseBase]], Callable[..., HttpResponseBase]]:
+    """
+    Read-through cache for a public view of a tournament's data, applied with ninja's
+    `decorate_view`. Responses are cached per tournament version, and every change to the
+    tournament bumps its version, so a cached page is never served after a change.
+
+    The ETag of a response is cached with it, so that ConditionalGetMiddleware answers a
+    poll for an unchanged page with a 304 without serializing or hashing it again. Pages
+    are compressed before they are cached, so that a hit is not compressed again.
+
+    `tournament_lookup` gets the request and path parameters of the view, and returns the
+    filters that find its tournament, tried in order. Views of no tournament are not cached.
+    """
+
+    def decorator(view: Callable[..., HttpResponseBase]) -> Callable[..., HttpResponseBase]:
+        @wraps(view)
+        def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+            lookups = tournament_lookup(request, kwargs)
+            tournament = get_tournament_version(lookups) if lookups else None
+            if request.method != "GET" or tournament is None:
+                return view(request, *args, **kwargs)
+
+            encoding = get_accepted_encoding(request)
+            key = get_tournament_cache_key(*tournament, request, encoding)
+            cached = cache.get(key)
+            if cached is not None:
+                content, headers = cached
+                cached_response = HttpResponse(content)
+                for header, value in headers.items():
+                    cached_response[header] = value
+                return cached_response
+
+            response = view(request, *args, **kwargs)
+            if response.status_code == HTTPStatus.OK and isinstance(response, HttpResponse):
+                set_response_etag(response)
+                compress_response(response, encoding)
+                headers = {
+                    header: response[header]
+                    for header in CACHED_HEADERS
+                    if response.has_header(header)
+                }
+                cache.set(key, (response.content, headers), settings.TOURNAMENT_CACHE_TIMEOUT)
+
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,100 @@
+"""
+Compression of responses, with brotli or gzip, whichever the client accepts.
+
+Responses smaller than RESPONSE_COMPRESSION_MIN_BYTES are sent as they are, since their
+compressed size saves little and costs a round of compression. Streaming responses, such
+as the Server-Sent Events of tournaments, are never compressed: a compressor buffers its
+output, which would hold back each event until enough of them had been sent.
+
+Responses that set cookies or vary on them are never compressed either. They are the pages
+of a session, such as the admin's or an authenticated user's, which can hold secrets like CSRF
+tokens next to text from the request, and the size of their compression would let BREACH
+guess the secrets. Brotli has no mitigation like the random bytes added to gzip headers, so
+only the public responses, the same for every client, are compressed.
+
+Cached tournament pages are compressed before they are cached, so that a hit is served
+without compressing it again, and this middleware leaves them as they are. They are shared
+by every client, so they are public.
+"""
+from collections.abc import Callable
+
+import brotli
+from django.conf import settings
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from django.utils.cache import patch_vary_headers
+from django.utils.text import compress_string
+
+# Random bytes added to gzip headers against BREACH, as by Django's GZipMiddleware
+GZIP_MAX_RANDOM_BYTES = 100
+
+# Encodings by preference, when the client accepts several of them equally
+ENCODINGS: dict[str, Callable[[bytes], bytes]] = {
+    "br": lambda content: brotli.compress(content, quality=settings.RESPONSE_BROTLI_QUALITY),
+    "gzip": lambda content: compress_string(content, max_random_bytes=GZIP_MAX_RANDOM_BYTES),
+}
+
+
+def get_accepted_encoding(request: HttpRequest) -> str | None:
+    """Encoding that the client prefers among the ones responses can be compressed with"""
+    qualities: dict[str, float] = {}
+    for item in request.headers.get("Accept-Encoding", "").split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if coding:
+            qualities[coding.lower()] = quality
+
+    default = qualities.get("*", 0.0)
+    encoding = max(ENCODINGS, key=lambda encoding: qualities.get(encoding, default))
+    return encoding if qualities.get(encoding, default) > 0 else None
+
+
+def compress_response(response: HttpResponseBase, encoding: str | None) -> None:
+    """Compress the content of the response with the encoding, if it is worth it"""
+    if response.streaming or response.has_header("Content-Encoding"):
+        return
+    content = response.content  # type: ignore[attr-defined]
+    if len(content) < settings.RESPONSE_COMPRESSION_MIN_BYTES:
+        return
+
+    patch_vary_headers(response, ["Accept-Encoding"])
+    if encoding is None:
+        return
+
+    compressed_content = ENCODINGS[encoding](content)
+    if len(compressed_content) >= len(content):
+        return
+
+    response.content = compressed_content  # type: ignore[attr-defined]
+    response["Content-Length"] = str(len(compressed_content))
+    response["Content-Encoding"] = encoding
+    # A strong ETag is only for the exact bytes, so compressed content has a weak one
+    etag = response.get("ETag")
+    if etag and etag.startswith('"'):
+        response["ETag"] = f"W/{etag}"
+
+
+def is_private(response: HttpResponseBase) -> bool:
+    """Whether the response depends on the client's cookies, or sets some"""
+    vary = {header.strip().lower() for header in response.get("Vary", "").split(",")}
+    return bool(response.cookies) or "cookie" in vary
+
+
+class CompressionMiddleware:
+    """Compress public responses with the encoding the client prefers, above a size threshold"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if not is_private(response):
+            compress_response(response, get_accepted_encoding(request))
+        return response
@@ -0,0 +1,155 @@
+"""
+Live updates of tournaments for spectators, streamed as Server-Sent Events.
+
+A change to a tournament publishes its events by saving them in its transaction, since the
+change can be made by any process, such as the jobs worker, which has no streams open. One
+poller per tournament and process reads the events saved since it started, and has the
+broadcaster of its process fan them out to the event streams open there, followed by the
+tournament's version when it changed. The version also tells streams of the changes that
+published no event, or whose event was missed, and that they need to refetch. The saved
+events are only kept for TOURNAMENT_EVENTS_RETENTION_SECONDS.
+"""
+import asyncio
+import json
+import threading
+from collections import defaultdict
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timedelta
+from typing import Any
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Max
+from django.utils import timezone
+
+from osu.tournament.models import Tournament, TournamentStreamEvent
+
+# Events waiting to be sent to a stream, beyond which its oldest events are dropped
+MAX_QUEUED_EVENTS = 100
+
+# Event name and data
+TournamentEvent = tuple[str, dict[str, Any]]
+
+
+class Subscription:
+    """Queue of a tournament's events for one stream, which any thread can publish to"""
+
+    def __init__(self, tournament_id: int, loop: asyncio.AbstractEventLoop) -> None:
+        self.tournament_id = tournament_id
+        self.loop = loop
+        self.queue: asyncio.Queue[TournamentEvent] = asyncio.Queue(maxsize=MAX_QUEUED_EVENTS)
+
+    def put(self, event: TournamentEvent) -> None:
+        if self.queue.full():
+            # A stream that cannot keep up loses its oldest events, and the version events
+            # that follow tell it to refetch
+            self.queue.get_nowait()
+        self.queue.put_nowait(event)
+
+    def deliver(self, event: TournamentEvent) -> None:
+        self.loop.call_soon_threadsafe(self.put, event)
+
+
+class TournamentBroadcaster:
+    """Fans the events of tournaments out to the event streams open in this process"""
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.subscriptions: dict[int, set[Subscription]] = defaultdict(set)
+        self.pollers: dict[int, asyncio.Task[None]] = {}
+
+    def publish(self, tournament_id: int, event: str, data: dict[str, Any]) -> None:
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(tournament_id, ()))
+
+        for subscription in subscriptions:
+            subscription.deliver((event, data))
+
+    @asynccontextmanager
+    async def subscribe(self, tournament_id: int, version: int) -> AsyncIterator[Subscription]:
+        """Subscribe to the events of a tournament, whose version the subscriber has seen"""
+        subscription = Subscription(tournament_id, asyncio.get_running_loop())
+        # A new poller publishes the events saved from now on
+        last_event_id = (
+            await TournamentStreamEvent.objects.filter(tournament_id=tournament_id).aaggregate(
+                last_id=Max("id")
+            )
+        )["last_id"] or 0
+        with self.lock:
+            self.subscriptions[tournament_id].add(subscription)
+            if tournament_id not in self.pollers:
+                self.pollers[tournament_id] = asyncio.create_task(
+                    self.poll_events(tournament_id, version, last_event_id)
+                )
+
+        try:
+            yield subscription
+        finally:
+            with self.lock:
+                self.subscriptions[tournament_id].discard(subscription)
+                if not self.subscriptions[tournament_id]:
+                    del self.subscriptions[tournament_id]
+                    self.pollers.pop(tournament_id).cancel()
+
+    async def poll_events(self, tournament_id: int, version: int, last_event_id: int) -> None:
+        """
+        Publish the events of a tournament saved after the last one, by any process, and then
+        its version whenever it changes
+        """
+        events = TournamentStreamEvent.objects.filter(tournament_id=tournament_id)
+        while True:
+            await asyncio.sleep(settings.TOURNAMENT_EVENTS_POLL_SECONDS)
+            async for event in events.filter(id__gt=last_event_id).order_by("id"):
+                last_event_id = event.id
+                self.publish(tournament_id, event.name, event.data)
+
+            new_version = (
+                await Tournament.objects.filter(id=tournament_id)
+                .values_list("version", flat=True)
+                .afirst()
+            )
+            if new_version is not None and new_version != version:
+                version = new_version
+                self.publish(tournament_id, "version", {"version": version})
+
+
+broadcaster = TournamentBroadcaster()
+
+
+def publish_tournament_event(tournament_id: int, event: str, data: dict[str, Any]) -> None:
+    """Publish an event to the streams of a tournament, once the current transaction commits"""
+    TournamentStreamEvent.objects.create(tournament_id=tournament_id, name=event, data=data)
+
+
+def prune_tournament_events() -> int:
+    """Delete the events older than the pollers need, and return how many were deleted"""
+    retention = timedelta(seconds=settings.TOURNAMENT_EVENTS_RETENTION_SECONDS)
+    deleted, _ = TournamentStreamEvent.objects.filter(
+        created_at__lt=timezone.now() - retention
+    ).delete()
+    return deleted
+
+
+def encode_event(event: str, data: dict[str, Any]) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n"
+
+
+async def stream_tournament_events(tournament_id: int, version: int) -> AsyncIterator[str]:
+    """
+    Server-Sent Events of a tournament, starting with its current version. A comment is sent
+    when there have been no events for a while, to keep proxies from closing the connection.
+    """
+    async with broadcaster.subscribe(tournament_id, version) as subscription:
+        yield encode_event("version", {"version": version})
+
+        while True:
+            try:
+                event, data = await asyncio.wait_for(
+                    subscription.queue.get(), settings.TOURNAMENT_EVENTS_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                yield ": heartbeat\n\n"
+                continue
+
+            yield encode_event(event, data)
@@ -0,0 +1,186 @@
+"""
+Loading of the relations that API responses serialize, planned from their response schemas.
+
+The fields of a response schema that are relations of the returned model, and the schemas
+nested in them, give the relations the response reads. Single relations are joined with
+select_related, and relations to many rows are prefetched, each in one query that joins
+its own single relations. Resolvers can read any relation, so schemas name the relations
+their resolvers read in `resolver_relations`.
+
+`load_response_relations` applies the plans to every operation of an API, to the querysets,
+paginated querysets and model instances its views return.
+"""
+import types
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass, field
+from functools import cache, wraps
+from typing import Any, Union, get_args, get_origin
+
+from django.db import models
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
+from ninja import NinjaAPI
+from pydantic import BaseModel
+
+
+@dataclass
+class LoadingPlan:
+    """Relations of a model to load with it, as select_related and prefetched paths"""
+
+    select_related: set[str] = field(default_factory=set)
+    # Plans of the related models, by the path of the relation to many rows
+    prefetch_related: dict[str, "LoadingPlan"] = field(default_factory=dict)
+    related_models: dict[str, type[models.Model]] = field(default_factory=dict)
+
+    def get_prefetches(self) -> list[Prefetch]:
+        return [
+            Prefetch(path, queryset=plan.apply(self.related_models[path]._default_manager.all()))
+            for path, plan in self.prefetch_related.items()
+        ]
+
+    def apply(self, queryset: QuerySet[Any]) -> QuerySet[Any]:
+        if queryset._fields is not None:  # type: ignore[attr-defined]
+            # Rows of values() have no relations to load
+            return queryset
+
+        prefetched = {
+            getattr(lookup, "prefetch_to", lookup)
+            for lookup in queryset._prefetch_related_lookups  # type: ignore[attr-defined]
+        }
+        return queryset.select_related(*sorted(self.select_related)).prefetch_related(
+            *[
+                prefetch
+                for prefetch in self.get_prefetches()
+                if prefetch.prefetch_to not in prefetched
+            ]
+        )
+
+    def add_path(self, model: type[models.Model], path: list[str], prefix: str = "") -> None:
+        """Add a path of relations of the model, given by their attribute names"""
+        relation = get_relation(model, path[0]) if path else None
+        if relation is None:
+            return
+
+        related_model: type[models.Model] = relation.related_model  # type: ignore[assignment]
+        if relation.one_to_many or relation.many_to_many:
+            plan = self.add_prefetch(f"{prefix}{path[0]}", related_model)
+            plan.add_path(related_model, path[1:])
+        else:
+            self.select_related.add(f"{prefix}{path[0]}")
+            self.add_path(related_model, path[1:], f"{prefix}{path[0]}__")
+
+    def add_schema(
+        self, model: type[models.Model], schema: type[BaseModel], prefix: str = ""
+    ) -> None:
+        """Add the relations of the model that the schema serializes"""
+        for path in getattr(schema, "resolver_relations", []):
+            self.add_path(model, path.split("__"), prefix)
+
+        for name, schema_field in schema.model_fields.items():
+            relation = get_relation(model, name)
+            if relation is None:
+                continue
+
+            related_model: type[models.Model] = relation.related_model  # type: ignore[assignment]
+            if relation.one_to_many or relation.many_to_many:
+                plan = self.add_prefetch(f"{prefix}{name}", related_model)
+                for nested_schema in iter_schemas(schema_field.annotation):
+                    plan.add_schema(related_model, nested_schema)
+            else:
+                self.select_related.add(f"{prefix}{name}")
+                for nested_schema in iter_schemas(schema_field.annotation):
+                    self.add_schema(related_model, nested_schema, f"{prefix}{name}__")
+
+    def add_prefetch(self, path: str, model: type[models.Model]) -> "LoadingPlan":
+        self.related_models[path] = model
+        return self.prefetch_related.setdefault(path, LoadingPlan())
+
+
+def get_relation(
+    model: type[models.Model], name: str
+) -> models.Field[Any, Any] | models.ForeignObjectRel | None:
+    """Relation of the model whose attribute is the name, if there is one"""
+    for relation in model._meta.get_fields():
+        if not isinstance(relation, models.Field | models.ForeignObjectRel):
+            continue
+        if not relation.is_relation or not isinstance(relation.related_model, type):
+            continue
+        if isinstance(relation, models.ForeignObjectRel):
+            accessor = relation.get_accessor_name()
+        else:
+            accessor = relation.name
+        if accessor == name:
+            return relation
+
+    return None
+
+
+def iter_schemas(annotation: Any) -> Iterator[type[BaseModel]]:
+    """Schemas in a type annotation, such as `list[Schema]` or `Schema | None`"""
+    if isinstance(annotation, type) and issubclass(annotation, BaseModel):
+        yield annotation
+    elif get_origin(annotation) in (list, Union, types.UnionType):
+        for arg in get_args(annotation):
+            yield from iter_schemas(arg)
+
+
+@cache
+def get_loading_plan(model: type[models.Model], schema: type[BaseModel]) -> LoadingPlan:
+    """Plan of the relations of the model that the schema serializes"""
+    plan = LoadingPlan()
+    plan.add_schema(model, schema)
+    return plan
+
+
+def load_related(queryset: QuerySet[Any], schema: type[BaseModel]) -> QuerySet[Any]:
+    """Queryset that loads the relations the schema serializes along with its rows"""
+    model: type[models.Model] = queryset.model
+    return get_loading_plan(model, schema).apply(queryset)
+
+
+def load_result(result: Any, response_schema: Any) -> Any:
+    """View result, with the loading of the relations that its response schema serializes"""
+    for schema in iter_schemas(response_schema):
+        if isinstance(result, QuerySet):
+            return load_related(result, schema)
+
+        if isinstance(result, models.Model):
+            plan = get_loading_plan(result._meta.model, schema)
+            prefetch_related_objects([result], *sorted(plan.select_related), *plan.get_prefetches())
+            return result
+
+        if isinstance(result, dict) and isinstance(result.get("items"), QuerySet):
+            # A page of ninja's pagination
+            items_field = schema.model_fields.get("items")
+            if items_field is not None:
+                return {**result, "items": load_result(result["items"], items_field.annotation)}
+
+    return result
+
+
+def load_view_relations(
+    view: Callable[..., Any], response_schemas: dict[Any, Any]
+) -> Callable[..., Any]:
+    @wraps(view)
+    def wrapper(request: Any, *args: Any, **kwargs: Any) -> Any:
+        result = view(request, *args, **kwargs)
+        if isinstance(result, tuple) and len(result) == 2:  # noqa: PLR2004
+            status, body = result
+            return status, load_result(body, response_schemas.get(status))
+        return load_result(result, response_schemas.get(200))
+
+    return wrapper
+
+
+def load_response_relations(api: NinjaAPI) -> None:
+    """Load the relations of every response of the API's synchronous operations"""
+    for _, router in api._routers:
+        for path_view in router.path_operations.values():
+            for operation in path_view.operations:
+                if path_view.is_async:
+                    continue
+                response_schemas = {
+                    status: model.model_fields["response"].annotation
+                    for status, model in operation.response_models.items()
+                    if model is not None
+                }
+                operation.view_func = load_view_relations(operation.view_func, response_schemas)
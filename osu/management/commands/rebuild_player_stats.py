@@ -0,0 +1,29 @@
+from typing import Any
+
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from osu.tournament.models import Tournament
+from osu.tournament.utils import rebuild_player_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the player stats of tournaments from their match events"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "slugs", nargs="*", help="Slugs of the tournaments to rebuild, all when not given"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        tournaments = Tournament.objects.order_by("id")
+        if options["slugs"]:
+            tournaments = tournaments.filter(slug__in=options["slugs"])
+            missing = set(options["slugs"]) - {tournament.slug for tournament in tournaments}
+            if missing:
+                raise CommandError(f"Tournaments not found: {', '.join(sorted(missing))}")
+
+        for tournament in tournaments:
+            num_players = rebuild_player_stats(tournament.id)
+            self.stdout.write(
+                self.style.SUCCESS(f"Rebuilt stats of {num_players} players in {tournament.name}")
+            )
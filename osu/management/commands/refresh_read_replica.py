@@ -0,0 +1,29 @@
+import time
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError, CommandParser
+
+from osu.replica import refresh_sqlite_replica
+
+
+class Command(BaseCommand):
+    help = "Refresh the SQLite copy that the public reads go to, from the SQLite database"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Refresh the copy and exit, instead of repeating"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        if settings.READ_REPLICA_SQLITE_PATH is None:
+            raise CommandError("READ_REPLICA_SQLITE_PATH is not set")
+
+        primary_path = Path(str(settings.DATABASES["default"]["NAME"]))
+        while True:
+            refresh_sqlite_replica(primary_path, Path(settings.READ_REPLICA_SQLITE_PATH))
+            if options["once"]:
+                self.stdout.write(self.style.SUCCESS("Refreshed the read replica"))
+                return
+            time.sleep(settings.READ_REPLICA_REFRESH_SECONDS)
@@ -0,0 +1,37 @@
+import time
+from typing import Any
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandParser
+from django.db import close_old_connections
+
+from osu.events import prune_tournament_events
+from osu.tournament.jobs import requeue_running_jobs, run_queued_jobs
+
+
+class Command(BaseCommand):
+    help = "Run the queued tournament jobs, such as the propagation of submitted scores"
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        parser.add_argument(
+            "--once", action="store_true", help="Run the queued jobs and exit, instead of polling"
+        )
+
+    def handle(self, *args: Any, **options: Any) -> None:
+        # Jobs of a tournament run one at a time, so a single worker runs the queue, and any
+        # job that is still marked as running was left by a worker that stopped
+        num_requeued = requeue_running_jobs()
+        if num_requeued:
+            self.stdout.write(self.style.WARNING(f"Requeued {num_requeued} interrupted jobs"))
+
+        while True:
+            num_jobs = run_queued_jobs()
+            if num_jobs:
+                self.stdout.write(self.style.SUCCESS(f"Ran {num_jobs} jobs"))
+            if options["once"]:
+                return
+            prune_tournament_events()
+            # Like between requests, the connection is closed once it is older than
+            # CONN_MAX_AGE, and checked before it is reused
+            close_old_connections()
+            time.sleep(settings.TOURNAMENT_JOBS_POLL_SECONDS)
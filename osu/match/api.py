@@ -1,26 +1,46 @@
 from typing import Any
 
 from django.db import transaction
-from django.db.models import Q
+from django.db.models import Max, Prefetch, Q, QuerySet
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from ninja import Router
+from ninja.decorators import decorate_view
 
-from osu.match.models import Match, MatchScore, MatchStats, SpiritScore
+from osu.cache import (
+    cache_tournament_response,
+    tournament_from_path,
+    tournament_from_query,
+    tournament_of_match,
+)
+from osu.events import publish_tournament_event
+from osu.loading import load_related
+from osu.match.models import (
+    Match,
+    MatchEvent,
+    MatchScore,
+    MatchStats,
+    SpiritScore,
+    TournamentJob,
+)
 from osu.match.schema import (
     ErrorResponseSchema,
     MatchBasicSchema,
     MatchCreateSchema,
     MatchDetailSchema,
+    MatchEventBatchResponseSchema,
+    MatchEventBatchSchema,
     MatchScoreSubmitSchema,
     MatchStatsSchema,
     MatchUpdateSchema,
     SpiritScoreSubmitSchema,
     StaffMatchScoreSubmitSchema,
     SuccessResponseSchema,
+    TournamentJobSchema,
 )
 from osu.player.models import Player
 from osu.team.models import Team
+from osu.tournament.jobs import queue_match_result, queue_spirit_rankings
 from osu.tournament.models import (
     Bracket,
     CrossPool,
@@ -31,11 +51,13 @@ from osu.tournament.models import (
     TournamentField,
 )
 from osu.tournament.utils import (
-    populate_fixtures,
-    update_match_score_and_results,
-    update_tournament_spirit_rankings,
+    apply_match_events,
+    bump_tournament_version,
+    index_match_seeds,
+    reindex_match_seeds,
 )
 from osu.user.models import User
+from osu.utils import atomic_with_retries
 
 
 # Define a type for authenticated requests
@@ -104,6 +126,7 @@ def check_user_match_permissions(
 
 
 @router.get("", response=list[MatchBasicSchema], auth=None)
+@decorate_view(cache_tournament_response(tournament_from_query("tournament_id")))
 def list_matches(
     request: HttpRequest,
     tournament_id: int | None = None,
@@ -113,7 +136,7 @@ def list_matches(
     cross_pool_id: int | None = None,
     bracket_id: int | None = None,
     position_pool_id: int | None = None,
-) -> list[Match]:
+) -> QuerySet[Match]:
     """
     List matches with optional filtering by tournament, team, status, or pool type
     """
@@ -136,37 +159,147 @@ def list_matches(
     if team_id:
         queryset = queryset.filter(Q(team_1_id=team_id) | Q(team_2_id=team_id))
 
-    return list(queryset.order_by("time", "sequence_number"))
+    return queryset.order_by("time", "sequence_number")
 
 
 @router.get(
     "/tournament/{tournament_slug}/team/{team_slug}", response=list[MatchBasicSchema], auth=None
 )
+@decorate_view(cache_tournament_response(tournament_from_path("tournament_slug")))
 def list_tournament_team_matches(
     request: HttpRequest, tournament_slug: str, team_slug: str
-) -> list[Match]:
-    qs = (
-        Match.objects.filter(tournament__slug=tournament_slug)
-        .filter(Q(team_1__slug=team_slug) | Q(team_2__slug=team_slug))
-        .select_related("team_1", "team_2", "pool", "cross_pool", "bracket", "position_pool")
+) -> QuerySet[Match]:
+    return Match.objects.filter(tournament__slug=tournament_slug).filter(
+        Q(team_1__slug=team_slug) | Q(team_2__slug=team_slug)
     )
-    return list(qs)
 
 
 @router.get("/{match_id}", response=MatchDetailSchema, auth=None)
+@decorate_view(cache_tournament_response(tournament_of_match("match_id")))
 def get_match(request: HttpRequest, match_id: int) -> Match:
     """
     Get detailed information about a specific match
     """
-    return get_object_or_404(Match, id=match_id)
+    return get_object_or_404(load_related(Match.objects.all(), MatchDetailSchema), id=match_id)
+
+
+@router.get("/{match_id}/jobs", response=list[TournamentJobSchema], auth=None)
+def list_match_jobs(request: HttpRequest, match_id: int) -> QuerySet[TournamentJob]:
+    """
+    List the jobs queued by the submissions of a match, newest first, to see when the
+    submitted score has been applied and its fixtures propagated
+    """
+    return TournamentJob.objects.filter(match_id=match_id).order_by("-id")
 
 
 @router.get("/{match_id}/stats", response=MatchStatsSchema | None, auth=None)
-def get_match_stats(request: HttpRequest, match_id: int) -> MatchStats | None:
+def get_match_stats(
+    request: HttpRequest, match_id: int, since: int | None = None
+) -> MatchStats | None:
+    """
+    Get the live stats of a match, with its events newest first. With `since`, the cursor of
+    an earlier response, only the events after it are returned.
+    """
+    events = MatchEvent.objects.select_related(
+        "team",
+        "scored_by__user",
+        "assisted_by__user",
+        "drop_by__user",
+        "throwaway_by__user",
+        "block_by__user",
+    ).order_by("-time", "-id")
+    if since is not None:
+        events = events.filter(id__gt=since)
+
+    return (
+        MatchStats.objects.select_related("initial_possession", "current_possession")
+        .annotate(cursor=Max("events__id"))
+        .prefetch_related(Prefetch("events", queryset=events))
+        .filter(match_id=match_id)
+        .first()
+    )
+
+
+@router.post(
+    "/{match_id}/stats/events",
+    response={
+        200: MatchEventBatchResponseSchema,
+        400: ErrorResponseSchema,
+        401: ErrorResponseSchema,
+        404: ErrorResponseSchema,
+    },
+)
+def sync_match_events(
+    request: AuthenticatedHttpRequest, match_id: int, payload: MatchEventBatchSchema
+) -> tuple[int, dict[str, Any]]:
+    """
+    Sync a batch of events of a match from a stat-keeper, who is staff or a tournament volunteer.
+
+    The batch is applied in one transaction. Events that were synced before are skipped, so a
+    batch can be resent as is when its response was lost.
+    """
     try:
-        return MatchStats.objects.get(match_id=match_id)
-    except MatchStats.DoesNotExist:
-        return None
+        match = Match.objects.get(id=match_id)
+    except Match.DoesNotExist:
+        return 404, {"success": False, "message": f"Match with id {match_id} not found"}
+
+    if not (
+        request.user.is_staff
+        or Tournament.volunteers.through.objects.filter(
+            tournament_id=match.tournament_id, user_id=request.user.id
+        ).exists()
+    ):
+        return 401, {"success": False, "message": "Only staff and volunteers can sync events"}
+
+    team_ids = {match.team_1_id, match.team_2_id}
+    if None in team_ids:
+        return 400, {"success": False, "message": "Match teams are not known yet"}
+
+    if any(event.team_id not in team_ids for event in payload.events):
+        return 400, {"success": False, "message": "Events must be of the teams of the match"}
+
+    player_ids = {
+        player_id
+        for event in payload.events
+        for player_id in [
+            event.scored_by_id,
+            event.assisted_by_id,
+            event.drop_by_id,
+            event.throwaway_by_id,
+            event.block_by_id,
+        ]
+        if player_id is not None
+    }
+    if Player.objects.filter(id__in=player_ids).count() != len(player_ids):
+        return 400, {"success": False, "message": "Events refer to players that do not exist"}
+
+    events = [MatchEvent(**event.dict(exclude_none=True)) for event in payload.events]
+    with transaction.atomic():
+        stats = MatchStats.objects.select_for_update().filter(match=match).first()
+        if stats is None:
+            initial_possession_id = payload.initial_possession_id
+            if initial_possession_id is None or initial_possession_id not in team_ids:
+                return 400, {
+                    "success": False,
+                    "message": "The first events of a match need the team starting on offense",
+                }
+
+            stats = MatchStats.objects.create(
+                match=match,
+                tournament_id=match.tournament_id,
+                initial_possession_id=initial_possession_id,
+                current_possession_id=initial_possession_id,
+            )
+
+        created, duplicates = apply_match_events(match, stats, events)
+
+    return 200, {
+        "created": [event.client_id for event in created],
+        "duplicates": [event.client_id for event in duplicates],
+        "score_team_1": stats.score_team_1,
+        "score_team_2": stats.score_team_2,
+        "current_possession_id": stats.current_possession_id,
+    }
 
 
 @router.post("", response={201: MatchDetailSchema, 400: ErrorResponseSchema})
@@ -232,6 +365,8 @@ def create_match(
             position_pool=position_pool,
             video_url=payload.video_url,
         )
+        index_match_seeds([match])
+        bump_tournament_version(tournament.id)
 
         return 201, match
     except Exception as e:
@@ -287,6 +422,13 @@ def update_match(
                 setattr(match, field, value)
 
         match.save()
+        reindex_match_seeds(match)
+        bump_tournament_version(match.tournament_id)
+        publish_tournament_event(match.tournament_id, "fixtures", {"match_ids": [match.id]})
+        if payload.status is not None:
+            publish_tournament_event(
+                match.tournament_id, "status", {"match_id": match.id, "status": match.status}
+            )
         return 200, match
 
     except Exception as e:
@@ -306,6 +448,7 @@ def delete_match(
 
     match = get_object_or_404(Match, id=match_id)
     match.delete()
+    bump_tournament_version(match.tournament_id)
     return {"success": True, "message": "Match deleted successfully"}
 
 
@@ -320,50 +463,57 @@ def submit_match_score(
 
     Only team captains, spirit captains, coaches, or owners can submit scores.
     """
-    try:
-        with transaction.atomic():
-            # Check if user has permission to submit scores
-            is_authorized, error_message, player, team = check_user_match_permissions(
-                user=request.user, match_id=match_id
-            )
 
-            if not is_authorized:
-                return 400, {"success": False, "message": error_message}
+    def submit() -> Match | tuple[int, dict[str, Any]]:
+        # Check if user has permission to submit scores
+        is_authorized, error_message, player, team = check_user_match_permissions(
+            user=request.user, match_id=match_id
+        )
 
-            match = get_object_or_404(Match, id=match_id)
+        if not is_authorized:
+            return 400, {"success": False, "message": error_message}
 
-            # Ensure player is not None before creating MatchScore
-            if player is None:
-                return 400, {"success": False, "message": "No player associated with this user"}
+        # Locked, so that concurrent submissions of the match are applied one at a time
+        match = get_object_or_404(Match.objects.select_for_update(), id=match_id)
 
-            # Create match score entry
-            match_score = MatchScore.objects.create(
-                score_team_1=payload.score_team_1,
-                score_team_2=payload.score_team_2,
-                entered_by=player,
-            )
+        # Ensure player is not None before creating MatchScore
+        if player is None:
+            return 400, {"success": False, "message": "No player associated with this user"}
+
+        # Create match score entry
+        match_score = MatchScore.objects.create(
+            score_team_1=payload.score_team_1,
+            score_team_2=payload.score_team_2,
+            entered_by=player,
+        )
+
+        # Assign the score to the appropriate team
+        if team == match.team_1:
+            match.suggested_score_team_1 = match_score
+        elif team == match.team_2:
+            match.suggested_score_team_2 = match_score
 
-            # Assign the score to the appropriate team
-            if team == match.team_1:
-                match.suggested_score_team_1 = match_score
-            elif team == match.team_2:
-                match.suggested_score_team_2 = match_score
+        match.save()
+        # The suggested scores are shown on the match pages
+        bump_tournament_version(match.tournament_id)
 
-            # Check if both teams have submitted scores and they match
-            if match.suggested_score_team_1 and match.suggested_score_team_2:
-                score1 = match.suggested_score_team_1
-                score2 = match.suggested_score_team_2
+        # Check if both teams have submitted scores and they match
+        if match.suggested_score_team_1 and match.suggested_score_team_2:
+            score1 = match.suggested_score_team_1
+            score2 = match.suggested_score_team_2
 
-                if (
-                    score1.score_team_1 == score2.score_team_1
-                    and score1.score_team_2 == score2.score_team_2
-                ):
-                    # Both scores match, update the match
-                    update_match_score_and_results(match, score1.score_team_1, score1.score_team_2)
-                    populate_fixtures(match.tournament.id)
+            if (
+                score1.score_team_1 == score2.score_team_1
+                and score1.score_team_2 == score2.score_team_2
+            ):
+                # Both scores match, queue the update of the match and its fixtures
+                queue_match_result(match, score1.score_team_1, score1.score_team_2)
+                match.refresh_from_db()
 
-            match.save()
-            return match
+        return match
+
+    try:
+        return atomic_with_retries(submit)
 
     except Exception as e:
         return 400, {"success": False, "message": "Failed to submit score", "details": str(e)}
@@ -382,89 +532,93 @@ def submit_spirit_score(
     The system automatically determines which team is submitting based on the authenticated user.
     Both self-evaluation and opponent evaluation are submitted at once.
     """
-    try:
-        with transaction.atomic():
-            # Check if user has permission to submit spirit scores
-            is_authorized, error_message, player, team = check_user_match_permissions(
-                user=request.user, match_id=match_id
-            )
 
-            if not is_authorized:
-                return 400, {"success": False, "message": error_message}
+    def submit() -> Match | tuple[int, dict[str, Any]]:
+        # Check if user has permission to submit spirit scores
+        is_authorized, error_message, player, team = check_user_match_permissions(
+            user=request.user, match_id=match_id
+        )
 
-            match = get_object_or_404(Match, id=match_id)
+        if not is_authorized:
+            return 400, {"success": False, "message": error_message}
 
-            # Process opponent spirit score
-            opponent_mvp = None
-            if payload.opponent.mvp_id:
-                opponent_mvp = get_object_or_404(Player, id=payload.opponent.mvp_id)
+        # Locked, so that concurrent submissions of the match are applied one at a time
+        match = get_object_or_404(Match.objects.select_for_update(), id=match_id)
 
-            opponent_msp = None
-            if payload.opponent.msp_id:
-                opponent_msp = get_object_or_404(Player, id=payload.opponent.msp_id)
+        # Process opponent spirit score
+        opponent_mvp = None
+        if payload.opponent.mvp_id:
+            opponent_mvp = get_object_or_404(Player, id=payload.opponent.mvp_id)
 
-            # Calculate total for opponent score
-            opponent_total = (
-                payload.opponent.rules
-                + payload.opponent.fouls
-                + payload.opponent.fair
-                + payload.opponent.positive
-                + payload.opponent.communication
-            )
+        opponent_msp = None
+        if payload.opponent.msp_id:
+            opponent_msp = get_object_or_404(Player, id=payload.opponent.msp_id)
 
-            opponent_spirit_score = SpiritScore.objects.create(
-                rules=payload.opponent.rules,
-                fouls=payload.opponent.fouls,
-                fair=payload.opponent.fair,
-                positive=payload.opponent.positive,
-                communication=payload.opponent.communication,
-                total=opponent_total,
-                mvp=opponent_mvp,
-                msp=opponent_msp,
-                comments=payload.opponent.comments,
-            )
+        # Calculate total for opponent score
+        opponent_total = (
+            payload.opponent.rules
+            + payload.opponent.fouls
+            + payload.opponent.fair
+            + payload.opponent.positive
+            + payload.opponent.communication
+        )
 
-            # Process self spirit score
-            self_mvp = None
-            if payload.self.mvp_id:
-                self_mvp = get_object_or_404(Player, id=payload.self.mvp_id)
-
-            self_msp = None
-            if payload.self.msp_id:
-                self_msp = get_object_or_404(Player, id=payload.self.msp_id)
-
-            # Calculate total for self score
-            self_total = (
-                payload.self.rules
-                + payload.self.fouls
-                + payload.self.fair
-                + payload.self.positive
-                + payload.self.communication
-            )
+        opponent_spirit_score = SpiritScore.objects.create(
+            rules=payload.opponent.rules,
+            fouls=payload.opponent.fouls,
+            fair=payload.opponent.fair,
+            positive=payload.opponent.positive,
+            communication=payload.opponent.communication,
+            total=opponent_total,
+            mvp=opponent_mvp,
+            msp=opponent_msp,
+            comments=payload.opponent.comments,
+        )
 
-            self_spirit_score = SpiritScore.objects.create(
-                rules=payload.self.rules,
-                fouls=payload.self.fouls,
-                fair=payload.self.fair,
-                positive=payload.self.positive,
-                communication=payload.self.communication,
-                total=self_total,
-                mvp=self_mvp,
-                msp=self_msp,
-                comments=payload.self.comments,
-            )
+        # Process self spirit score
+        self_mvp = None
+        if payload.self.mvp_id:
+            self_mvp = get_object_or_404(Player, id=payload.self.mvp_id)
+
+        self_msp = None
+        if payload.self.msp_id:
+            self_msp = get_object_or_404(Player, id=payload.self.msp_id)
+
+        # Calculate total for self score
+        self_total = (
+            payload.self.rules
+            + payload.self.fouls
+            + payload.self.fair
+            + payload.self.positive
+            + payload.self.communication
+        )
+
+        self_spirit_score = SpiritScore.objects.create(
+            rules=payload.self.rules,
+            fouls=payload.self.fouls,
+            fair=payload.self.fair,
+            positive=payload.self.positive,
+            communication=payload.self.communication,
+            total=self_total,
+            mvp=self_mvp,
+            msp=self_msp,
+            comments=payload.self.comments,
+        )
+
+        # Assign spirit scores based on which team is submitting
+        if team == match.team_1:
+            match.spirit_score_team_2 = opponent_spirit_score  # Team 1 rates Team 2
+            match.self_spirit_score_team_1 = self_spirit_score  # Team 1 rates itself
+        elif team == match.team_2:
+            match.spirit_score_team_1 = opponent_spirit_score  # Team 2 rates Team 1
+            match.self_spirit_score_team_2 = self_spirit_score  # Team 2 rates itself
 
-            # Assign spirit scores based on which team is submitting
-            if team == match.team_1:
-                match.spirit_score_team_2 = opponent_spirit_score  # Team 1 rates Team 2
-                match.self_spirit_score_team_1 = self_spirit_score  # Team 1 rates itself
-            elif team == match.team_2:
-                match.spirit_score_team_1 = opponent_spirit_score  # Team 2 rates Team 1
-                match.self_spirit_score_team_2 = self_spirit_score  # Team 2 rates itself
+        match.save()
+        queue_spirit_rankings(match.tournament_id)
+        return match
 
-            match.save()
-            update_tournament_spirit_rankings(match.tournament)
-            return match
+    try:
+        return atomic_with_retries(submit)
 
     except Exception as e:
         return 400, {
@@ -486,19 +640,21 @@ def staff_submit_match_score(
     This endpoint is restricted to staff members only and bypasses the team validation process.
     The submitted score is immediately set as the official score for the match.
     """
+
+    def submit() -> Match | tuple[int, dict[str, Any]]:
+        # Locked, so that concurrent submissions of the match are applied one at a time
+        match = get_object_or_404(Match.objects.select_for_update(), id=match_id)
+
+        queue_match_result(match, payload.score_team_1, payload.score_team_2)
+        match.refresh_from_db()
+        return match
+
     try:
         # Verify user has staff permissions
         if not request.user.is_staff:
             return 400, {"success": False, "message": "Only staff members can use this endpoint"}
 
-        with transaction.atomic():
-            match = get_object_or_404(Match, id=match_id)
-
-            update_match_score_and_results(match, payload.score_team_1, payload.score_team_2)
-            populate_fixtures(match.tournament.id)
-
-            match.save()
-            return match
+        return atomic_with_retries(submit)
 
     except Exception as e:
         return 400, {"success": False, "message": "Failed to submit score", "details": str(e)}
@@ -1,4 +1,5 @@
 from django.db import models
+from django.utils import timezone
 from django.utils.translation import gettext_lazy as _
 
 from osu.player.models import Player
@@ -136,6 +137,30 @@ class Match(models.Model):
         return self.name
 
 
+class MatchSeedSlot(models.Model):
+    """
+    Index from a tournament seed to the match slot that the seed feeds, so that the
+    next matches of a seed are found without scanning the tournament's matches
+    """
+
+    class StageTypes(models.TextChoices):
+        POOL = "pool", _("Pool")
+        CROSS_POOL = "cross_pool", _("Cross Pool")
+        BRACKET = "bracket", _("Bracket")
+        POSITION_POOL = "position_pool", _("Position Pool")
+
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="seed_slots")
+    match = models.ForeignKey(Match, on_delete=models.CASCADE, related_name="seed_slots")
+    stage = models.CharField(max_length=15, choices=StageTypes.choices)
+    sequence_number = models.PositiveIntegerField()
+    seed = models.PositiveIntegerField()
+    slot = models.PositiveSmallIntegerField()  # 1 for team_1, 2 for team_2
+
+    class Meta:
+        unique_together = ["match", "slot"]
+        indexes = [models.Index(fields=["tournament", "seed", "stage"])]
+
+
 class MatchStats(models.Model):
     class Status(models.TextChoices):
         FIRST_HALF = "FH", _("First Half")
@@ -167,9 +192,12 @@ class MatchEvent(models.Model):
         DEFENSE = "DE", _("Defense")
 
     stats = models.ForeignKey(MatchStats, on_delete=models.CASCADE, related_name="events")
+    # Generated by the stat-keeper's device, so that resending a batch of events is harmless
+    client_id = models.UUIDField(blank=True, null=True)
     team = models.ForeignKey(Team, on_delete=models.CASCADE, related_name="match_events")
     started_on = models.CharField(max_length=3, choices=Mode.choices)
-    time = models.DateTimeField(auto_now_add=True)
+    # When the event happened, which can be long before it was synced from the field
+    time = models.DateTimeField(default=timezone.now)
     type = models.CharField(max_length=3, choices=EventType.choices)
 
     scored_by = models.ForeignKey(
@@ -198,3 +226,71 @@ class MatchEvent(models.Model):
 
     current_score_team_1 = models.PositiveIntegerField()
     current_score_team_2 = models.PositiveIntegerField()
+
+    class Meta:
+        unique_together = ["stats", "client_id"]
+
+
+class PlayerStats(models.Model):
+    """
+    Totals of a player's match events in a tournament, kept up to date as events are synced
+    so that leaderboards are read without scanning the events
+    """
+
+    tournament = models.ForeignKey(
+        Tournament, on_delete=models.CASCADE, related_name="player_stats"
+    )
+    player = models.ForeignKey(Player, on_delete=models.CASCADE, related_name="tournament_stats")
+    team = models.ForeignKey(
+        Team, on_delete=models.SET_NULL, related_name="player_stats", blank=True, null=True
+    )
+    goals = models.PositiveIntegerField(default=0)
+    assists = models.PositiveIntegerField(default=0)
+    blocks = models.PositiveIntegerField(default=0)
+    drops = models.PositiveIntegerField(default=0)
+    throwaways = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ["tournament", "player"]
+        indexes = [
+            models.Index(fields=["tournament", f"-{stat}"], name=f"player_stats_{stat}_idx")
+            for stat in ["goals", "assists", "blocks", "drops", "throwaways"]
+        ]
+
+
+class TournamentJob(models.Model):
+    """
+    Recomputation of a tournament's results after a submission, queued in the submission's
+    transaction and run by the run_tournament_jobs worker, so that submissions don't wait
+    on it
+    """
+
+    class JobType(models.TextChoices):
+        # Apply a match's score to the standings, and propagate the fixtures it decides
+        MATCH_RESULT = "match_result", _("Match Result")
+        SPIRIT_RANKINGS = "spirit_rankings", _("Spirit Rankings")
+
+    class StatusTypes(models.TextChoices):
+        QUEUED = "queued", _("Queued")
+        RUNNING = "running", _("Running")
+        COMPLETED = "completed", _("Completed")
+        FAILED = "failed", _("Failed")
+
+    tournament = models.ForeignKey(Tournament, on_delete=models.CASCADE, related_name="jobs")
+    match = models.ForeignKey(
+        Match, on_delete=models.CASCADE, related_name="jobs", blank=True, null=True
+    )
+    type = models.CharField(max_length=20, choices=JobType.choices)
+    status = models.CharField(
+        max_length=10, choices=StatusTypes.choices, default=StatusTypes.QUEUED
+    )
+    payload = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True, default="")
+    attempts = models.PositiveSmallIntegerField(default=0)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(blank=True, null=True)
+    finished_at = models.DateTimeField(blank=True, null=True)
+
+    class Meta:
+        indexes = [models.Index(fields=["status", "tournament"], name="tournament_job_status_idx")]
@@ -1,9 +1,18 @@
 from datetime import datetime
+from typing import Any, ClassVar
+from uuid import UUID
 
 from django.db.models import QuerySet
 from ninja import ModelSchema, Schema
 
-from osu.match.models import Match, MatchEvent, MatchScore, MatchStats, SpiritScore
+from osu.match.models import (
+    Match,
+    MatchEvent,
+    MatchScore,
+    MatchStats,
+    SpiritScore,
+    TournamentJob,
+)
 from osu.player.models import Player
 from osu.team.models import Team
 from osu.tournament.models import Tournament, TournamentField
@@ -15,6 +24,9 @@ class PlayerBasicSchema(ModelSchema):
         model = Player
         model_fields = ["id", "slug"]
 
+    # Relations read by the resolvers, see osu.loading
+    resolver_relations: ClassVar[list[str]] = ["user"]
+
     user_first_name: str
     user_last_name: str
     user_full_name: str
@@ -137,10 +149,13 @@ class MatchStatsSchema(ModelSchema):
     current_possession: TeamBasicSchema
 
     events: list[MatchEventSchema]
+    # Id of the newest event of the match, to poll for the events after it with `since`
+    cursor: int | None = None
 
     @staticmethod
     def resolve_events(match_stats: MatchStats) -> QuerySet[MatchEvent]:
-        return MatchEvent.objects.filter(stats=match_stats).order_by("-time")
+        # The events are prefetched, newest first and since the requested cursor
+        return match_stats.events.all()
 
     class Config:
         model = MatchStats
@@ -267,3 +282,57 @@ class StaffMatchScoreSubmitSchema(Schema):
 
     score_team_1: int
     score_team_2: int
+
+
+class MatchEventCreateSchema(Schema):
+    client_id: UUID
+    team_id: int
+    started_on: MatchEvent.Mode
+    type: MatchEvent.EventType
+    time: datetime | None = None
+    scored_by_id: int | None = None
+    assisted_by_id: int | None = None
+    drop_by_id: int | None = None
+    throwaway_by_id: int | None = None
+    block_by_id: int | None = None
+
+
+class MatchEventBatchSchema(Schema):
+    """Schema for stat-keepers syncing the events of a match, in the order they happened"""
+
+    # Team that starts on offense, only needed by the first batch of a match
+    initial_possession_id: int | None = None
+    events: list[MatchEventCreateSchema]
+
+
+class MatchEventBatchResponseSchema(Schema):
+    created: list[UUID]
+    duplicates: list[UUID]
+    score_team_1: int
+    score_team_2: int
+    current_possession_id: int
+
+
+class TournamentJobSchema(ModelSchema):
+    """
+    Schema for the status of a recomputation queued by a submission. The jobs are public, so
+    the error of a job is only shown to staff.
+    """
+
+    error: str | None
+
+    @staticmethod
+    def resolve_error(job: TournamentJob, context: dict[str, Any]) -> str | None:
+        return job.error if context["request"].user.is_staff else None
+
+    class Config:
+        model = TournamentJob
+        model_fields = [
+            "id",
+            "type",
+            "status",
+            "attempts",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
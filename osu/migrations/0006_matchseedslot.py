@@ -0,0 +1,99 @@
+# Generated by Django 5.2 on 2026-10-17 02:55
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.backends.base.schema import BaseDatabaseSchemaEditor
+from django.db.migrations.state import StateApps
+
+
+def index_existing_matches(apps: StateApps, schema_editor: BaseDatabaseSchemaEditor) -> None:
+    match_model = apps.get_model("osu", "Match")
+    match_seed_slot_model = apps.get_model("osu", "MatchSeedSlot")
+
+    slots = []
+    for match in match_model.objects.all():
+        if match.pool_id is not None:
+            stage = "pool"
+        elif match.cross_pool_id is not None:
+            stage = "cross_pool"
+        elif match.bracket_id is not None:
+            stage = "bracket"
+        elif match.position_pool_id is not None:
+            stage = "position_pool"
+        else:
+            continue
+
+        for slot, seed in ((1, match.placeholder_seed_1), (2, match.placeholder_seed_2)):
+            slots.append(
+                match_seed_slot_model(
+                    tournament_id=match.tournament_id,
+                    match_id=match.id,
+                    stage=stage,
+                    sequence_number=match.sequence_number,
+                    seed=seed,
+                    slot=slot,
+                )
+            )
+
+    match_seed_slot_model.objects.bulk_create(slots)
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0005_matchstats_matchevent"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="MatchSeedSlot",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                (
+                    "stage",
+                    models.CharField(
+                        choices=[
+                            ("pool", "Pool"),
+                            ("cross_pool", "Cross Pool"),
+                            ("bracket", "Bracket"),
+                            ("position_pool", "Position Pool"),
+                        ],
+                        max_length=15,
+                    ),
+                ),
+                ("sequence_number", models.PositiveIntegerField()),
+                ("seed", models.PositiveIntegerField()),
+                ("slot", models.PositiveSmallIntegerField()),
+                (
+                    "match",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seed_slots",
+                        to="osu.match",
+                    ),
+                ),
+                (
+                    "tournament",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="seed_slots",
+                        to="osu.tournament",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(
+                        fields=["tournament", "seed", "stage"],
+                        name="osu_matchse_tournam_e58119_idx",
+                    )
+                ],
+                "unique_together": {("match", "slot")},
+            },
+        ),
+        migrations.RunPython(index_existing_matches, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 03:13
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0006_matchseedslot"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tournament",
+            name="version",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2 on 2026-10-17 03:30
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0007_tournament_version"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="matchevent",
+            name="client_id",
+            field=models.UUIDField(blank=True, null=True),
+        ),
+        migrations.AlterField(
+            model_name="matchevent",
+            name="time",
+            field=models.DateTimeField(default=django.utils.timezone.now),
+        ),
+        migrations.AlterUniqueTogether(
+            name="matchevent",
+            unique_together={("stats", "client_id")},
+        ),
+    ]
@@ -0,0 +1,69 @@
+# Generated by Django 5.2 on 2026-10-17 03:35
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0008_matchevent_client_id"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="PlayerStats",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("goals", models.PositiveIntegerField(default=0)),
+                ("assists", models.PositiveIntegerField(default=0)),
+                ("blocks", models.PositiveIntegerField(default=0)),
+                ("drops", models.PositiveIntegerField(default=0)),
+                ("throwaways", models.PositiveIntegerField(default=0)),
+                (
+                    "player",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="tournament_stats",
+                        to="osu.player",
+                    ),
+                ),
+                (
+                    "team",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="player_stats",
+                        to="osu.team",
+                    ),
+                ),
+                (
+                    "tournament",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="player_stats",
+                        to="osu.tournament",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["tournament", "-goals"], name="player_stats_goals_idx"),
+                    models.Index(
+                        fields=["tournament", "-assists"], name="player_stats_assists_idx"
+                    ),
+                    models.Index(fields=["tournament", "-blocks"], name="player_stats_blocks_idx"),
+                    models.Index(fields=["tournament", "-drops"], name="player_stats_drops_idx"),
+                    models.Index(
+                        fields=["tournament", "-throwaways"], name="player_stats_throwaways_idx"
+                    ),
+                ],
+                "unique_together": {("tournament", "player")},
+            },
+        ),
+    ]
@@ -0,0 +1,49 @@
+# Generated by Django 5.2 on 2026-10-17 04:40
+
+import django.core.serializers.json
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0010_tournamentjob"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="TournamentStreamEvent",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True, primary_key=True, serialize=False, verbose_name="ID"
+                    ),
+                ),
+                ("name", models.CharField(max_length=20)),
+                (
+                    "data",
+                    models.JSONField(
+                        blank=True,
+                        default=dict,
+                        encoder=django.core.serializers.json.DjangoJSONEncoder,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "tournament",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="stream_events",
+                        to="osu.tournament",
+                    ),
+                ),
+            ],
+            options={
+                "indexes": [
+                    models.Index(fields=["tournament", "id"], name="tournament_stream_event_idx"),
+                    models.Index(fields=["created_at"], name="stream_event_created_idx"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2 on 2026-10-17 05:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("osu", "0011_tournamentstreamevent"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="tournamentjob",
+            name="attempts",
+            field=models.PositiveSmallIntegerField(default=0),
+        ),
+    ]
@@ -1,25 +1,39 @@
 from collections.abc import Sequence
 from typing import Any, TypedDict
 
-from django.db.models import CharField, Q, Value
-from django.db.models.functions import Concat
+from django.db.models import CharField, F, Prefetch, Q, Value
+from django.db.models.functions import Coalesce, Concat
 from django.http import HttpRequest
 from ninja import Router
 
 from osu.commons import Response
 from osu.player.models import Player
 from osu.player.schema import PlayerSchema, PlayersResponse
+from osu.tournament.models import Registration
+from osu.utils import decode_cursor, encode_cursor
 
 
 class PlayerResponse(TypedDict):
     players: Sequence[Any]  # Using Any to handle annotated Player objects
-    total: int
+    total: int | None
+    next: str | None
 
 
 router = Router()
 
+# Cursor pages are bounded, offset pages keep the limits they always accepted
+MAX_CURSOR_PAGE_SIZE = 200
 
-@router.get("", auth=None, response=PlayersResponse)
+
+def get_registrations_prefetch() -> Prefetch:
+    """Prefetch of player registrations with their tournament and team, in one query"""
+    return Prefetch(
+        "registration_set",
+        queryset=Registration.objects.select_related("tournament", "team").order_by("id"),
+    )
+
+
+@router.get("", auth=None, response={200: PlayersResponse, 400: Response})
 def list_players(
     request: HttpRequest,
     search: str | None = None,
@@ -30,7 +44,9 @@ def list_players(
     order: str = "asc",
     limit: int = 50,
     offset: int = 0,
-) -> PlayerResponse:
+    cursor: str | None = None,
+    include_total: bool = False,
+) -> PlayerResponse | tuple[int, dict[str, str]]:
     """
     List all players with optional filtering and sorting.
 
@@ -41,8 +57,11 @@ def list_players(
         team_id: Filter by team ID
         sort: Field to sort by (name, gender, city, role)
         order: Sort order (asc, desc)
-        limit: Number of results to return (default: 50)
+        limit: Number of results to return (default: 50), from 1 to 200 in cursor pagination
         offset: Offset for pagination (default: 0)
+        cursor: Cursor pagination, pass an empty cursor for the first page and the
+            returned `next` cursor for the following pages. Offset is ignored.
+        include_total: Count the total in cursor pagination (default: false)
     """
     # Start query with user data for sorting
     queryset = Player.objects.select_related("user").annotate(
@@ -52,11 +71,7 @@ def list_players(
     )
 
     # Prefetch registrations and related tournament and team data
-    queryset = queryset.prefetch_related(
-        "registration_set",
-        "registration_set__tournament",
-        "registration_set__team",
-    )
+    queryset = queryset.prefetch_related(get_registrations_prefetch())
 
     # Apply filters
     if search:
@@ -76,30 +91,64 @@ def list_players(
     if team_id:
         queryset = queryset.filter(teams__id=team_id)
 
-    # Determine sort field
-    sort_field_map = {
-        "name": "full_name",
-        "gender": "gender",
-        "city": "city",
-        "role": "preffered_role",
+    # Determine sort key, never null so that it can be compared against a cursor
+    sort_key_map = {
+        "name": F("full_name"),
+        "gender": F("gender"),
+        "city": F("city"),
+        "role": Coalesce("preffered_role", Value(""), output_field=CharField()),
     }
 
-    sort_field = sort_field_map.get(sort.lower(), "full_name")
+    queryset = queryset.annotate(sort_key=sort_key_map.get(sort.lower(), sort_key_map["name"]))
+
+    # Apply sort order, with the id as tiebreaker so that the order is stable
+    is_descending = order.lower() == "desc"
+    if is_descending:
+        queryset = queryset.order_by("-sort_key", "-id")
+    else:
+        queryset = queryset.order_by("sort_key", "id")
 
-    # Apply sort order
-    if order.lower() == "desc":
-        sort_field = f"-{sort_field}"
+    if cursor is None:
+        # Get total count before slicing
+        total: int | None = queryset.count()
 
-    # Sort queryset
-    queryset = queryset.order_by(sort_field)
+        # Apply pagination
+        players = list(queryset[offset : offset + limit])
 
-    # Get total count before slicing
-    total = queryset.count()
+        return {"players": players, "total": total, "next": None}
 
-    # Apply pagination
-    players = list(queryset[offset : offset + limit])
+    if not 1 <= limit <= MAX_CURSOR_PAGE_SIZE:
+        return 400, {
+            "message": f"The limit of cursor pages must be from 1 to {MAX_CURSOR_PAGE_SIZE}"
+        }
 
-    return {"players": players, "total": total}
+    # Counting is what makes deep pages slow, so cursor pages skip it by default
+    total = queryset.count() if include_total else None
+
+    if cursor:
+        try:
+            sort_key, last_id = decode_cursor(cursor, 2)
+        except ValueError as e:
+            return 400, {"message": str(e)}
+
+        # Continue after the last row of the previous page
+        if is_descending:
+            queryset = queryset.filter(
+                Q(sort_key__lt=sort_key) | Q(sort_key=sort_key, id__lt=last_id)
+            )
+        else:
+            queryset = queryset.filter(
+                Q(sort_key__gt=sort_key) | Q(sort_key=sort_key, id__gt=last_id)
+            )
+
+    # Fetch one extra row to know whether there is a next page
+    players = list(queryset[: limit + 1])
+    next_cursor = None
+    if len(players) > limit:
+        players = players[:limit]
+        next_cursor = encode_cursor([players[-1].sort_key, players[-1].id])
+
+    return {"players": players, "total": total, "next": next_cursor}
 
 
 @router.get("/{slug}", auth=None, response={200: PlayerSchema, 404: Response})
@@ -114,11 +163,7 @@ def get_player_by_slug(request: HttpRequest, slug: str) -> tuple[int, Player | d
         # Include prefetched registration data
         player = (
             Player.objects.select_related("user")
-            .prefetch_related(
-                "registration_set",
-                "registration_set__tournament",
-                "registration_set__team",
-            )
+            .prefetch_related(get_registrations_prefetch())
             .get(slug=slug)
         )
 
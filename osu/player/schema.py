@@ -1,5 +1,5 @@
 from datetime import date
-from typing import Any
+from typing import Any, ClassVar
 
 from ninja import Schema
 
@@ -36,6 +36,43 @@ class PlayerRegistrationSchema(Schema):
     sold_price: int | None = None
 
 
+def serialize_player_registrations(player: Player) -> list[dict[str, Any]]:
+    """
+    Serialize player registrations with tournament and team data.
+
+    Reads the registrations prefetched with their tournament and team, so that listing
+    players costs no query per player.
+    """
+    result = []
+    for reg in player.registration_set.all():
+        tournament_data = {
+            "id": reg.tournament.id,
+            "name": reg.tournament.name,
+            "slug": reg.tournament.slug,
+            "banner": reg.tournament.banner.url if reg.tournament.banner else None,
+        }
+
+        team_data = {
+            "id": reg.team.id,
+            "name": reg.team.name,
+            "slug": reg.team.slug,
+            "logo": reg.team.logo.url if reg.team.logo else None,
+        }
+
+        result.append(
+            {
+                "id": reg.id,
+                "tournament": tournament_data,
+                "team": team_data,
+                "role": reg.role,
+                "base_price": reg.base_price,
+                "sold_price": reg.sold_price,
+            }
+        )
+
+    return result
+
+
 class PlayerSchema(Schema):
     """Schema for Player model."""
 
@@ -52,6 +89,12 @@ class PlayerSchema(Schema):
     preffered_role: str | None = None
     registrations: list[PlayerRegistrationSchema] = []
 
+    # Relations read by the resolvers, see osu.loading
+    resolver_relations: ClassVar[list[str]] = [
+        "registration_set__tournament",
+        "registration_set__team",
+    ]
+
     @staticmethod
     def resolve_profile_picture(player: Player) -> str | None:
         """Resolve profile picture URL."""
@@ -62,40 +105,7 @@ class PlayerSchema(Schema):
     @staticmethod
     def resolve_registrations(player: Player) -> list[dict[str, Any]]:
         """Resolve player registrations with tournament and team data."""
-        from osu.tournament.models import Registration
-
-        registrations = Registration.objects.filter(player=player).select_related(
-            "tournament", "team"
-        )
-
-        result = []
-        for reg in registrations:
-            tournament_data = {
-                "id": reg.tournament.id,
-                "name": reg.tournament.name,
-                "slug": reg.tournament.slug,
-                "banner": reg.tournament.banner.url if reg.tournament.banner else None,
-            }
-
-            team_data = {
-                "id": reg.team.id,
-                "name": reg.team.name,
-                "slug": reg.team.slug,
-                "logo": reg.team.logo.url if reg.team.logo else None,
-            }
-
-            result.append(
-                {
-                    "id": reg.id,
-                    "tournament": tournament_data,
-                    "team": team_data,
-                    "role": reg.role,
-                    "base_price": reg.base_price,
-                    "sold_price": reg.sold_price,
-                }
-            )
-
-        return result
+        return serialize_player_registrations(player)
 
 
 class PlayerListSchema(Schema):
@@ -110,6 +120,13 @@ class PlayerListSchema(Schema):
     preffered_role: str
     registrations: list[PlayerRegistrationSchema] = []
 
+    # Relations read by the resolvers, see osu.loading
+    resolver_relations: ClassVar[list[str]] = [
+        "user",
+        "registration_set__tournament",
+        "registration_set__team",
+    ]
+
     @staticmethod
     def resolve_name(player: Player) -> str:
         """Resolve player name."""
@@ -125,44 +142,12 @@ class PlayerListSchema(Schema):
     @staticmethod
     def resolve_registrations(player: Player) -> list[dict[str, Any]]:
         """Resolve player registrations with tournament and team data."""
-        from osu.tournament.models import Registration
-
-        registrations = Registration.objects.filter(player=player).select_related(
-            "tournament", "team"
-        )
-
-        result = []
-        for reg in registrations:
-            tournament_data = {
-                "id": reg.tournament.id,
-                "name": reg.tournament.name,
-                "slug": reg.tournament.slug,
-                "banner": reg.tournament.banner.url if reg.tournament.banner else None,
-            }
-
-            team_data = {
-                "id": reg.team.id,
-                "name": reg.team.name,
-                "slug": reg.team.slug,
-                "logo": reg.team.logo.url if reg.team.logo else None,
-            }
-
-            result.append(
-                {
-                    "id": reg.id,
-                    "tournament": tournament_data,
-                    "team": team_data,
-                    "role": reg.role,
-                    "base_price": reg.base_price,
-                    "sold_price": reg.sold_price,
-                }
-            )
-
-        return result
+        return serialize_player_registrations(player)
 
 
 class PlayersResponse(Schema):
     """Response schema for a list of players."""
 
     players: list[PlayerListSchema]
-    total: int
+    total: int | None = None
+    next: str | None = None
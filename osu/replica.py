@@ -0,0 +1,128 @@
+"""
+Routing of the API's public reads to a read-only replica of the database.
+
+When READ_REPLICA_DATABASE names a database, the GET operations of the API without
+authentication read from it, so that the public pages load without competing with the score
+submissions, and everything else reads and writes the default database. The replica lags
+behind, so a client that writes is pinned to the default database for
+READ_REPLICA_PIN_SECONDS, by a cookie that expires then, and sees its own writes.
+
+The replica is either any database that replicates the default one, or a copy of the SQLite
+database, refreshed every READ_REPLICA_REFRESH_SECONDS by the refresh_read_replica command
+with SQLite's online backup API. A refresh copies to a new file that then replaces the
+replica, so reads see either copy, whole.
+"""
+import os
+import sqlite3
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any
+
+from django.conf import settings
+from django.db import models
+from django.http import HttpRequest
+from django.http.response import HttpResponseBase
+from ninja import NinjaAPI
+
+from osu.writes import SAFE_METHODS
+
+PIN_COOKIE = "read_primary"
+
+_reading_from_replica: ContextVar[bool] = ContextVar("reading_from_replica", default=False)
+
+
+class ReadReplicaRouter:
+    """Send the reads of the public operations to the replica, and the rest to the default"""
+
+    def db_for_read(self, model: type[models.Model], **hints: Any) -> str | None:
+        if _reading_from_replica.get():
+            return settings.READ_REPLICA_DATABASE
+        return None
+
+    def db_for_write(self, model: type[models.Model], **hints: Any) -> str | None:
+        return None
+
+    def allow_relation(self, obj1: models.Model, obj2: models.Model, **hints: Any) -> bool:
+        # The replica holds the same rows as the default database
+        return True
+
+    def allow_migrate(self, db: str, app_label: str, **hints: Any) -> bool:
+        return db != settings.READ_REPLICA_DATABASE
+
+
+@contextmanager
+def reading_from_replica() -> Iterator[None]:
+    token = _reading_from_replica.set(True)
+    try:
+        yield
+    finally:
+        _reading_from_replica.reset(token)
+
+
+def is_pinned_to_primary(request: HttpRequest) -> bool:
+    return PIN_COOKIE in request.COOKIES
+
+
+def read_from_replica(run: Callable[..., HttpResponseBase]) -> Callable[..., HttpResponseBase]:
+    def wrapper(request: HttpRequest, *args: Any, **kwargs: Any) -> HttpResponseBase:
+        if is_pinned_to_primary(request):
+            return run(request, *args, **kwargs)
+        with reading_from_replica():
+            return run(request, *args, **kwargs)
+
+    return wrapper
+
+
+def route_public_reads(api: NinjaAPI) -> None:
+    """
+    Read from the replica in the API's synchronous GET operations without authentication. The
+    whole run of an operation is wrapped, since its response is read after its view returns.
+    """
+    for _, router in api._routers:
+        for path_view in router.path_operations.values():
+            if path_view.is_async:
+                continue
+            for operation in path_view.operations:
+                if operation.auth_callbacks or "GET" not in operation.methods:
+                    continue
+                operation.run = read_from_replica(operation.run)  # type: ignore[method-assign]
+
+
+class PrimaryPinMiddleware:
+    """Pin the clients that write to the default database, until the replica has caught up"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        response = self.get_response(request)
+        if request.method not in SAFE_METHODS and settings.READ_REPLICA_DATABASE:
+            response.set_cookie(
+                PIN_COOKIE,
+                "1",
+                max_age=settings.READ_REPLICA_PIN_SECONDS,
+                secure=settings.SESSION_COOKIE_SECURE,
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+def refresh_sqlite_replica(primary_path: Path, replica_path: Path) -> None:
+    """Copy the SQLite database to a new file, and have it replace the replica"""
+    copy_path = replica_path.with_name(f"{replica_path.name}.copy")
+    copy_path.unlink(missing_ok=True)
+
+    primary = sqlite3.connect(primary_path)
+    copy = sqlite3.connect(copy_path)
+    try:
+        primary.backup(copy)
+        # Readers of the replica would otherwise share WAL files that outlive the copy
+        copy.execute("PRAGMA journal_mode=DELETE")
+    finally:
+        copy.close()
+        primary.close()
+
+    os.replace(copy_path, replica_path)
@@ -1,6 +1,7 @@
 from typing import Any
 
 from django.db import transaction
+from django.db.models import QuerySet
 from django.http import HttpRequest
 from django.shortcuts import get_object_or_404
 from ninja import Router
@@ -15,6 +16,7 @@ from osu.team.schema import (
     TeamSchema,
     TeamUpdateSchema,
 )
+from osu.tournament.utils import bump_tournament_version
 from osu.user.models import User
 
 # Create router instance
@@ -31,7 +33,7 @@ class AuthenticatedHttpRequest(HttpRequest):
 def list_teams(
     request: HttpRequest,
     search: str | None = None,
-) -> list[Team]:
+) -> QuerySet[Team]:
     """
     List all teams with optional filtering.
 
@@ -47,7 +49,7 @@ def list_teams(
     if search:
         query = query.filter(name__icontains=search)
 
-    return list(query)
+    return query
 
 
 @router.get("/{team_id}", response={200: TeamSchema, 404: ErrorSchema}, auth=None)
@@ -175,6 +177,7 @@ def update_team(
                     return 400, {"message": f"User with ID {owner_id} not found"}
 
         team.save()
+        bump_tournament_version(*team.tournaments.values_list("id", flat=True))
         return 200, team
     except Team.DoesNotExist:
         return 404, {"message": f"Team with ID {team_id} not found"}
@@ -203,7 +206,9 @@ def delete_team(request: AuthenticatedHttpRequest, team_id: int) -> tuple[int, d
             return 401, {"message": "Only staff members can delete teams"}
 
         team_name = team.name
+        tournament_ids = list(team.tournaments.values_list("id", flat=True))
         team.delete()
+        bump_tournament_version(*tournament_ids)
         return 200, {"success": True, "message": f"Team '{team_name}' deleted successfully"}
     except Team.DoesNotExist:
         return 404, {"message": f"Team with ID {team_id} not found"}
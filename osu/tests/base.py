@@ -1,13 +1,64 @@
 """
-Base test utilities for user authentication testing.
+Base test utilities for user authentication and tournament testing.
 """
+import os
+import unittest
+from collections.abc import Iterator
+from datetime import timedelta
 from typing import Any
 
 from django.contrib.auth import get_user_model
-from django.test import Client, TestCase
+from django.http import HttpResponse
+from django.test import Client, RequestFactory, SimpleTestCase, TestCase
+from django.urls import URLPattern, URLResolver, get_resolver
+from django.utils import timezone
+
+from osu.match.models import Match
+from osu.team.models import Team
+from osu.tournament.models import Bracket, CrossPool, Pool, PositionPool, Tournament
+from osu.tournament.utils import (
+    create_bracket_matches,
+    create_pool_matches,
+    create_position_pool_matches,
+    index_match_seeds,
+)
 
 User = get_user_model()
 
+# Benchmarks measure times that depend on the machine, so they only run when asked to
+RUN_BENCHMARKS = os.environ.get("RUN_BENCHMARKS") == "1"
+benchmark = unittest.skipUnless(RUN_BENCHMARKS, "Benchmarks run with RUN_BENCHMARKS=1")
+
+
+class ReportMixin(SimpleTestCase):
+    """
+    Report of the measurements of a test class, printed after its tests, and also written to
+    the file named by the `report_variable` environment variable when it is set.
+    """
+
+    report_title: str
+    report_header: str
+    report_variable: str
+    report_lines: list[str]
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.report_lines = []
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        super().tearDownClass()
+        if not cls.report_lines:
+            return
+
+        report = "\n".join([cls.report_header, *cls.report_lines])
+        print(f"\n{cls.report_title}\n{report}")
+        report_path = os.environ.get(cls.report_variable)
+        if report_path:
+            with open(report_path, "w") as report_file:
+                report_file.write(report + "\n")
+
 
 class BaseAuthTestCase(TestCase):
     """Base test case for authentication tests."""
@@ -39,3 +90,150 @@ class BaseAuthTestCase(TestCase):
     def assert_not_authenticated(self) -> None:
         """Assert that the client is not authenticated."""
         self.assertFalse(self.client.session.get("_auth_user_id"))
+
+
+class TournamentTestMixin:
+    """Helpers for tests that need a tournament with all its stages."""
+
+    def create_teams(self, count: int) -> list[Team]:
+        """Create teams that can be shared between tournaments."""
+        return [Team.objects.create(name=f"Team {i}") for i in range(1, count + 1)]
+
+    def create_staged_tournament(
+        self, name: str, teams: list[Team], with_cross_pool: bool = True
+    ) -> Tournament:
+        """
+        Create an 8 team tournament with two pools feeding a 1-4 bracket.
+
+        With a cross pool, seeds 3-6 play a cross pool round and seeds 5-8 finish in
+        a position pool. Without one, seeds 5-8 play a 5-8 bracket instead.
+        """
+        tournament = Tournament.objects.create(
+            name=name,
+            location="Test Location",
+            start_date=timezone.now().date(),
+            end_date=(timezone.now() + timedelta(days=2)).date(),
+        )
+        tournament.teams.add(*teams)
+        tournament.refresh_from_db()
+
+        for sequence_number, (pool_name, seeds) in enumerate(
+            [("A", [1, 4, 5, 8]), ("B", [2, 3, 6, 7])], start=1
+        ):
+            pool_seeding = {}
+            pool_results = {}
+            for i, seed in enumerate(seeds):
+                team_id = tournament.initial_seeding[str(seed)]
+                pool_seeding[seed] = team_id
+                pool_results[team_id] = {
+                    "rank": i + 1,
+                    "wins": 0,
+                    "losses": 0,
+                    "draws": 0,
+                    "GF": 0,
+                    "GA": 0,
+                }
+            pool = Pool.objects.create(
+                tournament=tournament,
+                sequence_number=sequence_number,
+                name=pool_name,
+                initial_seeding=pool_seeding,
+                results=pool_results,
+            )
+            create_pool_matches(tournament, pool)
+
+        bracket_names = ["1-4"]
+        if with_cross_pool:
+            cross_pool = CrossPool.objects.create(tournament=tournament)
+            cross_pool_matches = [
+                Match.objects.create(
+                    name=f"CP {seed_1} vs {seed_2}",
+                    tournament=tournament,
+                    cross_pool=cross_pool,
+                    sequence_number=1,
+                    placeholder_seed_1=seed_1,
+                    placeholder_seed_2=seed_2,
+                )
+                for seed_1, seed_2 in [(3, 6), (4, 5)]
+            ]
+            index_match_seeds(cross_pool_matches)
+
+            position_pool = PositionPool.objects.create(
+                tournament=tournament,
+                sequence_number=1,
+                name="X",
+                initial_seeding={seed: 0 for seed in range(5, 9)},
+                results={},
+            )
+            create_position_pool_matches(tournament, position_pool)
+        else:
+            bracket_names.append("5-8")
+
+        for sequence_number, bracket_name in enumerate(bracket_names, start=1):
+            start, end = map(int, bracket_name.split("-"))
+            bracket_seeding = {seed: 0 for seed in range(start, end + 1)}
+            bracket = Bracket.objects.create(
+                tournament=tournament,
+                sequence_number=sequence_number,
+                name=bracket_name,
+                initial_seeding=bracket_seeding,
+                current_seeding=bracket_seeding,
+            )
+            create_bracket_matches(tournament, bracket)
+
+        return tournament
+
+    def start_staged_tournament(self, tournament: Tournament) -> None:
+        """Put the seeded teams into the pool matches, like the start endpoint does."""
+        for match in Match.objects.filter(tournament=tournament, pool__isnull=False):
+            match.team_1_id = tournament.initial_seeding[str(match.placeholder_seed_1)]
+            match.team_2_id = tournament.initial_seeding[str(match.placeholder_seed_2)]
+            match.status = Match.StatusTypes.SCHEDULED
+            match.save()
+
+        tournament.status = Tournament.StatusTypes.LIVE
+        tournament.save()
+
+    def call_view(self, url_name: str, params: dict[str, Any]) -> HttpResponse:
+        """
+        Call an API view by its URL name, like the API would for an anonymous GET request.
+        This reaches the /tournaments list views, whose paths the /tournaments/{slug}
+        route matches first.
+        """
+
+        def iter_patterns(patterns: list[Any]) -> Iterator[URLPattern]:
+            for pattern in patterns:
+                if isinstance(pattern, URLResolver):
+                    yield from iter_patterns(pattern.url_patterns)
+                else:
+                    yield pattern
+
+        view = next(
+            pattern.callback
+            for pattern in iter_patterns(get_resolver().url_patterns)
+            if pattern.name == url_name
+        )
+        response: HttpResponse = view(RequestFactory().get("/", params))
+        return response
+
+    def get_match_key(self, match: Match) -> tuple[int, str, int, int, int]:
+        """Identify a match by its place in the tournament structure."""
+        if match.pool is not None:
+            stage = (0, match.pool.name)
+        elif match.cross_pool is not None:
+            stage = (1, "")
+        elif match.bracket is not None:
+            stage = (2, match.bracket.name)
+        else:
+            stage = (3, match.position_pool.name if match.position_pool else "")
+
+        return (
+            *stage,
+            match.sequence_number,
+            match.placeholder_seed_1,
+            match.placeholder_seed_2,
+        )
+
+
+class BaseTournamentTestCase(TournamentTestMixin, TestCase):
+    """Base test case for tests that need a tournament with all its stages."""
@@ -0,0 +1,151 @@
+import asyncio
+import gzip
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import cast
+
+import brotli
+from django.core.cache import cache
+from django.http import HttpRequest, StreamingHttpResponse
+from django.test import Client, override_settings
+
+from osu.compression import get_accepted_encoding
+from osu.events import broadcaster
+from osu.match.models import Match
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+@override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1024)
+class CompressionTestCase(BaseTournamentTestCase):
+    """Test the compression of responses above the size threshold."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament, whose match list is above the threshold."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.matches_params: dict[str, int | str] = {
+            "tournament_id": self.tournament.id,
+            "status": Match.StatusTypes.SCHEDULED,
+        }
+        self.client = Client()
+
+    def test_accepted_encoding(self) -> None:
+        """Test that the encoding is the one the client prefers, and brotli on a tie."""
+        for accept_encoding, encoding in [
+            ("", None),
+            ("identity", None),
+            ("gzip", "gzip"),
+            ("gzip, deflate, br", "br"),
+            ("br;q=0.5, gzip", "gzip"),
+            ("br;q=0, gzip;q=0", None),
+            ("*", "br"),
+            ("*;q=0.1, gzip", "gzip"),
+        ]:
+            with self.subTest(accept_encoding=accept_encoding):
+                request = HttpRequest()
+                request.META["HTTP_ACCEPT_ENCODING"] = accept_encoding
+                self.assertEqual(get_accepted_encoding(request), encoding)
+
+    def test_large_responses_are_compressed(self) -> None:
+        """Test that responses above the threshold are compressed with the accepted encoding."""
+        response = self.client.get("/api/matches", self.matches_params)
+        self.assertNotIn("Content-Encoding", response)
+        self.assertIn("Accept-Encoding", response["Vary"])
+        self.assertGreater(len(response.content), 1024)
+
+        for encoding, decompress in [("gzip", gzip.decompress), ("br", brotli.decompress)]:
+            with self.subTest(encoding=encoding):
+                compressed_response = self.client.get(
+                    "/api/matches", self.matches_params, HTTP_ACCEPT_ENCODING=encoding
+                )
+                self.assertEqual(compressed_response["Content-Encoding"], encoding)
+                self.assertEqual(
+                    compressed_response["Content-Length"], str(len(compressed_response.content))
+                )
+                self.assertLess(len(compressed_response.content), len(response.content))
+                self.assertEqual(decompress(compressed_response.content), response.content)
+
+    def test_small_responses_are_not_compressed(self) -> None:
+        """Test that responses below the threshold are sent as they are."""
+        response = self.client.get("/api/teams", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertLess(len(response.content), 1024)
+        self.assertNotIn("Content-Encoding", response)
+
+    @override_settings(RESPONSE_COMPRESSION_MIN_BYTES=1)
+    def test_responses_of_sessions_are_not_compressed(self) -> None:
+        """Test that responses that vary on cookies or set them are sent as they are."""
+        User.objects.create_user(username="user@example.com", password=TEST_PASSWORD)
+
+        # The login sets the session cookie
+        response = self.client.post(
+            "/api/user/login",
+            {"username": "user@example.com", "password": TEST_PASSWORD},
+            content_type="application/json",
+            HTTP_ACCEPT_ENCODING="gzip, br",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("sessionid", response.cookies)
+        self.assertNotIn("Content-Encoding", response)
+
+        # The user's details vary on the session cookie
+        response = self.client.get("/api/user/me", HTTP_ACCEPT_ENCODING="gzip, br")
+        self.assertEqual(response.status_code, 200)
+        self.assertIn("Cookie", response["Vary"])
+        self.assertNotIn("Content-Encoding", response)
+
+        # Public responses are still compressed for clients with a session
+        response = self.client.get(
+            "/api/matches", self.matches_params, HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertEqual(response["Content-Encoding"], "br")
+
+    async def test_event_streams_are_not_compressed(self) -> None:
+        """Test that events are streamed as they are, so that none is held back."""
+        response = await self.async_client.get(
+            f"/api/tournaments/{self.tournament.slug}/events", HTTP_ACCEPT_ENCODING="gzip, br"
+        )
+        self.assertNotIn("Content-Encoding", response)
+        stream = cast(AsyncIterator[bytes], cast(StreamingHttpResponse, response).streaming_content)
+        self.assertTrue((await anext(stream)).startswith(b"event: version"))
+
+        # Disconnect, like the server does when the client goes away
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        reading.cancel()
+        with suppress(asyncio.CancelledError):
+            await reading
+        self.assertNotIn(self.tournament.id, broadcaster.subscriptions)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_cached_pages_are_cached_compressed(self) -> None:
+        """Test that a cached page is served as it was compressed, in each encoding."""
+        cache.clear()
+        for encoding in ["gzip", "br", ""]:
+            with self.subTest(encoding=encoding):
+                response = self.client.get(
+                    "/api/matches", self.matches_params, HTTP_ACCEPT_ENCODING=encoding
+                )
+                with self.assertNumQueries(1):
+                    cached_response = self.client.get(
+                        "/api/matches", self.matches_params, HTTP_ACCEPT_ENCODING=encoding
+                    )
+
+                # gzip adds random bytes to each compression, so equal content was not redone
+                self.assertEqual(cached_response.content, response.content)
+                self.assertEqual(cached_response.get("Content-Encoding"), encoding or None)
+                self.assertEqual(cached_response["ETag"], response["ETag"])
+                self.assertIn("Accept-Encoding", cached_response["Vary"])
+
+                not_modified_response = self.client.get(
+                    "/api/matches",
+                    self.matches_params,
+                    HTTP_ACCEPT_ENCODING=encoding,
+                    HTTP_IF_NONE_MATCH=response["ETag"],
+                )
+                self.assertEqual(not_modified_response.status_code, 304)
@@ -0,0 +1,116 @@
+import random
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+from django.db import connection
+from django.test import Client, TransactionTestCase
+from django.utils import timezone
+
+from osu.match.models import Match
+from osu.player.models import Player
+from osu.tournament.models import Pool, Registration, Tournament
+
+from .base import TournamentTestMixin, User
+
+TEST_PASSWORD = "test_password_only"
+THREADS = 8
+
+
+class ConcurrentScoreSubmissionTestCase(TournamentTestMixin, TransactionTestCase):
+    """Test that scores submitted at the same time, across connections, are all applied."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament, with a logged in captain client for each team."""
+        super().setUp()
+        teams = self.create_teams(8)
+        self.tournament = self.create_staged_tournament("Tournament", teams)
+        self.start_staged_tournament(self.tournament)
+
+        self.captain_clients: dict[int, Client] = {}
+        for team in teams:
+            user = User.objects.create_user(
+                username=f"{team.slug}@example.com", password=TEST_PASSWORD
+            )
+            player = Player.objects.create(
+                user=user, gender="M", date_of_birth=timezone.now().date(), match_up="M"
+            )
+            Registration.objects.create(
+                tournament=self.tournament,
+                team=team,
+                player=player,
+                role=Registration.Role.CAPTAIN,
+            )
+            client = Client()
+            client.login(username=user.username, password=TEST_PASSWORD)
+            self.captain_clients[team.id] = client
+
+    def submit_score(self, team_id: int, match_id: int, scores: tuple[int, int]) -> int:
+        """Submit a score as the captain of a team, from a thread with its own connection."""
+        try:
+            response = self.captain_clients[team_id].post(
+                f"/api/matches/{match_id}/submit-score",
+                {"score_team_1": scores[0], "score_team_2": scores[1]},
+                content_type="application/json",
+            )
+            return response.status_code
+        finally:
+            connection.close()
+
+    def test_no_result_is_lost(self) -> None:
+        """Test that every result of a burst of submissions is in the standings."""
+        matches = list(Match.objects.filter(tournament=self.tournament, pool__isnull=False))
+        scores = {match.id: (15, random.randint(5, 13)) for match in matches}  # noqa: S311
+        submissions = [
+            (team_id, match.id, scores[match.id])
+            for match in matches
+            for team_id in [match.team_1_id, match.team_2_id]
+            if team_id is not None
+        ]
+        random.shuffle(submissions)
+
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            statuses = list(executor.map(lambda args: self.submit_score(*args), submissions))
+        self.assertEqual(statuses, [200] * len(submissions))
+
+        # Every match has its score, and the pool results count every match
+        expected_results: dict[int, dict[str, int]] = defaultdict(lambda: defaultdict(int))
+        for match in Match.objects.filter(id__in=scores):
+            self.assertEqual(match.status, Match.StatusTypes.COMPLETED)
+            self.assertEqual((match.score_team_1, match.score_team_2), scores[match.id])
+            for team_id, score_for, score_against in [
+                (match.team_1_id, match.score_team_1, match.score_team_2),
+                (match.team_2_id, match.score_team_2, match.score_team_1),
+            ]:
+                if team_id is None:
+                    self.fail("Pool matches have their teams")
+                results = expected_results[team_id]
+                results["wins" if score_for > score_against else "losses"] += 1
+                results["GF"] += score_for
+                results["GA"] += score_against
+
+        tournament = Tournament.objects.get(id=self.tournament.id)
+        for pool in Pool.objects.filter(tournament=tournament):
+            for result_team_id, results in pool.results.items():
+                with self.subTest(pool=pool.name, team_id=result_team_id):
+                    self.assertEqual(
+                        {key: results[key] for key in ["wins", "losses", "GF", "GA"]},
+                        {
+                            key: expected_results[int(result_team_id)][key]
+                            for key in ["wins", "losses", "GF", "GA"]
+                        },
+                    )
+                    # The tournament seeding has the standings of both pools
+                    seeds = sorted(map(int, pool.initial_seeding.keys()))
+                    self.assertEqual(
+                        tournament.current_seeding[str(seeds[results["rank"] - 1])],
+                        int(result_team_id),
+                    )
+
+        # The completion of the pools was seen, so the cross pool has its teams
+        cross_pool_matches = Match.objects.filter(
+            tournament=tournament, cross_pool__isnull=False, sequence_number=1
+        )
+        self.assertTrue(cross_pool_matches.exists())
+        for match in cross_pool_matches:
+            self.assertIsNotNone(match.team_1_id)
+            self.assertIsNotNone(match.team_2_id)
@@ -0,0 +1,226 @@
+import json
+from collections.abc import Callable
+from typing import Any
+
+from django.test import Client
+
+from osu.match.models import Match, MatchSeedSlot
+from osu.tournament.models import Bracket, CrossPool, Pool, PositionPool, Tournament
+from osu.tournament.utils import (
+    create_bracket_matches,
+    create_pool_matches,
+    populate_fixtures,
+    propagate_fixtures,
+    update_match_score_and_results,
+)
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+class FixturePropagationTestCase(BaseTournamentTestCase):
+    """Test that incremental fixture propagation matches the full tournament rescan."""
+
+    def setUp(self) -> None:
+        """Set up teams shared by the tournaments being compared."""
+        super().setUp()
+        self.teams = self.create_teams(8)
+
+    def get_scores(self, match: Match) -> tuple[int, int]:
+        """Deterministic scores with a few upsets, based on the match's place in the schedule."""
+        if (match.placeholder_seed_1 + match.placeholder_seed_2 + match.sequence_number) % 3:
+            return 15, 12
+        return 9, 12
+
+    def get_fixtures_snapshot(self, tournament: Tournament) -> dict[str, Any]:
+        """Everything that fixture propagation is allowed to change."""
+        tournament.refresh_from_db()
+        matches = Match.objects.filter(tournament=tournament).select_related(
+            "pool", "cross_pool", "bracket", "position_pool"
+        )
+
+        return {
+            "status": tournament.status,
+            "current_seeding": tournament.current_seeding,
+            "matches": {
+                self.get_match_key(match): (match.team_1_id, match.team_2_id, match.status)
+                for match in matches
+            },
+            "pools": {
+                pool.name: pool.results for pool in Pool.objects.filter(tournament=tournament)
+            },
+            "cross_pools": [
+                (cross_pool.initial_seeding, cross_pool.current_seeding)
+                for cross_pool in CrossPool.objects.filter(tournament=tournament)
+            ],
+            "brackets": {
+                bracket.name: (bracket.initial_seeding, bracket.current_seeding)
+                for bracket in Bracket.objects.filter(tournament=tournament)
+            },
+            "position_pools": {
+                position_pool.name: (position_pool.initial_seeding, position_pool.results)
+                for position_pool in PositionPool.objects.filter(tournament=tournament)
+            },
+        }
+
+    def get_next_match(self, tournament: Tournament) -> Match | None:
+        """The scheduled match that is earliest in the tournament structure."""
+        matches = Match.objects.filter(
+            tournament=tournament, status=Match.StatusTypes.SCHEDULED
+        ).select_related("pool", "cross_pool", "bracket", "position_pool")
+        return min(matches, key=self.get_match_key) if matches else None
+
+    def play_match(
+        self, tournament: Tournament, propagate: Callable[[Match], Any]
+    ) -> tuple[int, str, int, int, int] | None:
+        match = self.get_next_match(tournament)
+        if match is None:
+            return None
+
+        update_match_score_and_results(match, *self.get_scores(match))
+        propagate(match)
+        return self.get_match_key(match)
+
+    def assert_propagation_matches_full_rescan(self, with_cross_pool: bool) -> None:
+        rescanned = self.create_staged_tournament("Rescanned", self.teams, with_cross_pool)
+        propagated = self.create_staged_tournament("Propagated", self.teams, with_cross_pool)
+        self.start_staged_tournament(rescanned)
+        self.start_staged_tournament(propagated)
+
+        matches_played = 0
+        while True:
+            rescanned_key = self.play_match(rescanned, lambda m: populate_fixtures(m.tournament.id))
+            propagated_key = self.play_match(propagated, propagate_fixtures)
+
+            self.assertEqual(rescanned_key, propagated_key)
+            self.assertEqual(
+                self.get_fixtures_snapshot(rescanned), self.get_fixtures_snapshot(propagated)
+            )
+            if rescanned_key is None:
+                break
+            matches_played += 1
+
+        self.assertEqual(matches_played, Match.objects.filter(tournament=propagated).count())
+        propagated.refresh_from_db()
+        self.assertEqual(propagated.status, Tournament.StatusTypes.COMPLETED)
+
+    def test_propagation_matches_full_rescan_with_cross_pool(self) -> None:
+        """Test pools -> cross pool -> bracket and position pool propagation."""
+        self.assert_propagation_matches_full_rescan(with_cross_pool=True)
+
+    def test_propagation_matches_full_rescan_without_cross_pool(self) -> None:
+        """Test pools -> brackets propagation."""
+        self.assert_propagation_matches_full_rescan(with_cross_pool=False)
+
+    def test_propagation_bulk_updates_downstream_matches(self) -> None:
+        """Test that completing the last pool match writes all next matches in one update."""
+        tournament = self.create_staged_tournament("Tournament", self.teams)
+        self.start_staged_tournament(tournament)
+
+        pool_matches = list(Match.objects.filter(tournament=tournament, pool__isnull=False))
+        for match in pool_matches[:-1]:
+            update_match_score_and_results(match, *self.get_scores(match))
+            propagate_fixtures(match)
+
+        last_match = pool_matches[-1]
+        update_match_score_and_results(last_match, *self.get_scores(last_match))
+        # Including the insert of the stream event of the updated fixtures
+        with self.assertNumQueries(13):
+            updated_matches = propagate_fixtures(last_match)
+
+        self.assertTrue(updated_matches)
+        for match in updated_matches:
+            self.assertEqual(
+                Match.objects.filter(id=match.id, team_1_id=match.team_1_id).count(), 1
+            )
+
+    def test_builders_index_match_seeds(self) -> None:
+        """Test that every slot of every staged match is indexed by its seed."""
+        tournament = self.create_staged_tournament("Tournament", self.teams)
+
+        indexed = set(
+            MatchSeedSlot.objects.filter(tournament=tournament).values_list(
+                "match_id", "slot", "seed"
+            )
+        )
+        expected = set()
+        for match in Match.objects.filter(tournament=tournament):
+            expected.add((match.id, 1, match.placeholder_seed_1))
+            expected.add((match.id, 2, match.placeholder_seed_2))
+        self.assertEqual(indexed, expected)
+
+    def test_builders_bulk_create_stage_fixtures(self) -> None:
+        """Test that a stage's fixtures and seed index are inserted in one statement each."""
+        tournament = Tournament.objects.create(
+            name="Round Robin",
+            location="Test",
+            start_date="2025-01-01",
+            end_date="2025-01-02",
+        )
+        tournament.teams.set(self.teams)
+        tournament.refresh_from_db()
+        pool = Pool.objects.create(
+            tournament=tournament,
+            sequence_number=1,
+            name="A",
+            initial_seeding={seed: 0 for seed in range(1, 9)},
+            results={},
+        )
+        bracket = Bracket.objects.create(
+            tournament=tournament,
+            sequence_number=1,
+            name="1-8",
+            initial_seeding={seed: 0 for seed in range(1, 9)},
+            current_seeding={seed: 0 for seed in range(1, 9)},
+        )
+
+        # Savepoint, match insert, seed index insert, savepoint release
+        with self.assertNumQueries(4):
+            pool_matches = create_pool_matches(tournament, pool)
+        with self.assertNumQueries(4):
+            bracket_matches = create_bracket_matches(tournament, bracket)
+
+        self.assertEqual(len(pool_matches), 28)
+        self.assertEqual(len(bracket_matches), 12)
+        self.assertEqual(
+            {match.id for match in pool_matches},
+            set(Match.objects.filter(pool=pool).values_list("id", flat=True)),
+        )
+        self.assertEqual(
+            {match.id for match in bracket_matches},
+            set(Match.objects.filter(bracket=bracket).values_list("id", flat=True)),
+        )
+
+    def test_staff_submit_score_propagates_fixtures(self) -> None:
+        """Test that the staff score endpoint propagates teams to the next stage."""
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        client = Client()
+        client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+        tournament = self.create_staged_tournament("Tournament", self.teams, False)
+        self.start_staged_tournament(tournament)
+
+        for match in Match.objects.filter(tournament=tournament, pool__isnull=False):
+            response = client.post(
+                f"/api/matches/{match.id}/staff-submit-score",
+                data=json.dumps({"score_team_1": 15, "score_team_2": 10}),
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 200)
+
+        tournament.refresh_from_db()
+        semi_finals = Match.objects.filter(
+            tournament=tournament, bracket__name="1-4", sequence_number=1
+        )
+        self.assertEqual(semi_finals.count(), 2)
+        for match in semi_finals:
+            self.assertEqual(match.status, Match.StatusTypes.SCHEDULED)
+            self.assertEqual(
+                match.team_1_id, tournament.current_seeding[str(match.placeholder_seed_1)]
+            )
+            self.assertEqual(
+                match.team_2_id, tournament.current_seeding[str(match.placeholder_seed_2)]
+            )
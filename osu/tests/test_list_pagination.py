@@ -0,0 +1,89 @@
+import json
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from osu.player.models import Player
+from osu.tournament.models import CrossPool, Registration
+
+from .base import BaseTournamentTestCase, User
+
+
+class ListPaginationTestCase(BaseTournamentTestCase):
+    """Test that paginated list endpoints only load the requested page."""
+
+    def setUp(self) -> None:
+        """Set up a tournament with a registration per player."""
+        super().setUp()
+        self.client = Client()
+        self.teams = self.create_teams(8)
+        self.tournament = self.create_staged_tournament("Tournament", self.teams)
+
+        for i, team in enumerate(self.teams * 2, start=1):
+            user = User.objects.create_user(
+                username=f"player{i}@example.com", first_name=f"Player {i}", last_name="Test"
+            )
+            player = Player.objects.create(
+                user=user,
+                gender="M",
+                date_of_birth=timezone.now().date(),
+                match_up="M",
+            )
+            Registration.objects.create(tournament=self.tournament, team=team, player=player)
+
+    @contextmanager
+    def assert_fetches_one_page(self) -> Iterator[None]:
+        """Assert that the wrapped request counts the rows and selects one page of them."""
+        with CaptureQueriesContext(connection) as queries:
+            yield
+
+        self.assertEqual(len(queries), 2)
+        self.assertIn("COUNT(", queries[0]["sql"])
+        self.assertIn("LIMIT", queries[1]["sql"])
+
+    def test_list_registrations_fetches_one_page(self) -> None:
+        """Test that a registrations page costs a count and a limited select."""
+        with self.assert_fetches_one_page():
+            response = self.call_view(
+                "list_registrations",
+                {"tournament_id": self.tournament.id, "page": 2, "page_size": 5},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        registrations = Registration.objects.filter(tournament=self.tournament).order_by("id")
+        self.assertEqual(data["count"], 16)
+        self.assertEqual(
+            [item["id"] for item in data["items"]],
+            [registration.id for registration in registrations[5:10]],
+        )
+        registration = registrations[5]
+        self.assertEqual(
+            data["items"][0]["player"]["user_first_name"], registration.player.user.first_name
+        )
+
+    def test_list_teams_fetches_one_page(self) -> None:
+        """Test that a teams page costs a count and a limited select."""
+        with self.assert_fetches_one_page():
+            response = self.client.get("/api/teams", {"page": 1, "page_size": 3})
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["count"], 8)
+        self.assertEqual([item["name"] for item in data["items"]], ["Team 1", "Team 2", "Team 3"])
+
+    def test_list_cross_pools_fetches_one_page(self) -> None:
+        """Test that a cross pools page costs a count and a limited select."""
+        with self.assert_fetches_one_page():
+            response = self.call_view("list_cross_pools", {"tournament_id": self.tournament.id})
+
+        self.assertEqual(response.status_code, 200)
+        data = json.loads(response.content)
+        cross_pool = CrossPool.objects.get(tournament=self.tournament)
+        self.assertEqual(data["count"], 1)
+        self.assertEqual(data["items"][0]["id"], cross_pool.id)
+        self.assertEqual(data["items"][0]["tournament"]["id"], self.tournament.id)
@@ -0,0 +1,68 @@
+from django.db.models import Prefetch
+from django.test import TestCase
+from ninja import Schema
+
+from osu.loading import get_loading_plan, load_related
+from osu.match.models import Match, MatchStats
+from osu.match.schema import MatchDetailSchema, MatchStatsSchema
+from osu.player.models import Player
+from osu.player.schema import PlayerSchema
+from osu.tournament.models import Registration
+from osu.tournament.schema import RegistrationSchema
+
+
+class LoadingPlanTestCase(TestCase):
+    """Test the plans of the relations that response schemas serialize."""
+
+    def test_nested_single_relations_are_joined(self) -> None:
+        """Test that relations of relations, and those read by resolvers, are joined."""
+        plan = get_loading_plan(Match, MatchDetailSchema)
+
+        self.assertLessEqual(
+            {
+                "team_1",
+                "tournament",
+                "field",
+                "pool__tournament",
+                "suggested_score_team_1__entered_by__user",
+                "self_spirit_score_team_2__msp__user",
+            },
+            plan.select_related,
+        )
+        self.assertEqual(plan.prefetch_related, {})
+
+        plan = get_loading_plan(Registration, RegistrationSchema)
+        self.assertEqual(plan.select_related, {"tournament", "team", "player", "player__user"})
+
+    def test_relations_to_many_rows_are_prefetched(self) -> None:
+        """Test that reverse relations are prefetched, joined with their own relations."""
+        plan = get_loading_plan(Player, PlayerSchema)
+        self.assertEqual(plan.select_related, {"user"})
+        # UserSchema serializes all the fields of the user, with the ids of its groups
+        self.assertEqual(
+            set(plan.prefetch_related),
+            {"registration_set", "user__groups", "user__user_permissions"},
+        )
+        self.assertEqual(
+            plan.prefetch_related["registration_set"].select_related, {"tournament", "team"}
+        )
+
+        plan = get_loading_plan(MatchStats, MatchStatsSchema)
+        self.assertIn("scored_by__user", plan.prefetch_related["events"].select_related)
+
+    def test_existing_prefetches_are_kept(self) -> None:
+        """Test that a view's own prefetch of a relation is not replaced."""
+        events = Prefetch("events")
+        queryset = load_related(MatchStats.objects.prefetch_related(events), MatchStatsSchema)
+        self.assertEqual(queryset._prefetch_related_lookups, (events,))  # type: ignore[attr-defined]
+
+    def test_fields_that_are_not_relations_are_ignored(self) -> None:
+        """Test that a schema of plain values loads nothing."""
+
+        class MatchNameSchema(Schema):
+            id: int
+            name: str
+            team_1_id: int | None
+
+        plan = get_loading_plan(Match, MatchNameSchema)
+        self.assertEqual((plan.select_related, plan.prefetch_related), (set(), {}))
@@ -9,6 +9,7 @@ from osu.match.models import Match
 from osu.player.models import Player
 from osu.team.models import Team
 from osu.tournament.models import Registration, Tournament, TournamentField
+from osu.tournament.utils import update_tournament_spirit_rankings
 
 User = get_user_model()
 
@@ -262,6 +263,37 @@ class MatchAPITestCase(TestCase):
         if match.self_spirit_score_team_1:
             self.assertEqual(match.self_spirit_score_team_1.rules, 3)
 
+    def test_spirit_rankings_from_submitted_scores(self) -> None:
+        """Test that spirit rankings average the scores received by each team."""
+        self.tournament.teams.set([self.team1, self.team2])
+        scores = {"rules": 4, "fouls": 3, "fair": 4, "positive": 4, "communication": 3}
+        self_scores = {"rules": 3, "fouls": 3, "fair": 3, "positive": 3, "communication": 3}
+
+        url = f"{self.match_detail_url}/submit-spirit-score"
+        for client, opponent_scores in [
+            (self.team1_client, scores),
+            (self.team2_client, {**scores, "rules": 2}),
+        ]:
+            response = client.post(
+                url,
+                data=json.dumps({"opponent": opponent_scores, "self": self_scores}),
+                content_type="application/json",
+            )
+            self.assertEqual(response.status_code, 200)
+
+        # Team list, matches with their spirit totals, tournament update, version bump
+        with self.assertNumQueries(4):
+            update_tournament_spirit_rankings(self.tournament)
+
+        self.tournament.refresh_from_db()
+        self.assertEqual(
+            self.tournament.spirit_ranking,
+            [
+                {"team_id": self.team2.id, "points": 18.0, "self_points": 15.0, "rank": 1},
+                {"team_id": self.team1.id, "points": 16.0, "self_points": 15.0, "rank": 2},
+            ],
+        )
+
     def test_staff_submit_score(self) -> None:
         """Test staff submitting final match score."""
         score_data = {
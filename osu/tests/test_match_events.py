@@ -0,0 +1,220 @@
+import uuid
+from typing import Any
+
+from django.test import Client
+from django.utils import timezone
+
+from osu.match.models import Match, MatchEvent, MatchStats
+from osu.player.models import Player
+from osu.tournament.models import Pool
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+class MatchEventsTestCase(BaseTournamentTestCase):
+    """Test the batched sync of match events from stat-keepers, and the polling of them."""
+
+    def setUp(self) -> None:
+        """Set up a scheduled pool match, a player and a volunteer stat-keeper."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        pool = Pool.objects.get(tournament=self.tournament, name="A")
+        self.match = Match.objects.filter(pool=pool).order_by("id")[0]
+        if self.match.team_1_id is None or self.match.team_2_id is None:
+            self.fail("Pool matches have their teams once the tournament starts")
+        self.team_1_id: int = self.match.team_1_id
+        self.team_2_id: int = self.match.team_2_id
+
+        self.player = Player.objects.create(
+            user=User.objects.create_user(username="player@example.com"),
+            gender="M",
+            date_of_birth=timezone.now().date(),
+            match_up="M",
+        )
+        volunteer = User.objects.create_user(
+            username="volunteer@example.com", password=TEST_PASSWORD
+        )
+        self.tournament.volunteers.add(volunteer)
+        self.client = Client()
+        self.client.login(username="volunteer@example.com", password=TEST_PASSWORD)
+
+    def make_event(self, team_id: int, type: str, **kwargs: Any) -> dict[str, Any]:
+        """Event as recorded by a stat-keeper's device."""
+        return {
+            "client_id": str(uuid.uuid4()),
+            "team_id": team_id,
+            "started_on": MatchEvent.Mode.OFFENSE,
+            "type": type,
+            **kwargs,
+        }
+
+    def sync(self, events: list[dict[str, Any]], **kwargs: Any) -> Any:
+        """Sync a batch of events of the match."""
+        return self.client.post(
+            f"/api/matches/{self.match.id}/stats/events",
+            {"events": events, **kwargs},
+            content_type="application/json",
+        )
+
+    def test_events_are_applied_in_order(self) -> None:
+        """Test the running score of each event, and the score and possession of the stats."""
+        events = [
+            self.make_event(self.team_1_id, MatchEvent.EventType.THROWAWAY),
+            self.make_event(self.team_1_id, MatchEvent.EventType.BLOCK),
+            self.make_event(
+                self.team_1_id, MatchEvent.EventType.SCORE, scored_by_id=self.player.id
+            ),
+            self.make_event(self.team_2_id, MatchEvent.EventType.SCORE),
+            self.make_event(self.team_2_id, MatchEvent.EventType.DROP),
+            self.make_event(self.team_1_id, MatchEvent.EventType.SCORE),
+        ]
+        response = self.sync(events, initial_possession_id=self.team_1_id)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["created"], [event["client_id"] for event in events])
+        self.assertEqual(
+            (data["score_team_1"], data["score_team_2"], data["current_possession_id"]),
+            (2, 1, self.team_2_id),
+        )
+
+        stats = MatchStats.objects.get(match=self.match)
+        self.assertEqual((stats.score_team_1, stats.score_team_2), (2, 1))
+        self.assertEqual(stats.initial_possession_id, self.team_1_id)
+        self.assertEqual(stats.current_possession_id, self.team_2_id)
+        self.assertEqual(
+            list(
+                stats.events.order_by("id").values_list(
+                    "current_score_team_1", "current_score_team_2"
+                )
+            ),
+            [(0, 0), (0, 0), (1, 0), (1, 1), (1, 1), (2, 1)],
+        )
+
+    def test_resent_events_are_skipped(self) -> None:
+        """Test that a batch can be resent, along with new events, without applying it twice."""
+        first_batch = [
+            self.make_event(self.team_1_id, MatchEvent.EventType.SCORE) for _ in range(3)
+        ]
+        self.sync(first_batch, initial_possession_id=self.team_1_id)
+
+        second_batch = [
+            *first_batch,
+            self.make_event(self.team_2_id, MatchEvent.EventType.SCORE),
+        ]
+        response = self.sync(second_batch)
+
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+        self.assertEqual(data["created"], [second_batch[-1]["client_id"]])
+        self.assertEqual(data["duplicates"], [event["client_id"] for event in first_batch])
+        self.assertEqual((data["score_team_1"], data["score_team_2"]), (3, 1))
+        self.assertEqual(MatchEvent.objects.filter(stats__match=self.match).count(), 4)
+
+    def test_batch_costs_a_fixed_number_of_queries(self) -> None:
+        """Test that the events of a batch are written together, whatever the batch size."""
+        self.sync(
+            [self.make_event(self.team_1_id, MatchEvent.EventType.SCORE)],
+            initial_possession_id=self.team_1_id,
+        )
+
+        for size in [1, 30]:
+            with self.subTest(size=size):
+                events = [
+                    self.make_event(
+                        self.team_2_id, MatchEvent.EventType.SCORE, assisted_by_id=self.player.id
+                    )
+                    for _ in range(size)
+                ]
+                # Session, user, match, volunteer check, players, savepoint, locked stats,
+                # synced client ids, events insert, stats update, player stats insert and
+                # update, stream event insert, and savepoint release
+                with self.assertNumQueries(14):
+                    response = self.sync(events)
+                self.assertEqual(len(response.json()["created"]), size)
+
+    def test_invalid_batches_are_rejected(self) -> None:
+        """Test that nothing is written for a batch that cannot be applied."""
+        other_team = self.tournament.teams.exclude(
+            id__in=[self.team_1_id, self.team_2_id]
+        ).order_by("id")[0]
+        for events, kwargs in [
+            # No team starting on offense in the first batch
+            ([self.make_event(self.team_1_id, MatchEvent.EventType.SCORE)], {}),
+            # Team not in the match
+            (
+                [self.make_event(other_team.id, MatchEvent.EventType.SCORE)],
+                {"initial_possession_id": self.team_1_id},
+            ),
+            # Player that does not exist
+            (
+                [self.make_event(self.team_1_id, MatchEvent.EventType.SCORE, scored_by_id=0)],
+                {"initial_possession_id": self.team_1_id},
+            ),
+        ]:
+            with self.subTest(kwargs=kwargs):
+                self.assertEqual(self.sync(events, **kwargs).status_code, 400)
+
+        self.assertFalse(MatchStats.objects.filter(match=self.match).exists())
+
+    def test_stats_since_cursor(self) -> None:
+        """Test that polling the stats with the cursor of the last poll only gets newer events."""
+        first_batch = [
+            self.make_event(self.team_1_id, MatchEvent.EventType.SCORE) for _ in range(2)
+        ]
+        self.sync(first_batch, initial_possession_id=self.team_1_id)
+
+        data = self.client.get(f"/api/matches/{self.match.id}/stats").json()
+        self.assertEqual(len(data["events"]), 2)
+        self.assertEqual(data["cursor"], max(event["id"] for event in data["events"]))
+
+        cursor = data["cursor"]
+        data = self.client.get(f"/api/matches/{self.match.id}/stats", {"since": cursor}).json()
+        self.assertEqual((data["events"], data["cursor"]), ([], cursor))
+
+        second_batch = [
+            self.make_event(self.team_2_id, MatchEvent.EventType.SCORE) for _ in range(3)
+        ]
+        self.sync(second_batch)
+        data = self.client.get(f"/api/matches/{self.match.id}/stats", {"since": cursor}).json()
+        self.assertEqual(len(data["events"]), 3)
+        self.assertTrue(all(event["id"] > cursor for event in data["events"]))
+        self.assertEqual(data["score_team_2"], 3)
+
+    def test_stats_cost_a_fixed_number_of_queries(self) -> None:
+        """Test that the events of the stats are loaded together with their teams and players."""
+        for size in [1, 30]:
+            with self.subTest(size=size):
+                self.sync(
+                    [
+                        self.make_event(
+                            self.team_1_id,
+                            MatchEvent.EventType.SCORE,
+                            scored_by_id=self.player.id,
+                            assisted_by_id=self.player.id,
+                        )
+                        for _ in range(size)
+                    ],
+                    initial_possession_id=self.team_1_id,
+                )
+                # Stats with their possession teams, then the events with their teams and players
+                with self.assertNumQueries(2):
+                    response = self.client.get(f"/api/matches/{self.match.id}/stats")
+                self.assertEqual(
+                    response.json()["events"][0]["scored_by"]["user_full_name"],
+                    self.player.user.get_full_name(),
+                )
+
+    def test_only_stat_keepers_can_sync(self) -> None:
+        """Test that users who are neither staff nor volunteers cannot sync events."""
+        User.objects.create_user(username="spectator@example.com", password=TEST_PASSWORD)
+        self.client.login(username="spectator@example.com", password=TEST_PASSWORD)
+
+        response = self.sync(
+            [self.make_event(self.team_1_id, MatchEvent.EventType.SCORE)],
+            initial_possession_id=self.team_1_id,
+        )
+        self.assertEqual(response.status_code, 401)
@@ -0,0 +1,95 @@
+from django.test import Client
+from django.utils import timezone
+
+from osu.match.models import Match, MatchScore, SpiritScore
+from osu.player.models import Player
+from osu.tournament.models import Pool, TournamentField
+
+from .base import BaseTournamentTestCase, User
+
+
+class MatchQueriesTestCase(BaseTournamentTestCase):
+    """Test that matches are serialized with a fixed number of queries."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament with fields and a player."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.pool = Pool.objects.get(tournament=self.tournament, name="A")
+        self.player = Player.objects.create(
+            user=User.objects.create_user(username="player@example.com"),
+            gender="M",
+            date_of_birth=timezone.now().date(),
+            match_up="M",
+        )
+        self.client = Client()
+
+    def add_matches(self, count: int) -> None:
+        """More pool matches on their own fields, between the first teams of the pool."""
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        start = TournamentField.objects.filter(tournament=self.tournament).count()
+        for i in range(start, start + count):
+            field = TournamentField.objects.create(name=f"Field {i}", tournament=self.tournament)
+            Match.objects.create(
+                name=f"Extra {i}",
+                tournament=self.tournament,
+                pool=self.pool,
+                sequence_number=1,
+                placeholder_seed_1=match.placeholder_seed_1,
+                placeholder_seed_2=match.placeholder_seed_2,
+                team_1=match.team_1,
+                team_2=match.team_2,
+                field=field,
+                status=Match.StatusTypes.SCHEDULED,
+            )
+
+    def test_match_lists_cost_fixed_queries(self) -> None:
+        """Test that listing more matches, on more fields, costs the same queries."""
+        team = Match.objects.filter(pool=self.pool).order_by("id")[0].team_1
+        if team is None:
+            self.fail("Pool matches have their teams once the tournament starts")
+
+        # The tournament's version lookup, when the list is of a tournament, and the matches
+        for path, params, num_queries in [
+            ("/api/matches", {"tournament_id": self.tournament.id, "pool_id": self.pool.id}, 2),
+            ("/api/matches", {"pool_id": self.pool.id}, 1),
+            (f"/api/matches/tournament/{self.tournament.slug}/team/{team.slug}", {}, 2),
+        ]:
+            with self.subTest(path=path, params=params):
+                with self.assertNumQueries(num_queries):
+                    count = len(self.client.get(path, params).json())
+
+                self.add_matches(10)
+                with self.assertNumQueries(num_queries):
+                    self.assertEqual(len(self.client.get(path, params).json()), count + 10)
+
+    def test_match_detail_costs_fixed_queries(self) -> None:
+        """Test that the scores and spirit scores of a match are loaded with it."""
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        for field in ["suggested_score_team_1", "suggested_score_team_2"]:
+            setattr(
+                match,
+                field,
+                MatchScore.objects.create(score_team_1=15, score_team_2=11, entered_by=self.player),
+            )
+        for field in [
+            "spirit_score_team_1",
+            "spirit_score_team_2",
+            "self_spirit_score_team_1",
+            "self_spirit_score_team_2",
+        ]:
+            spirit_score = SpiritScore.objects.create(
+                rules=2, fouls=2, fair=2, positive=2, communication=2, total=10
+            )
+            spirit_score.mvp = spirit_score.msp = self.player
+            spirit_score.save()
+            setattr(match, field, spirit_score)
+        match.save()
+
+        # The tournament's version lookup and the match
+        with self.assertNumQueries(2):
+            data = self.client.get(f"/api/matches/{match.id}").json()
+
+        self.assertEqual(data["suggested_score_team_1"]["entered_by"]["id"], self.player.id)
+        self.assertEqual(data["self_spirit_score_team_2"]["msp"]["id"], self.player.id)
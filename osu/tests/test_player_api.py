@@ -0,0 +1,148 @@
+from typing import Any
+
+from django.test import Client, TestCase
+from django.utils import timezone
+
+from osu.player.models import Player
+from osu.team.models import Team
+from osu.tournament.models import Registration, Tournament
+
+from .base import User
+
+# (first name, last name, city), with duplicate names and cities to exercise tiebreaks
+PLAYERS = [
+    ("Asha", "Rao", "Chennai"),
+    ("Bala", "Iyer", "Bengaluru"),
+    ("Asha", "Rao", "Bengaluru"),
+    ("Chitra", "Das", "Chennai"),
+    ("Dev", "Nair", "Chennai"),
+    ("Bala", "Iyer", "Mumbai"),
+    ("Esha", "Sen", "Bengaluru"),
+]
+
+
+class PlayerListTestCase(TestCase):
+    """Test the offset and cursor pagination of the players directory."""
+
+    def setUp(self) -> None:
+        """Set up players with duplicate sort keys."""
+        self.client = Client()
+        team = Team.objects.create(name="Team")
+        self.tournaments = [
+            Tournament.objects.create(
+                name=f"Tournament {i}",
+                start_date=timezone.now().date(),
+                end_date=timezone.now().date(),
+            )
+            for i in range(1, 3)
+        ]
+        for i, (first_name, last_name, city) in enumerate(PLAYERS, start=1):
+            user = User.objects.create_user(
+                username=f"player{i}@example.com", first_name=first_name, last_name=last_name
+            )
+            player = Player.objects.create(
+                user=user,
+                gender="F" if i % 2 else "M",
+                date_of_birth=timezone.now().date(),
+                match_up="F",
+                city=city,
+                preffered_role="C" if i % 3 else "H",
+            )
+            for tournament in self.tournaments[: i % 3]:
+                Registration.objects.create(tournament=tournament, team=team, player=player)
+
+    def list_players(self, **params: Any) -> dict[str, Any]:
+        """Get a page of the players directory."""
+        response = self.client.get("/api/players", params)
+        self.assertEqual(response.status_code, 200)
+        data: dict[str, Any] = response.json()
+        return data
+
+    def collect_cursor_pages(self, **params: Any) -> list[int]:
+        """Follow the next cursors from the first page and collect the player ids."""
+        player_ids: list[int] = []
+        cursor = ""
+        while True:
+            data = self.list_players(cursor=cursor, limit=3, **params)
+            self.assertLessEqual(len(data["players"]), 3)
+            player_ids += [player["id"] for player in data["players"]]
+            if data["next"] is None:
+                return player_ids
+            cursor = data["next"]
+
+    def test_cursor_pages_match_offset_order(self) -> None:
+        """Test that cursor pages list every player once, in the offset pages order."""
+        for sort in ["name", "gender", "city", "role"]:
+            for order in ["asc", "desc"]:
+                with self.subTest(sort=sort, order=order):
+                    offset_ids = [
+                        player["id"]
+                        for player in self.list_players(sort=sort, order=order, limit=50)["players"]
+                    ]
+                    self.assertEqual(len(offset_ids), len(PLAYERS))
+                    self.assertEqual(self.collect_cursor_pages(sort=sort, order=order), offset_ids)
+
+    def test_cursor_pages_skip_total_unless_requested(self) -> None:
+        """Test that the total is only counted in cursor mode when it is requested."""
+        self.assertIsNone(self.list_players(cursor="", limit=3)["total"])
+        self.assertEqual(
+            self.list_players(cursor="", limit=3, include_total=True)["total"], len(PLAYERS)
+        )
+        self.assertEqual(self.list_players(limit=3)["total"], len(PLAYERS))
+
+    def test_cursor_page_sizes_are_bounded(self) -> None:
+        """Test that cursor pages with no players, or too many, are refused."""
+        for limit in [0, -1, 201]:
+            with self.subTest(limit=limit):
+                response = self.client.get("/api/players", {"cursor": "", "limit": str(limit)})
+                self.assertEqual(response.status_code, 400)
+
+        # Offset pages keep accepting any size
+        self.assertEqual(len(self.list_players(limit=500)["players"]), len(PLAYERS))
+
+    def test_list_players_query_count_is_independent_of_page_size(self) -> None:
+        """Test that player registrations come from one prefetch, not a query per player."""
+        for limit in [1, 3, len(PLAYERS)]:
+            with self.subTest(limit=limit):
+                # Count, players with their users, registrations with tournament and team
+                with self.assertNumQueries(3):
+                    data = self.list_players(limit=limit)
+                self.assertEqual(len(data["players"]), limit)
+
+                # Cursor pages skip the count
+                with self.assertNumQueries(2):
+                    self.list_players(cursor="", limit=limit)
+
+        registrations = {
+            player["id"]: [
+                registration["tournament"]["id"] for registration in player["registrations"]
+            ]
+            for player in self.list_players(limit=50)["players"]
+        }
+        for player in Player.objects.all():
+            self.assertEqual(
+                registrations[player.id],
+                list(
+                    player.registration_set.order_by("id").values_list("tournament_id", flat=True)
+                ),
+            )
+
+    def test_get_player_query_count(self) -> None:
+        """Test that a player's registrations are prefetched with their tournament and team."""
+        player = Player.objects.get(user__username="player2@example.com")
+        # Player with its user, registrations with tournament and team, user groups and
+        # permissions of the user schema
+        with self.assertNumQueries(4):
+            response = self.client.get(f"/api/players/{player.slug}")
+
+        self.assertEqual(response.status_code, 200)
+        registrations = response.json()["registrations"]
+        self.assertEqual(len(registrations), 2)
+        self.assertEqual(registrations[0]["team"]["name"], "Team")
+
+    def test_invalid_cursor(self) -> None:
+        """Test that a cursor that was not returned by the API is rejected."""
+        for cursor in ["not a cursor", "WzFd"]:
+            with self.subTest(cursor=cursor):
+                response = self.client.get("/api/players", {"cursor": cursor})
+                self.assertEqual(response.status_code, 400)
@@ -0,0 +1,138 @@
+import uuid
+from io import StringIO
+from typing import Any
+
+from django.core.management import call_command
+from django.test import Client
+from django.utils import timezone
+
+from osu.match.models import Match, MatchEvent, PlayerStats
+from osu.player.models import Player
+from osu.tournament.models import Pool
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+class PlayerStatsTestCase(BaseTournamentTestCase):
+    """Test the player stats kept from synced match events, and the leaderboard they back."""
+
+    def setUp(self) -> None:
+        """Set up a scheduled pool match, a player of each team and a staff stat-keeper."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        pool = Pool.objects.get(tournament=self.tournament, name="A")
+        self.match = Match.objects.filter(pool=pool).order_by("id")[0]
+        if self.match.team_1_id is None or self.match.team_2_id is None:
+            self.fail("Pool matches have their teams once the tournament starts")
+        self.team_1_id: int = self.match.team_1_id
+        self.team_2_id: int = self.match.team_2_id
+
+        self.player_1, self.player_2 = (
+            Player.objects.create(
+                user=User.objects.create_user(username=f"player{i}@example.com"),
+                gender="M",
+                date_of_birth=timezone.now().date(),
+                match_up="M",
+            )
+            for i in range(2)
+        )
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.client = Client()
+        self.client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def sync(self, *events: tuple[int, str, dict[str, Any]]) -> None:
+        """Sync events of the match, given as their team, type and players."""
+        response = self.client.post(
+            f"/api/matches/{self.match.id}/stats/events",
+            {
+                "initial_possession_id": self.team_1_id,
+                "events": [
+                    {
+                        "client_id": str(uuid.uuid4()),
+                        "team_id": team_id,
+                        "started_on": MatchEvent.Mode.OFFENSE,
+                        "type": type,
+                        **players,
+                    }
+                    for team_id, type, players in events
+                ],
+            },
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def get_stats(self) -> dict[int, tuple[int | None, int, int, int, int, int]]:
+        """Team and counts of the player stats of the tournament, by player id."""
+        return {
+            stats.player_id: (
+                stats.team_id,
+                stats.goals,
+                stats.assists,
+                stats.blocks,
+                stats.drops,
+                stats.throwaways,
+            )
+            for stats in PlayerStats.objects.filter(tournament=self.tournament)
+        }
+
+    def sync_match(self) -> None:
+        """Sync a few batches of events of both players."""
+        score = MatchEvent.EventType.SCORE
+        self.sync(
+            (self.team_1_id, score, {"scored_by_id": self.player_1.id}),
+            (self.team_1_id, MatchEvent.EventType.THROWAWAY, {"throwaway_by_id": self.player_1.id}),
+            (self.team_1_id, score, {"assisted_by_id": self.player_1.id}),
+        )
+        self.sync(
+            (self.team_2_id, MatchEvent.EventType.BLOCK, {"block_by_id": self.player_2.id}),
+            (self.team_2_id, score, {"scored_by_id": self.player_2.id}),
+            (self.team_2_id, score, {"scored_by_id": self.player_2.id}),
+            (self.team_1_id, MatchEvent.EventType.DROP, {}),
+        )
+
+    def test_synced_events_update_player_stats(self) -> None:
+        """Test that the stats of the players are updated with each synced batch."""
+        self.sync_match()
+
+        self.assertEqual(
+            self.get_stats(),
+            {
+                self.player_1.id: (self.team_1_id, 1, 1, 0, 0, 1),
+                self.player_2.id: (self.team_2_id, 2, 0, 1, 0, 0),
+            },
+        )
+
+    def test_rebuild_matches_incremental_stats(self) -> None:
+        """Test that rebuilding the stats from the events gives the same totals."""
+        self.sync_match()
+        stats = self.get_stats()
+        PlayerStats.objects.filter(player=self.player_2).update(goals=0)
+
+        output = StringIO()
+        call_command("rebuild_player_stats", self.tournament.slug, stdout=output)
+
+        self.assertIn("Rebuilt stats of 2 players", output.getvalue())
+        self.assertEqual(self.get_stats(), stats)
+
+    def test_leaderboard(self) -> None:
+        """Test that the leaderboard is ranked by the requested stat, a page at a time."""
+        self.sync_match()
+        path = f"/api/tournaments/{self.tournament.slug}/leaderboard"
+
+        with self.assertNumQueries(2):
+            data = self.client.get(path).json()
+        self.assertEqual(data["count"], 2)
+        self.assertEqual(
+            [(item["player"]["id"], item["goals"]) for item in data["items"]],
+            [(self.player_2.id, 2), (self.player_1.id, 1)],
+        )
+
+        data = self.client.get(path, {"stat": "throwaways"}).json()
+        self.assertEqual(data["items"][0]["player"]["id"], self.player_1.id)
+
+        self.assertEqual(self.client.get(path, {"stat": "spirit"}).status_code, 422)
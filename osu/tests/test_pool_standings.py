@@ -0,0 +1,81 @@
+import copy
+
+from osu.match.models import Match
+from osu.tournament.models import Pool, Tournament
+from osu.tournament.utils import get_new_pool_results, update_match_score_and_results
+
+from .base import BaseTournamentTestCase
+
+# Pool A scores by seeds, where seeds 1, 4 and 5 beat each other in a cycle
+# and all three beat seed 8
+POOL_A_SCORES = {
+    (1, 4): (15, 10),
+    (4, 5): (15, 12),
+    (1, 5): (14, 15),
+    (1, 8): (15, 0),
+    (4, 8): (15, 5),
+    (5, 8): (15, 1),
+}
+
+
+class PoolStandingsTestCase(BaseTournamentTestCase):
+    """Test pool standings and their head-to-head tiebreaks."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament and its pool A matches in play order."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.pool = Pool.objects.get(tournament=self.tournament, name="A")
+        self.matches = [
+            Match.objects.get(pool=self.pool, placeholder_seed_1=seed_1, placeholder_seed_2=seed_2)
+            for seed_1, seed_2 in POOL_A_SCORES
+        ]
+
+    def get_team_id(self, seed: int) -> int:
+        """Team that started the tournament with the given seed."""
+        return int(self.tournament.initial_seeding[str(seed)])
+
+    def test_three_way_tie_is_resolved_by_head_to_head(self) -> None:
+        """Test a tie on wins and head-to-head wins, split by head-to-head goal difference."""
+        for match in self.matches:
+            update_match_score_and_results(
+                match, *POOL_A_SCORES[(match.placeholder_seed_1, match.placeholder_seed_2)]
+            )
+
+        self.pool.refresh_from_db()
+        ranking = sorted(self.pool.results.items(), key=lambda item: item[1]["rank"])
+        # Head-to-head goal difference: 1 -> +4, 4 -> -2, 5 -> -2, so 4 and 5 are split by
+        # overall goal difference: 4 -> +8, 5 -> +12
+        self.assertEqual(
+            [int(team_id) for team_id, _ in ranking],
+            [self.get_team_id(seed) for seed in (1, 5, 4, 8)],
+        )
+
+        self.tournament.refresh_from_db()
+        for seed, team_seed in zip((1, 4, 5, 8), (1, 5, 4, 8), strict=True):
+            self.assertEqual(
+                self.tournament.current_seeding[str(seed)], self.get_team_id(team_seed)
+            )
+
+    def test_standings_cost_one_query_with_ties(self) -> None:
+        """Test that every tie group is resolved from a single head-to-head query."""
+        for match in self.matches[:-1]:
+            update_match_score_and_results(
+                match, *POOL_A_SCORES[(match.placeholder_seed_1, match.placeholder_seed_2)]
+            )
+
+        last_match = self.matches[-1]
+        last_match.score_team_1, last_match.score_team_2 = POOL_A_SCORES[(5, 8)]
+        self.pool.refresh_from_db()
+        self.tournament = Tournament.objects.get(id=self.tournament.id)
+        results = {int(k): v for k, v in copy.deepcopy(self.pool.results).items()}
+
+        with self.assertNumQueries(1):
+            new_results, _ = get_new_pool_results(
+                results, last_match, [1, 4, 5, 8], self.tournament.current_seeding
+            )
+
+        self.assertEqual(
+            [new_results[self.get_team_id(seed)]["rank"] for seed in (1, 5, 4, 8)], [1, 2, 3, 4]
+        )
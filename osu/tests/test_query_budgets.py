@@ -0,0 +1,273 @@
+"""
+Query budgets for the API's read routes.
+
+Every GET route is requested against a seeded live tournament, and the number of
+queries of each request is checked against a budget. With RUN_BENCHMARKS=1, the wall-clock
+time of each request is also checked against a ceiling, QUERY_BUDGET_MAX_SECONDS. The
+measurements are printed as a report after the run, and also written to the file named by
+the QUERY_BUDGET_REPORT environment variable when it is set.
+"""
+import os
+import time
+from typing import Any, NamedTuple
+
+from django.db import connection
+from django.http.response import HttpResponseBase
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from osu.match.api import router as match_router
+from osu.match.models import Match, MatchEvent, MatchStats, SpiritScore
+from osu.player.api import router as player_router
+from osu.player.models import Player
+from osu.team.api import router as team_router
+from osu.tournament.api import router as tournament_router
+from osu.tournament.models import Registration, TournamentField
+from osu.tournament.utils import (
+    propagate_fixtures,
+    rebuild_player_stats,
+    update_match_score_and_results,
+    update_tournament_spirit_rankings,
+)
+from osu.user.api import router as user_router
+
+from .base import RUN_BENCHMARKS, BaseTournamentTestCase, ReportMixin, User
+
+TEST_PASSWORD = "test_password_only"
+PLAYERS_PER_TEAM = 4
+
+# Routes that stream responses, whose queries are not bounded by a request
+STREAMING_ROUTES = {"get_tournament_events"}
+
+# Wall-clock ceiling of a single request, generous enough for slow machines
+MAX_REQUEST_SECONDS = float(os.environ.get("QUERY_BUDGET_MAX_SECONDS", "1.0"))
+
+
+class QueryBudget(NamedTuple):
+    """A GET route, how to request it, and the most queries it may run."""
+
+    url_name: str
+    path: str
+    max_queries: int
+    params: dict[str, Any] = {}
+    authenticated: bool = False
+    # Paths matched by an earlier route are requested by calling their view directly
+    call_view: bool = False
+
+
+class QueryBudgetTestCase(ReportMixin, BaseTournamentTestCase):
+    """Test that every read route stays within its query budget."""
+
+    report_title = "Query budgets"
+    report_header = f"{'Route':<80} {'Queries':>7} {'Budget':>6} {'ms':>8}"
+    report_variable = "QUERY_BUDGET_REPORT"
+
+    def setUp(self) -> None:
+        """Seed a live tournament with registrations, played matches and spirit scores."""
+        super().setUp()
+        self.teams = self.create_teams(8)
+        self.tournament = self.create_staged_tournament("Tournament", self.teams)
+        self.field = TournamentField.objects.create(name="Field 1", tournament=self.tournament)
+
+        for team in self.teams:
+            for i in range(1, PLAYERS_PER_TEAM + 1):
+                user = User.objects.create_user(
+                    username=f"{team.slug}-{i}@example.com",
+                    first_name=f"{team.name} Player",
+                    last_name=str(i),
+                )
+                player = Player.objects.create(
+                    user=user,
+                    gender="M",
+                    date_of_birth=timezone.now().date(),
+                    match_up="M",
+                    preffered_role="C",
+                )
+                team.players.add(player)
+                Registration.objects.create(tournament=self.tournament, team=team, player=player)
+        self.player = Player.objects.order_by("id")[0]
+
+        self.start_staged_tournament(self.tournament)
+        for _ in range(2):
+            # Play the pools and then the cross pool round
+            for match in Match.objects.filter(
+                tournament=self.tournament, status=Match.StatusTypes.SCHEDULED
+            ):
+                update_match_score_and_results(match, 15, 11)
+                propagate_fixtures(match)
+                self.add_spirit_scores(match)
+        update_tournament_spirit_rankings(self.tournament)
+
+        self.match = Match.objects.filter(tournament=self.tournament, pool__isnull=False)[0]
+        self.add_match_stats(self.match)
+
+        self.user = User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.anonymous_client = Client()
+        self.authenticated_client = Client()
+        self.authenticated_client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def add_spirit_scores(self, match: Match) -> None:
+        """Spirit scores from both teams of a match, about the other team and themselves."""
+        for field in [
+            "spirit_score_team_1",
+            "spirit_score_team_2",
+            "self_spirit_score_team_1",
+            "self_spirit_score_team_2",
+        ]:
+            spirit_score = SpiritScore.objects.create(
+                rules=2, fouls=2, fair=2, positive=2, communication=2, total=10, mvp=self.player
+            )
+            setattr(match, field, spirit_score)
+        match.save()
+
+    def add_match_stats(self, match: Match) -> None:
+        """Live stats of a match with a few scoring events."""
+        if match.team_1 is None or match.team_2 is None:
+            self.fail("Match stats are only kept for matches between two teams")
+
+        stats = MatchStats.objects.create(
+            match=match,
+            tournament=self.tournament,
+            initial_possession=match.team_1,
+            current_possession=match.team_2,
+        )
+        for i in range(1, 4):
+            MatchEvent.objects.create(
+                stats=stats,
+                team=match.team_1,
+                started_on=MatchEvent.Mode.OFFENSE,
+                type=MatchEvent.EventType.SCORE,
+                scored_by=self.player,
+                assisted_by=self.player,
+                current_score_team_1=i,
+                current_score_team_2=0,
+            )
+        rebuild_player_stats(self.tournament.id)
+
+    def get_budgets(self) -> list[QueryBudget]:
+        """
+        Budgets of every GET route, with the seeded objects they are requested for.
+
+        Tests run without a cache, so the cached tournament pages are measured on a miss,
+        which costs the version lookup on top of the view's own queries.
+        """
+        team = self.teams[0]
+        tournament = self.tournament
+        return [
+            QueryBudget("get_current_user", "/api/user/me", 4, authenticated=True),
+            QueryBudget("list_players", "/api/players", 3, {"limit": 20}),
+            QueryBudget("get_player_by_slug", f"/api/players/{self.player.slug}", 4),
+            QueryBudget("list_teams", "/api/teams", 2),
+            QueryBudget("get_team", f"/api/teams/{team.id}", 2),
+            QueryBudget("get_team_by_slug", f"/api/teams/by-slug/{team.slug}", 2),
+            QueryBudget("list_tournaments", "/api/tournaments", 2),
+            QueryBudget("get_tournament", f"/api/tournaments/{tournament.slug}", 4),
+            QueryBudget(
+                "get_user_access_for_tournament",
+                f"/api/tournaments/{tournament.slug}/me/access",
+                4,
+                authenticated=True,
+            ),
+            QueryBudget(
+                "get_fields_by_tournament_id", f"/api/tournaments/{tournament.id}/fields", 2
+            ),
+            QueryBudget(
+                "list_registrations",
+                "/api/tournaments/registrations",
+                2,
+                {"tournament_id": tournament.id},
+                call_view=True,
+            ),
+            QueryBudget(
+                "get_tournament_team_roster",
+                f"/api/tournaments/{tournament.slug}/team/{team.slug}/roster",
+                1,
+            ),
+            QueryBudget(
+                "get_tournament_snapshot", f"/api/tournaments/{tournament.slug}/snapshot", 9
+            ),
+            QueryBudget(
+                "get_tournament_leaderboard", f"/api/tournaments/{tournament.slug}/leaderboard", 2
+            ),
+            QueryBudget("list_pools", f"/api/tournaments/{tournament.slug}/pools", 2),
+            QueryBudget(
+                "list_cross_pools",
+                "/api/tournaments/cross-pools",
+                2,
+                {"tournament_id": tournament.id},
+                call_view=True,
+            ),
+            QueryBudget("list_brackets", f"/api/tournaments/{tournament.slug}/brackets", 2),
+            QueryBudget(
+                "list_position_pools",
+                "/api/tournaments/position-pools",
+                3,
+                {"tournament_id": tournament.id},
+                call_view=True,
+            ),
+            # Matches without teams yet do not fit MatchBasicSchema, so list the played ones
+            QueryBudget(
+                "list_matches",
+                "/api/matches",
+                2,
+                {"tournament_id": tournament.id, "status": Match.StatusTypes.COMPLETED},
+            ),
+            QueryBudget(
+                "list_tournament_team_matches",
+                f"/api/matches/tournament/{tournament.slug}/team/{team.slug}",
+                2,
+            ),
+            QueryBudget("get_match", f"/api/matches/{self.match.id}", 2),
+            QueryBudget("list_match_jobs", f"/api/matches/{self.match.id}/jobs", 1),
+            QueryBudget("get_match_stats", f"/api/matches/{self.match.id}/stats", 2),
+        ]
+
+    def request(self, budget: QueryBudget) -> HttpResponseBase:
+        """Request a route like the site does."""
+        if budget.call_view:
+            return self.call_view(budget.url_name, budget.params)
+
+        client = self.authenticated_client if budget.authenticated else self.anonymous_client
+        return client.get(budget.path, budget.params)
+
+    def test_read_routes_within_query_budget(self) -> None:
+        """Test the number of queries of a request to every GET route, and its time."""
+        for budget in self.get_budgets():
+            with self.subTest(route=budget.url_name):
+                # Warm up per-process caches, such as the content types of the permissions
+                self.request(budget)
+
+                with CaptureQueriesContext(connection) as queries:
+                    start = time.perf_counter()
+                    response = self.request(budget)
+                    seconds = time.perf_counter() - start
+
+                self.report_lines.append(
+                    f"{budget.url_name + ' ' + budget.path:<80} {len(queries):>7} "
+                    f"{budget.max_queries:>6} {seconds * 1000:>8.1f}"
+                )
+                self.assertEqual(response.status_code, 200)
+                self.assertLessEqual(
+                    len(queries),
+                    budget.max_queries,
+                    "\n".join(query["sql"] for query in queries.captured_queries),
+                )
+                if RUN_BENCHMARKS:
+                    self.assertLess(seconds, MAX_REQUEST_SECONDS)
+
+    def test_every_read_route_has_a_budget(self) -> None:
+        """Test that a new GET route cannot be added without a query budget."""
+        get_routes = {
+            operation.view_func.__name__
+            for router in [user_router, player_router, team_router, tournament_router, match_router]
+            for path_view in router.path_operations.values()
+            for operation in path_view.operations
+            if "GET" in operation.methods
+        }
+
+        self.assertEqual(
+            {budget.url_name for budget in self.get_budgets()}, get_routes - STREAMING_ROUTES
+        )
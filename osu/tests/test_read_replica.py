@@ -0,0 +1,118 @@
+import sqlite3
+import tempfile
+from pathlib import Path
+
+from django.db import connections
+from django.test import Client, SimpleTestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from osu.match.models import Match
+from osu.replica import PIN_COOKIE, refresh_sqlite_replica
+
+from .base import TournamentTestMixin, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+@override_settings(READ_REPLICA_DATABASE="replica")
+class ReadReplicaRoutingTestCase(TournamentTestMixin, TransactionTestCase):
+    """Test that public reads go to the replica, and the rest to the default database."""
+
+    databases = {"default", "replica"}
+
+    def setUp(self) -> None:
+        """Set up a started tournament, and a staff client."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.staff_client = Client()
+        self.staff_client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def count_queries(self, client: Client, path: str) -> dict[str, int]:
+        """Get the path, and count the queries that each database ran for it."""
+        with (
+            CaptureQueriesContext(connections["default"]) as default_queries,
+            CaptureQueriesContext(connections["replica"]) as replica_queries,
+        ):
+            response = client.get(path)
+        self.assertEqual(response.status_code, 200)
+        return {
+            "default": len(default_queries.captured_queries),
+            "replica": len(replica_queries.captured_queries),
+        }
+
+    def test_public_reads_go_to_the_replica(self) -> None:
+        """Test that a GET without authentication only reads from the replica."""
+        queries = self.count_queries(Client(), f"/api/tournaments/{self.tournament.slug}/pools")
+        self.assertEqual(queries["default"], 0)
+        self.assertGreater(queries["replica"], 0)
+
+    def test_authenticated_reads_go_to_the_default(self) -> None:
+        """Test that a GET with authentication only reads from the default database."""
+        queries = self.count_queries(self.staff_client, "/api/user/me")
+        self.assertGreater(queries["default"], 0)
+        self.assertEqual(queries["replica"], 0)
+
+    def test_writers_are_pinned_to_the_default(self) -> None:
+        """Test that a client that wrote reads from the default database for a while."""
+        match = Match.objects.filter(tournament=self.tournament, pool__isnull=False).first()
+        if match is None:
+            self.fail("The tournament has pool matches")
+
+        response = self.staff_client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": 15, "score_team_2": 9},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.cookies[PIN_COOKIE]["max-age"], 15)
+
+        queries = self.count_queries(self.staff_client, f"/api/matches/{match.id}")
+        self.assertGreater(queries["default"], 0)
+        self.assertEqual(queries["replica"], 0)
+
+
+class SQLiteReplicaTestCase(SimpleTestCase):
+    """Test that the SQLite replica is replaced by fresh copies of the database."""
+
+    def assert_replica_values(self, replica_path: Path, values: list[int]) -> None:
+        """Assert that the read-only replica has the values, and no journal of its own."""
+        replica = sqlite3.connect(f"file:{replica_path}?mode=ro", uri=True)
+        try:
+            rows = replica.execute("SELECT value FROM score ORDER BY rowid").fetchall()
+            self.assertEqual([value for (value,) in rows], values)
+            self.assertEqual(replica.execute("PRAGMA journal_mode").fetchone()[0], "delete")
+            with self.assertRaises(sqlite3.OperationalError):
+                replica.execute("INSERT INTO score VALUES (0)")
+        finally:
+            replica.close()
+
+    def test_refresh_copies_the_database(self) -> None:
+        """Test that a refresh copies the latest commits, and replaces the previous copy."""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        primary_path = Path(directory.name) / "primary.sqlite"
+        replica_path = Path(directory.name) / "replica.sqlite"
+
+        primary = sqlite3.connect(primary_path)
+        self.addCleanup(primary.close)
+        primary.execute("PRAGMA journal_mode=WAL")
+        primary.execute("CREATE TABLE score (value INTEGER)")
+        primary.execute("INSERT INTO score VALUES (15)")
+        primary.commit()
+        refresh_sqlite_replica(primary_path, replica_path)
+        self.assert_replica_values(replica_path, [15])
+
+        primary.execute("INSERT INTO score VALUES (13)")
+        primary.commit()
+        refresh_sqlite_replica(primary_path, replica_path)
+        self.assert_replica_values(replica_path, [15, 13])
+
+        self.assertEqual(
+            sorted(path.name for path in Path(directory.name).iterdir()),
+            ["primary.sqlite", "primary.sqlite-shm", "primary.sqlite-wal", "replica.sqlite"],
+        )
@@ -0,0 +1,161 @@
+"""
+Renderers of the API's responses, and a benchmark of them.
+
+The benchmark renders the largest responses of a seeded tournament with the standard
+library's JSON renderer, orjson and MessagePack, and compares their time and size. The
+comparison is printed as a report after the run, and also written to the file named by
+the RENDERER_BENCHMARK_REPORT environment variable when it is set. It only runs with
+RUN_BENCHMARKS=1.
+"""
+import datetime
+import json
+import time
+import uuid
+from decimal import Decimal
+from typing import Any
+
+import msgpack
+import orjson
+from django.core.cache import cache
+from django.http import HttpRequest
+from django.test import Client, override_settings
+from django.utils import timezone
+from ninja.renderers import BaseRenderer, JSONRenderer
+
+from osu.match.models import Match
+from osu.player.models import Player
+from osu.renderers import MessagePackRenderer, ORJSONRenderer
+from osu.tournament.models import Registration
+
+from .base import BaseTournamentTestCase, ReportMixin, User, benchmark
+
+PLAYERS_PER_TEAM = 10
+BENCHMARK_ROUNDS = 20
+
+
+class RenderersTestCase(ReportMixin, BaseTournamentTestCase):
+    """Test that responses render the same with orjson and MessagePack as with json."""
+
+    report_title = "Renderer benchmark"
+    report_header = f"{'Response':<40} {'Renderer':<20} {'ms':>8} {'bytes':>9}"
+    report_variable = "RENDERER_BENCHMARK_REPORT"
+
+    def setUp(self) -> None:
+        """Seed a started tournament with registered players."""
+        super().setUp()
+        self.teams = self.create_teams(16)
+        self.tournament = self.create_staged_tournament("Tournament", self.teams)
+        for team in self.teams:
+            for i in range(1, PLAYERS_PER_TEAM + 1):
+                player = Player.objects.create(
+                    user=User.objects.create_user(
+                        username=f"{team.slug}-{i}@example.com",
+                        first_name=f"{team.name} Player",
+                        last_name=str(i),
+                    ),
+                    gender="M",
+                    date_of_birth=timezone.now().date(),
+                    match_up="M",
+                    preffered_role="C",
+                )
+                team.players.add(player)
+                Registration.objects.create(tournament=self.tournament, team=team, player=player)
+        self.start_staged_tournament(self.tournament)
+        self.client = Client()
+
+    def test_values_render_like_json(self) -> None:
+        """Test that dates, decimals and ids are rendered as with Django's JSON encoder."""
+        data = {
+            "datetime": datetime.datetime(2024, 5, 1, 9, 30, 15, 123456, tzinfo=datetime.UTC),
+            "date": datetime.date(2024, 5, 1),
+            "time": datetime.time(9, 30),
+            "decimal": Decimal("1.50"),
+            "uuid": uuid.UUID(int=1),
+            "nested": [{"value": None}, 1.5, True],
+        }
+        request = HttpRequest()
+        expected = json.loads(JSONRenderer().render(request, data, response_status=200))
+
+        self.assertEqual(
+            orjson.loads(ORJSONRenderer().render(request, data, response_status=200)), expected
+        )
+        self.assertEqual(
+            msgpack.unpackb(MessagePackRenderer().render(request, data, response_status=200)),
+            expected,
+        )
+
+    def test_msgpack_is_negotiated(self) -> None:
+        """Test that clients that accept MessagePack get it, and others get JSON."""
+        path = f"/api/tournaments/{self.tournament.slug}/snapshot"
+        response = self.client.get(path)
+        self.assertEqual(response["Content-Type"], "application/json; charset=utf-8")
+        self.assertIn("Accept", response["Vary"])
+
+        for accept in ["application/msgpack", "application/msgpack, application/json;q=0.5"]:
+            with self.subTest(accept=accept):
+                msgpack_response = self.client.get(path, HTTP_ACCEPT=accept)
+                self.assertEqual(msgpack_response["Content-Type"], "application/msgpack")
+                self.assertEqual(msgpack.unpackb(msgpack_response.content), response.json())
+
+        for accept in ["*/*", "text/html", "application/json, application/msgpack;q=0.5"]:
+            with self.subTest(accept=accept):
+                json_response = self.client.get(path, HTTP_ACCEPT=accept)
+                self.assertEqual(json_response["Content-Type"], "application/json; charset=utf-8")
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_cached_pages_are_kept_per_media_type(self) -> None:
+        """Test that a page cached in one media type is not served to clients of another."""
+        cache.clear()
+        path = f"/api/tournaments/{self.tournament.slug}/pools"
+        for _ in range(2):
+            json_response = self.client.get(path)
+            msgpack_response = self.client.get(path, HTTP_ACCEPT="application/msgpack")
+
+            self.assertEqual(json_response["Content-Type"], "application/json; charset=utf-8")
+            self.assertEqual(msgpack_response["Content-Type"], "application/msgpack")
+            self.assertIn("Accept", msgpack_response["Vary"])
+            self.assertEqual(msgpack.unpackb(msgpack_response.content), json_response.json())
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        """Compare the renderers on the largest responses, which must decode the same."""
+        renderers: list[tuple[str, BaseRenderer]] = [
+            ("json", JSONRenderer()),
+            ("orjson", ORJSONRenderer()),
+            ("msgpack", MessagePackRenderer()),
+        ]
+        responses: list[tuple[str, dict[str, Any]]] = [
+            (
+                "/api/matches",
+                {"tournament_id": self.tournament.id, "status": Match.StatusTypes.SCHEDULED},
+            ),
+            (f"/api/tournaments/{self.tournament.slug}/snapshot", {}),
+            ("/api/players", {"limit": 100}),
+            ("/api/teams", {}),
+        ]
+        for path, params in responses:
+            with self.subTest(path=path):
+                # Rendered again from the decoded response, as views give renderers plain data
+                data = self.client.get(path, params).json()
+                for name, renderer in renderers:
+                    content, seconds = self.render(renderer, data)
+                    self.report_lines.append(
+                        f"{path:<40} {name:<20} {seconds * 1000:>8.2f} {len(content):>9}"
+                    )
+
+                    decoded: Any = (
+                        msgpack.unpackb(content)
+                        if isinstance(renderer, MessagePackRenderer)
+                        else json.loads(content)
+                    )
+                    self.assertEqual(decoded, data)
+
+    def render(self, renderer: BaseRenderer, data: Any) -> tuple[bytes, float]:
+        """Content of the data rendered by the renderer, and the mean time to render it."""
+        start = time.perf_counter()
+        for _ in range(BENCHMARK_ROUNDS):
+            content = renderer.render(HttpRequest(), data, response_status=200)
+        seconds = (time.perf_counter() - start) / BENCHMARK_ROUNDS
+        return content if isinstance(content, bytes) else content.encode(), seconds
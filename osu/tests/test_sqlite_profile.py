@@ -0,0 +1,138 @@
+"""
+The production SQLite profile, and a benchmark of it.
+
+The benchmark runs a mix of anonymous reads and staff score submissions from several
+threads, each with its own connection, first with the default SQLite settings and then with
+the production profile, whose new connections run the pragmas. The throughput of both is
+printed as a report after the run, and also written to the file named by the
+SQLITE_BENCHMARK_REPORT environment variable when it is set. It only runs with
+RUN_BENCHMARKS=1.
+"""
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from django.db import connection, connections
+from django.test import Client, TransactionTestCase
+
+from backend import sqlite
+from osu.match.models import Match
+
+from .base import ReportMixin, TournamentTestMixin, User, benchmark
+
+TEST_PASSWORD = "test_password_only"
+THREADS = 8
+OPERATIONS_PER_THREAD = 40
+# One in this many operations is a score submission, the others are page reads
+WRITE_EVERY = 5
+# Like the web processes of production, which do not keep their connections
+CONN_MAX_AGE = 0
+
+
+class SQLiteProfileTestCase(ReportMixin, TournamentTestMixin, TransactionTestCase):
+    """Test that connections of the production profile are tuned, and benchmark them."""
+
+    report_title = "SQLite benchmark"
+    report_header = f"{'Profile':<12} {'reads':>6} {'writes':>7} {'seconds':>8} {'ops/s':>8}"
+    report_variable = "SQLITE_BENCHMARK_REPORT"
+
+    def setUp(self) -> None:
+        """Set up a started tournament, and a logged in staff client for each thread."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        pool_matches = Match.objects.filter(tournament=self.tournament, pool__isnull=False)
+        self.match_ids = list(pool_matches.values_list("id", flat=True))
+        self.pool_id = pool_matches.values_list("pool_id", flat=True)[0]
+
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.staff_clients = []
+        for _ in range(THREADS):
+            client = Client()
+            client.login(username="staff@example.com", password=TEST_PASSWORD)
+            self.staff_clients.append(client)
+
+    def tearDown(self) -> None:
+        # The journal mode is kept in the database file, which later tests share
+        with connection.cursor() as cursor:
+            cursor.execute("PRAGMA journal_mode=DELETE")
+        super().tearDown()
+
+    def use_production_profile(self) -> "mock._patch_dict":
+        """Patch the settings of the connections opened from now on to the production profile."""
+        settings_dict = connections.settings["default"]
+        return mock.patch.dict(
+            settings_dict, sqlite.get_database(settings_dict["NAME"], CONN_MAX_AGE)
+        )
+
+    def run_operations(self, thread: int) -> tuple[int, int]:
+        """Run the operations of a thread on its own connection, and count them."""
+        client = self.staff_clients[thread]
+        paths = [
+            f"/api/tournaments/{self.tournament.slug}/pools",
+            f"/api/matches?tournament_id={self.tournament.id}&pool_id={self.pool_id}",
+        ]
+        reads = writes = 0
+        try:
+            for i in range(OPERATIONS_PER_THREAD):
+                if i % WRITE_EVERY == thread % WRITE_EVERY:
+                    match_id = random.choice(self.match_ids)  # noqa: S311
+                    response = client.post(
+                        f"/api/matches/{match_id}/staff-submit-score",
+                        {"score_team_1": 15, "score_team_2": random.randint(5, 13)},  # noqa: S311
+                        content_type="application/json",
+                    )
+                    writes += 1
+                else:
+                    response = client.get(paths[i % len(paths)])
+                    reads += 1
+                self.assertEqual(response.status_code, 200, response.content)
+        finally:
+            connection.close()
+        return reads, writes
+
+    def run_benchmark(self, profile: str) -> None:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=THREADS) as executor:
+            counts = list(executor.map(self.run_operations, range(THREADS)))
+        seconds = time.perf_counter() - start
+        reads = sum(thread_reads for thread_reads, _ in counts)
+        writes = sum(thread_writes for _, thread_writes in counts)
+        self.report_lines.append(
+            f"{profile:<12} {reads:>6} {writes:>7} {seconds:>8.2f} "
+            f"{(reads + writes) / seconds:>8.1f}"
+        )
+
+    def test_connections_use_the_pragmas(self) -> None:
+        """Test that every new connection of the profile runs the pragmas."""
+        connection.close()
+        with self.use_production_profile():
+            with connection.cursor() as cursor:
+                values = {}
+                for name in sqlite.PRODUCTION_PRAGMAS:
+                    cursor.execute(f"PRAGMA {name}")
+                    values[name] = cursor.fetchone()[0]
+            connection.close()
+
+        self.assertEqual(
+            values,
+            {
+                "journal_mode": "wal",
+                # NORMAL
+                "synchronous": 1,
+                "busy_timeout": 5000,
+                "cache_size": -20000,
+                "mmap_size": 128 * 1024 * 1024,
+            },
+        )
+
+    @benchmark
+    def test_benchmark(self) -> None:
+        """Compare the throughput of mixed reads and writes without and with the profile."""
+        connection.close()
+        self.run_benchmark("default")
+        with self.use_production_profile():
+            self.run_benchmark("production")
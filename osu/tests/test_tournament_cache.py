@@ -0,0 +1,153 @@
+from django.core.cache import cache
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from osu.match.models import Match
+from osu.tournament.models import Pool, Tournament
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+@override_settings(CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+class TournamentCacheTestCase(BaseTournamentTestCase):
+    """Test the read-through cache of public tournament pages."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament and a staff client."""
+        super().setUp()
+        cache.clear()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.pool = Pool.objects.get(tournament=self.tournament, name="A")
+
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.client = Client()
+        self.staff_client = Client()
+        self.staff_client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def test_cached_pages_cost_the_version_lookup(self) -> None:
+        """Test that a cached page only costs its version lookup, and matches the view."""
+        for path, params, num_queries in [
+            (f"/api/tournaments/{self.tournament.slug}", {}, 1),
+            # The tournament is looked up by slug before its id
+            (f"/api/tournaments/{self.tournament.id}", {}, 2),
+            (f"/api/tournaments/{self.tournament.slug}/pools", {}, 1),
+            (f"/api/tournaments/{self.tournament.slug}/brackets", {}, 1),
+            ("/api/matches", {"tournament_id": self.tournament.id, "pool_id": self.pool.id}, 1),
+        ]:
+            with self.subTest(path=path):
+                response = self.client.get(path, params)
+                self.assertEqual(response.status_code, 200)
+
+                with self.assertNumQueries(num_queries):
+                    cached_response = self.client.get(path, params)
+
+                self.assertEqual(cached_response.status_code, 200)
+                self.assertEqual(cached_response.content, response.content)
+                self.assertEqual(cached_response["Content-Type"], response["Content-Type"])
+
+    def test_score_submission_invalidates_cached_pages(self) -> None:
+        """Test that a submitted score is shown on the next request of a cached page."""
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        params = {"tournament_id": self.tournament.id, "pool_id": self.pool.id}
+
+        scores = {
+            m["id"]: m["score_team_1"] for m in self.client.get("/api/matches", params).json()
+        }
+        self.assertEqual(scores[match.id], 0)
+        pools = self.client.get(f"/api/tournaments/{self.tournament.slug}/pools").json()
+
+        response = self.staff_client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": 15, "score_team_2": 9},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        scores = {
+            m["id"]: m["score_team_1"] for m in self.client.get("/api/matches", params).json()
+        }
+        self.assertEqual(scores[match.id], 15)
+        self.assertNotEqual(
+            self.client.get(f"/api/tournaments/{self.tournament.slug}/pools").json(), pools
+        )
+
+    def test_uncached_requests(self) -> None:
+        """Test that only successful reads of an existing tournament are cached."""
+        for _ in range(2):
+            # Version lookups by slug and id, then the view's own lookups
+            with self.assertNumQueries(4):
+                response = self.client.get("/api/tournaments/999999")
+            self.assertEqual(response.status_code, 404)
+
+        # Matches of every tournament are not cached
+        params = {"status": Match.StatusTypes.COMPLETED}
+        with CaptureQueriesContext(connection) as queries:
+            self.client.get("/api/matches", params)
+        with self.assertNumQueries(len(queries)):
+            self.client.get("/api/matches", params)
+
+    def test_stale_save_keeps_the_version(self) -> None:
+        """Test that saving an instance loaded before a version bump does not undo the bump."""
+        stale_tournament = Tournament.objects.get(id=self.tournament.id)
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        response = self.staff_client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": 15, "score_team_2": 9},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        version = Tournament.objects.get(id=self.tournament.id).version
+        self.assertGreater(version, stale_tournament.version)
+
+        stale_tournament.name = "Renamed"
+        stale_tournament.save()
+
+        self.assertEqual(Tournament.objects.get(id=self.tournament.id).version, version)
+
+    def test_unchanged_pages_are_not_modified(self) -> None:
+        """Test that a poll with the ETag of an unchanged page gets an empty 304."""
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        team = self.tournament.teams.order_by("id")[0]
+        paths = [
+            f"/api/tournaments/{self.tournament.slug}",
+            f"/api/matches/{match.id}",
+            f"/api/matches?tournament_id={self.tournament.id}&pool_id={self.pool.id}",
+            f"/api/matches/tournament/{self.tournament.slug}/team/{team.slug}",
+        ]
+        etags = {}
+        for path in paths:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                etags[path] = response["ETag"]
+
+                with self.assertNumQueries(1):
+                    response = self.client.get(path, headers={"If-None-Match": etags[path]})
+                self.assertEqual(response.status_code, 304)
+                self.assertEqual(response.content, b"")
+
+        self.staff_client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": 15, "score_team_2": 9},
+            content_type="application/json",
+        )
+        for path in paths:
+            with self.subTest(path=path):
+                response = self.client.get(path, headers={"If-None-Match": etags[path]})
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response["ETag"], etags[path])
+
+    def test_uncached_pages_are_not_modified(self) -> None:
+        """Test that pages outside the cache are also answered with a 304 when unchanged."""
+        path = f"/api/matches?pool_id={self.pool.id}"
+        response = self.client.get(path)
+        self.assertEqual(response.status_code, 200)
+
+        response = self.client.get(path, headers={"If-None-Match": response["ETag"]})
+        self.assertEqual(response.status_code, 304)
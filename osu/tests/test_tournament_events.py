@@ -0,0 +1,145 @@
+import asyncio
+import json
+from collections.abc import AsyncIterator
+from contextlib import suppress
+from typing import Any, cast
+
+from asgiref.sync import sync_to_async
+from django.http import StreamingHttpResponse
+from django.test import override_settings
+
+from osu.events import broadcaster, prune_tournament_events
+from osu.match.models import Match
+from osu.tournament.jobs import queue_match_result, run_queued_jobs
+from osu.tournament.models import Pool, TournamentStreamEvent
+from osu.tournament.utils import (
+    bump_tournament_version,
+    propagate_fixtures,
+    update_match_score_and_results,
+)
+
+from .base import BaseTournamentTestCase
+
+
+@override_settings(TOURNAMENT_EVENTS_HEARTBEAT_SECONDS=5, TOURNAMENT_EVENTS_POLL_SECONDS=0.01)
+class TournamentEventsTestCase(BaseTournamentTestCase):
+    """Test the Server-Sent Events stream of a tournament."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.tournament.refresh_from_db()
+
+    async def open_stream(self) -> AsyncIterator[bytes]:
+        """Open the event stream of the tournament."""
+        response = await self.async_client.get(f"/api/tournaments/{self.tournament.slug}/events")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "text/event-stream")
+        return cast(StreamingHttpResponse, response).streaming_content  # type: ignore[return-value]
+
+    async def read_event(self, stream: AsyncIterator[bytes]) -> tuple[str, dict[str, Any]]:
+        """Next event of a stream, skipping heartbeats."""
+        while True:
+            message = (await anext(stream)).decode()
+            if not message.startswith(":"):
+                break
+
+        event_line, data_line = message.strip().split("\n")
+        return event_line.removeprefix("event: "), json.loads(data_line.removeprefix("data: "))
+
+    async def disconnect(self, stream: AsyncIterator[bytes]) -> None:
+        """Cancel the read of a stream, like the server does when its client disconnects."""
+        reading = asyncio.ensure_future(anext(stream))
+        await asyncio.sleep(0.01)
+        reading.cancel()
+        with suppress(asyncio.CancelledError):
+            await reading
+
+    def get_match(self) -> Match:
+        pool = Pool.objects.get(tournament=self.tournament, name="A")
+        return Match.objects.filter(pool=pool).order_by("id")[0]
+
+    def play_match(self) -> Match:
+        """Play the first pool match."""
+        match = self.get_match()
+        update_match_score_and_results(match, 15, 12)
+        propagate_fixtures(match)
+        return match
+
+    async def read_until_version(self, stream: AsyncIterator[bytes]) -> list[str]:
+        """Names of the next events of a stream, up to the version event that follows them."""
+        names = []
+        while True:
+            event, _ = await self.read_event(stream)
+            names.append(event)
+            if event == "version":
+                return names
+
+    def score_event(self, match: Match) -> tuple[str, dict[str, Any]]:
+        return (
+            "score",
+            {
+                "match_id": match.id,
+                "score_team_1": 15,
+                "score_team_2": 12,
+                "status": Match.StatusTypes.COMPLETED,
+            },
+        )
+
+    async def test_stream_sends_score_events_of_committed_changes(self) -> None:
+        """Test that a stream gets the version, then the score of a played match."""
+        stream = await self.open_stream()
+        self.assertEqual(
+            await self.read_event(stream), ("version", {"version": self.tournament.version})
+        )
+
+        match = await sync_to_async(self.play_match)()
+        self.assertEqual(await self.read_event(stream), self.score_event(match))
+        self.assertEqual((await self.read_until_version(stream))[-1], "version")
+        await self.disconnect(stream)
+
+        self.assertNotIn(self.tournament.id, broadcaster.subscriptions)
+        self.assertNotIn(self.tournament.id, broadcaster.pollers)
+
+    @override_settings(TOURNAMENT_JOBS_EAGER=False)
+    async def test_stream_sends_events_of_the_jobs_worker(self) -> None:
+        """Test that a score applied by the worker, not by the submission, reaches a stream."""
+        stream = await self.open_stream()
+        await self.read_event(stream)
+
+        match = await sync_to_async(self.get_match)()
+        await sync_to_async(queue_match_result)(match, 15, 12)
+        self.assertEqual(await sync_to_async(run_queued_jobs)(), 1)
+        self.assertEqual(await self.read_event(stream), self.score_event(match))
+        await self.read_until_version(stream)
+        await self.disconnect(stream)
+
+    async def test_stream_sends_versions_of_changes_by_other_processes(self) -> None:
+        """Test that a change that was not published here is found from the version."""
+        stream = await self.open_stream()
+        await self.read_event(stream)
+
+        await sync_to_async(bump_tournament_version)(self.tournament.id)
+        self.assertEqual(
+            await self.read_event(stream), ("version", {"version": self.tournament.version + 1})
+        )
+        await self.disconnect(stream)
+
+    async def test_stream_of_missing_tournament(self) -> None:
+        """Test that there is no stream of a tournament that does not exist."""
+        response = await self.async_client.get("/api/tournaments/missing/events")
+        self.assertEqual(response.status_code, 404)
+
+    def test_old_events_are_pruned(self) -> None:
+        """Test that events older than the retention are deleted, and newer ones kept."""
+        self.play_match()
+        events = TournamentStreamEvent.objects.filter(tournament=self.tournament)
+        num_events = events.count()
+        self.assertGreater(num_events, 0)
+        self.assertEqual(prune_tournament_events(), 0)
+
+        with override_settings(TOURNAMENT_EVENTS_RETENTION_SECONDS=-1):
+            self.assertEqual(prune_tournament_events(), num_events)
+        self.assertFalse(events.exists())
@@ -0,0 +1,211 @@
+from io import StringIO
+from unittest import mock
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import Client, override_settings
+from django.test.utils import CaptureQueriesContext
+
+from osu.match.models import Match, TournamentJob
+from osu.tournament.jobs import claim_next_job, queue_spirit_rankings, run_queued_jobs
+from osu.tournament.models import Pool
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+
+
+@override_settings(TOURNAMENT_JOBS_EAGER=False)
+class TournamentJobsTestCase(BaseTournamentTestCase):
+    """Test the queue of the recomputations that follow score submissions."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament and a staff client."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.matches = list(
+            Match.objects.filter(
+                pool=Pool.objects.get(tournament=self.tournament, name="A")
+            ).order_by("id")
+        )
+
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.client = Client()
+        self.client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def submit_score(self, match: Match, score_team_1: int, score_team_2: int) -> None:
+        response = self.client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": score_team_1, "score_team_2": score_team_2},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+    def test_submitted_score_is_applied_by_the_worker(self) -> None:
+        """Test that a score is applied once its job runs, and that the job shows it."""
+        match = self.matches[0]
+        self.submit_score(match, 15, 9)
+
+        match.refresh_from_db()
+        self.assertEqual(match.status, Match.StatusTypes.SCHEDULED)
+        jobs = self.client.get(f"/api/matches/{match.id}/jobs").json()
+        self.assertEqual(
+            [(job["type"], job["status"]) for job in jobs],
+            [(TournamentJob.JobType.MATCH_RESULT, TournamentJob.StatusTypes.QUEUED)],
+        )
+
+        self.assertEqual(run_queued_jobs(), 1)
+
+        match.refresh_from_db()
+        self.assertEqual(
+            (match.status, match.score_team_1, match.score_team_2),
+            (Match.StatusTypes.COMPLETED, 15, 9),
+        )
+        job = self.client.get(f"/api/matches/{match.id}/jobs").json()[0]
+        self.assertEqual(job["status"], TournamentJob.StatusTypes.COMPLETED)
+        self.assertIsNotNone(job["finished_at"])
+        self.assertEqual(job["attempts"], 0)
+
+    def test_duplicate_jobs_are_coalesced(self) -> None:
+        """Test that a queued job takes in the same jobs queued after it."""
+        match = self.matches[0]
+        self.submit_score(match, 15, 9)
+        self.submit_score(match, 13, 15)
+        self.assertEqual(
+            queue_spirit_rankings(self.tournament.id).id,
+            queue_spirit_rankings(self.tournament.id).id,
+        )
+        self.assertEqual(TournamentJob.objects.filter(tournament=self.tournament).count(), 2)
+
+        self.assertEqual(run_queued_jobs(), 2)
+        match.refresh_from_db()
+        self.assertEqual((match.score_team_1, match.score_team_2), (13, 15))
+
+        # Jobs that have run are not taken in by new ones
+        self.submit_score(match, 15, 13)
+        self.assertEqual(TournamentJob.objects.filter(match=match).count(), 2)
+
+    def test_jobs_of_a_tournament_run_one_at_a_time(self) -> None:
+        """Test that the jobs of a tournament are claimed in order, after the running one."""
+        other_tournament = self.create_staged_tournament("Other", self.create_teams(8))
+        self.submit_score(self.matches[0], 15, 9)
+        self.submit_score(self.matches[1], 15, 11)
+        other_job = queue_spirit_rankings(other_tournament.id)
+
+        first_job = claim_next_job()
+        self.assertEqual(first_job and first_job.match_id, self.matches[0].id)
+        # The second job of the tournament waits for the first, but other tournaments don't
+        self.assertEqual(claim_next_job(), other_job)
+        self.assertIsNone(claim_next_job())
+
+    def test_failed_job_is_recorded(self) -> None:
+        """Test that a job that fails every run is marked as failed, and later jobs still run."""
+        TournamentJob.objects.create(
+            tournament=self.tournament,
+            match=self.matches[0],
+            type=TournamentJob.JobType.MATCH_RESULT,
+            payload={},
+        )
+        self.submit_score(self.matches[1], 15, 11)
+
+        # Three runs of the failing job, before the next one
+        self.assertEqual(run_queued_jobs(), 4)
+        statuses = TournamentJob.objects.order_by("id").values_list("status", "error", "attempts")
+        self.assertEqual(
+            list(statuses),
+            [
+                (TournamentJob.StatusTypes.FAILED, "'score_team_1'", 3),
+                (TournamentJob.StatusTypes.COMPLETED, "", 0),
+            ],
+        )
+
+        # The error is shown to staff only
+        path = f"/api/matches/{self.matches[0].id}/jobs"
+        self.assertEqual(self.client.get(path).json()[0]["error"], "'score_team_1'")
+        self.assertIsNone(Client().get(path).json()[0]["error"])
+
+    def test_failed_job_is_retried(self) -> None:
+        """Test that a job that fails once runs again before the jobs behind it."""
+        match = self.matches[0]
+        self.submit_score(match, 15, 9)
+        self.submit_score(self.matches[1], 15, 11)
+
+        with mock.patch(
+            "osu.tournament.jobs.propagate_fixtures",
+            side_effect=[RuntimeError("Lost connection"), [], []],
+        ):
+            self.assertEqual(run_queued_jobs(), 3)
+
+        jobs = TournamentJob.objects.order_by("id").values_list("status", "error", "attempts")
+        self.assertEqual(
+            list(jobs),
+            [
+                (TournamentJob.StatusTypes.COMPLETED, "Lost connection", 1),
+                (TournamentJob.StatusTypes.COMPLETED, "", 0),
+            ],
+        )
+        match.refresh_from_db()
+        self.assertEqual((match.status, match.score_team_1), (Match.StatusTypes.COMPLETED, 15))
+
+    def test_failed_match_result_falls_back_to_a_full_rescan(self) -> None:
+        """Test that a match result whose propagation always fails is applied by a rescan."""
+        pool_matches = Match.objects.filter(tournament=self.tournament, pool__isnull=False)
+        last_match = pool_matches.order_by("id").last()
+        if last_match is None:
+            self.fail("The tournament has pool matches")
+        for match in pool_matches.exclude(id=last_match.id):
+            self.submit_score(match, 15, 9)
+        run_queued_jobs()
+
+        self.submit_score(last_match, 15, 9)
+        with mock.patch(
+            "osu.tournament.jobs.propagate_fixtures", side_effect=RuntimeError("Bad seeding")
+        ):
+            self.assertEqual(run_queued_jobs(), 3)
+
+        job = TournamentJob.objects.get(match=last_match)
+        self.assertEqual(
+            (job.status, job.error, job.attempts),
+            (
+                TournamentJob.StatusTypes.COMPLETED,
+                "Applied with a full rescan, after: Bad seeding",
+                3,
+            ),
+        )
+        # The rescan scheduled the matches that the pools feed
+        self.assertFalse(
+            Match.objects.filter(
+                tournament=self.tournament, cross_pool__isnull=False, sequence_number=1
+            )
+            .filter(team_1__isnull=True)
+            .exists()
+        )
+
+    def test_worker_requeues_interrupted_jobs(self) -> None:
+        """Test that the worker runs the jobs left running by a worker that stopped."""
+        self.submit_score(self.matches[0], 15, 9)
+        self.assertIsNotNone(claim_next_job())
+
+        out = StringIO()
+        call_command("run_tournament_jobs", "--once", stdout=out)
+        self.assertIn("Requeued 1 interrupted jobs", out.getvalue())
+        self.assertIn("Ran 1 jobs", out.getvalue())
+        self.assertEqual(
+            Match.objects.get(id=self.matches[0].id).status, Match.StatusTypes.COMPLETED
+        )
+
+    def test_submission_cost_does_not_grow_with_the_tournament(self) -> None:
+        """Test that a submission costs the same queries in a larger tournament."""
+        large_tournament = self.create_staged_tournament("Large", self.create_teams(16))
+        self.start_staged_tournament(large_tournament)
+
+        num_queries = []
+        for tournament in [self.tournament, large_tournament]:
+            match = Match.objects.filter(tournament=tournament, pool__isnull=False).earliest("id")
+            with CaptureQueriesContext(connection) as context:
+                self.submit_score(match, 15, 9)
+            num_queries.append(len(context.captured_queries))
+        self.assertEqual(num_queries[0], num_queries[1])
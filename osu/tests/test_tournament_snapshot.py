@@ -0,0 +1,87 @@
+from django.core.cache import cache
+from django.test import Client, override_settings
+
+from osu.match.models import Match
+from osu.tournament.models import Pool, Tournament, TournamentField
+from osu.tournament.utils import update_match_score_and_results
+
+from .base import BaseTournamentTestCase
+
+
+class TournamentSnapshotTestCase(BaseTournamentTestCase):
+    """Test the snapshot of everything a tournament page shows."""
+
+    def setUp(self) -> None:
+        """Set up a started tournament with a field."""
+        super().setUp()
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        self.pool = Pool.objects.get(tournament=self.tournament, name="A")
+        self.path = f"/api/tournaments/{self.tournament.slug}/snapshot"
+        self.client = Client()
+
+    def add_field(self, name: str) -> None:
+        """Field of the tournament, assigned to a match without one."""
+        match = Match.objects.filter(tournament=self.tournament, field__isnull=True).order_by("id")[
+            0
+        ]
+        match.field = TournamentField.objects.create(name=name, tournament=self.tournament)
+        match.save()
+
+    def test_snapshot_refers_to_teams_by_id(self) -> None:
+        """Test that every team is sent once, and the matches and stages refer to them."""
+        self.add_field("Field 1")
+        data = self.client.get(self.path).json()
+
+        tournament = Tournament.objects.get(id=self.tournament.id)
+        self.assertEqual(data["version"], tournament.version)
+        self.assertEqual(data["tournament"]["slug"], tournament.slug)
+        team_ids = [team["id"] for team in data["teams"]]
+        self.assertEqual(sorted(team_ids), sorted(tournament.teams.values_list("id", flat=True)))
+        self.assertEqual(len(team_ids), len(set(team_ids)))
+
+        self.assertEqual(len(data["matches"]), Match.objects.filter(tournament=tournament).count())
+        pool_ids = {pool["id"] for pool in data["pools"]}
+        field_ids = {field["id"] for field in data["fields"]}
+        for match in data["matches"]:
+            self.assertLessEqual({match["team_1_id"], match["team_2_id"]} - {None}, set(team_ids))
+            self.assertIn(match["pool_id"], pool_ids | {None})
+            self.assertIn(match["field_id"], field_ids | {None})
+            self.assertNotIn("team_1", match)
+
+    def test_snapshot_costs_fixed_queries(self) -> None:
+        """Test that more fields and matches cost the same queries."""
+        # The version lookup, the tournament, and a query for each part of the snapshot
+        with self.assertNumQueries(9):
+            self.client.get(self.path)
+
+        for i in range(3):
+            self.add_field(f"Field {i}")
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        update_match_score_and_results(match, 15, 11)
+
+        with self.assertNumQueries(9):
+            response = self.client.get(self.path)
+        self.assertEqual(len(response.json()["fields"]), 3)
+
+    @override_settings(
+        CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}}
+    )
+    def test_snapshot_is_cached_per_version(self) -> None:
+        """Test that the snapshot is cached as a whole until the tournament changes."""
+        cache.clear()
+        data = self.client.get(self.path).json()
+        with self.assertNumQueries(1):
+            self.assertEqual(self.client.get(self.path).json(), data)
+
+        match = Match.objects.filter(pool=self.pool).order_by("id")[0]
+        update_match_score_and_results(match, 15, 11)
+
+        new_data = self.client.get(self.path).json()
+        self.assertGreater(new_data["version"], data["version"])
+        scores = {m["id"]: m["score_team_1"] for m in new_data["matches"]}
+        self.assertEqual(scores[match.id], 15)
+
+    def test_snapshot_of_missing_tournament(self) -> None:
+        """Test that there is no snapshot of a tournament that does not exist."""
+        self.assertEqual(self.client.get("/api/tournaments/missing/snapshot").status_code, 404)
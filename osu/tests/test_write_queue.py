@@ -0,0 +1,214 @@
+import multiprocessing
+import tempfile
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+from django.test import Client, SimpleTestCase, override_settings
+
+from osu.match.models import Match
+from osu.writes import WriteQueue, WriteQueueTimeoutError, get_write_queue, serialized_writes
+
+from .base import BaseTournamentTestCase, User
+
+TEST_PASSWORD = "test_password_only"
+POLL_SECONDS = 0.001
+TIMEOUT_SECONDS = 10
+PROCESSES = 4
+TURNS_PER_PROCESS = 10
+
+
+def take_turns(queue_dir: str, log_path: str) -> None:
+    """Log the start and the end of each turn of this process."""
+    queue = WriteQueue(Path(queue_dir), POLL_SECONDS, TIMEOUT_SECONDS)
+    for _ in range(TURNS_PER_PROCESS):
+        with queue.turn():
+            with open(log_path, "a") as log:
+                log.write("start\n")
+            time.sleep(0.001)
+            with open(log_path, "a") as log:
+                log.write("end\n")
+
+
+class WriteQueueTestCase(SimpleTestCase):
+    """Test that writers take their turns one at a time, in the order they join the queue."""
+
+    def setUp(self) -> None:
+        self.queue_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.queue_dir.cleanup)
+        self.queue = WriteQueue(Path(self.queue_dir.name), POLL_SECONDS, TIMEOUT_SECONDS)
+
+    def test_turns_are_first_in_first_out(self) -> None:
+        """Test that waiting writers get their turns in the order they joined."""
+        order: list[int] = []
+
+        def write(i: int) -> None:
+            with self.queue.turn() as turn:
+                order.append(i)
+                self.assertEqual(turn.depth, i + 2)
+
+        threads = []
+        with self.queue.turn() as turn:
+            self.assertEqual(turn.depth, 1)
+            for i in range(5):
+                thread = threading.Thread(target=write, args=(i,))
+                thread.start()
+                threads.append(thread)
+                # Wait for the writer to join the queue before starting the next one
+                while len(self.queue.waiting()) < i + 2:
+                    time.sleep(POLL_SECONDS)
+            time.sleep(0.05)
+            self.assertEqual(order, [])
+
+        for thread in threads:
+            thread.join()
+        self.assertEqual(order, [0, 1, 2, 3, 4])
+        self.assertEqual(self.queue.waiting(), [])
+
+    def test_turns_do_not_overlap_across_processes(self) -> None:
+        """Test that the processes that share a queue never write at the same time."""
+        log_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(log_dir.cleanup)
+        log_path = Path(log_dir.name) / "log.txt"
+        context = multiprocessing.get_context("fork")
+        processes = [
+            context.Process(target=take_turns, args=(self.queue_dir.name, str(log_path)))
+            for _ in range(PROCESSES)
+        ]
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+            self.assertEqual(process.exitcode, 0)
+
+        self.assertEqual(
+            log_path.read_text().split(), ["start", "end"] * PROCESSES * TURNS_PER_PROCESS
+        )
+
+    def test_writers_of_exited_processes_are_skipped(self) -> None:
+        """Test that a writer left in the queue by a process that exited does not block it."""
+        exited = multiprocessing.get_context("fork").Process(target=self.queue.join)
+        exited.start()
+        exited.join()
+        self.assertEqual(len(self.queue.waiting()), 1)
+
+        with self.queue.turn() as turn:
+            self.assertEqual(turn.depth, 2)
+        self.assertEqual(self.queue.waiting(), [])
+
+    def test_writers_left_by_earlier_runs_are_skipped(self) -> None:
+        """Test that files of writers that no process holds, as after a restart, are removed."""
+        for ticket in range(3):
+            (Path(self.queue_dir.name) / f"{ticket:020d}").touch()
+        (Path(self.queue_dir.name) / "ticket").write_text("3")
+
+        with self.queue.turn() as turn:
+            self.assertEqual(turn.depth, 4)
+        self.assertEqual(self.queue.waiting(), [])
+
+    def test_waiting_writers_back_off(self) -> None:
+        """Test that a writer checks the writer ahead less and less often, up to the maximum."""
+        queue = WriteQueue(Path(self.queue_dir.name), POLL_SECONDS, 0.3, max_poll_seconds=0.02)
+        delays: list[float] = []
+        sleep = time.sleep
+
+        def record_sleep(seconds: float) -> None:
+            delays.append(seconds)
+            sleep(seconds)
+
+        entry = queue.join()
+        self.addCleanup(entry.leave)
+        with (
+            mock.patch("osu.writes.time.sleep", record_sleep),
+            self.assertRaises(WriteQueueTimeoutError),
+            queue.turn(),
+        ):
+            pass
+
+        self.assertEqual(delays[:5], [0.001, 0.002, 0.004, 0.008, 0.016])
+        self.assertEqual(set(delays[5:]), {0.02})
+
+    def test_writers_give_up_waiting(self) -> None:
+        """Test that a writer stops waiting for its turn after the timeout, and leaves."""
+        queue = WriteQueue(Path(self.queue_dir.name), POLL_SECONDS, 0.05)
+        with queue.turn():
+            thread_errors: list[Exception] = []
+
+            def write() -> None:
+                try:
+                    with queue.turn():
+                        pass
+                except WriteQueueTimeoutError as e:
+                    thread_errors.append(e)
+
+            thread = threading.Thread(target=write)
+            thread.start()
+            thread.join()
+            self.assertEqual(len(thread_errors), 1)
+            self.assertEqual(len(queue.waiting()), 1)
+
+
+class WriteQueueMiddlewareTestCase(BaseTournamentTestCase):
+    """Test that requests with unsafe methods are handled in turns of the write queue."""
+
+    def setUp(self) -> None:
+        super().setUp()
+        queue_dir = tempfile.TemporaryDirectory()
+        self.addCleanup(queue_dir.cleanup)
+        serialize_writes = override_settings(SERIALIZE_WRITES=True, WRITE_QUEUE_DIR=queue_dir.name)
+        serialize_writes.enable()
+        self.addCleanup(serialize_writes.disable)
+
+        self.tournament = self.create_staged_tournament("Tournament", self.create_teams(8))
+        self.start_staged_tournament(self.tournament)
+        User.objects.create_user(
+            username="staff@example.com", password=TEST_PASSWORD, is_staff=True
+        )
+        self.client = Client()
+        self.client.login(username="staff@example.com", password=TEST_PASSWORD)
+
+    def test_writes_report_their_turn(self) -> None:
+        """Test that a submission reports its wait, and runs its job within its turn."""
+        match = Match.objects.filter(tournament=self.tournament, pool__isnull=False).first()
+        if match is None:
+            self.fail("The tournament has pool matches")
+
+        response = self.client.post(
+            f"/api/matches/{match.id}/staff-submit-score",
+            {"score_team_1": 15, "score_team_2": 9},
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'^write-queue;dur=[\d.]+;desc="depth 1"$')
+        match.refresh_from_db()
+        self.assertEqual(match.status, Match.StatusTypes.COMPLETED)
+
+        response = self.client.get(f"/api/matches/{match.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("Server-Timing", response)
+
+    def test_writes_without_a_turn_are_refused(self) -> None:
+        """Test that a request that waits too long for its turn is answered with a 503."""
+        match = Match.objects.filter(tournament=self.tournament, pool__isnull=False).first()
+        if match is None:
+            self.fail("The tournament has pool matches")
+
+        # A writer of another thread is ahead in the queue
+        entry = get_write_queue().join()
+        self.addCleanup(entry.leave)
+        with override_settings(WRITE_QUEUE_TIMEOUT_SECONDS=0.05):
+            response = self.client.post(
+                f"/api/matches/{match.id}/staff-submit-score",
+                {"score_team_1": 15, "score_team_2": 9},
+                content_type="application/json",
+            )
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response["Retry-After"], "1")
+
+    def test_nested_writes_share_the_turn(self) -> None:
+        """Test that writes within a turn of the thread do not wait for it."""
+        with serialized_writes() as turn:
+            self.assertIsNotNone(turn)
+            with serialized_writes() as nested_turn:
+                self.assertIsNone(nested_turn)
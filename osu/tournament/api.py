@@ -1,12 +1,16 @@
 from typing import Any
 
 from django.db import transaction
-from django.http import HttpRequest
+from django.db.models import QuerySet
+from django.http import HttpRequest, StreamingHttpResponse
 from django.shortcuts import get_object_or_404
 from ninja import Router
+from ninja.decorators import decorate_view
 from ninja.pagination import PageNumberPagination, paginate
 
-from osu.match.models import Match
+from osu.cache import cache_tournament_response, tournament_from_path, tournament_from_query
+from osu.events import publish_tournament_event, stream_tournament_events
+from osu.match.models import Match, PlayerStats
 from osu.player.models import Player
 from osu.team.models import Team
 from osu.tournament.models import (
@@ -26,6 +30,8 @@ from osu.tournament.schema import (
     CrossPoolSchema,
     CrossPoolUpdateSchema,
     ErrorSchema,
+    LeaderboardStat,
+    PlayerStatsSchema,
     PoolCreateSchema,
     PoolSchema,
     PoolUpdateSchema,
@@ -40,10 +46,12 @@ from osu.tournament.schema import (
     TournamentDetailSchema,
     TournamentFieldSchema,
     TournamentSimpleSchema,
+    TournamentSnapshotSchema,
     TournamentUpdateSchema,
     UserAccessSchema,
 )
 from osu.tournament.utils import (
+    bump_tournament_version,
     create_bracket_matches,
     create_pool_matches,
     create_position_pool_matches,
@@ -72,7 +80,7 @@ def list_tournaments(
     status: str | None = None,
     type: str | None = None,
     search: str | None = None,
-) -> list[Tournament]:
+) -> QuerySet[Tournament]:
     """
     List all tournaments with optional filtering
     """
@@ -87,7 +95,7 @@ def list_tournaments(
     if search:
         qs = qs.filter(name__icontains=search)
 
-    return list(qs)
+    return qs
 
 
 @router.get(
@@ -96,6 +104,7 @@ def list_tournaments(
     tags=["tournaments"],
     auth=None,
 )
+@decorate_view(cache_tournament_response(tournament_from_path("slug", or_id=True)))
 def get_tournament(
     request: HttpRequest, slug: str
 ) -> tuple[int, Tournament] | tuple[int, dict[str, Any]]:
@@ -113,6 +122,89 @@ def get_tournament(
             return 404, {"success": False, "message": f"Tournament with id/slug {slug} not found"}
 
 
+@router.get(
+    "/{slug}/events",
+    response={200: None, 404: ErrorSchema},
+    tags=["tournaments"],
+    auth=None,
+)
+async def get_tournament_events(
+    request: HttpRequest, slug: str
+) -> StreamingHttpResponse | tuple[int, dict[str, Any]]:
+    """
+    Stream live updates of a tournament as Server-Sent Events: `score` and `status` of matches,
+    live `stats` of matches as stat-keepers sync them, `fixtures` when teams are assigned to
+    matches, `status` of the tournament, and its `version` whenever it changes. Needs the ASGI
+    server to keep the connection open.
+    """
+    tournament = await Tournament.objects.filter(slug=slug).values_list("id", "version").afirst()
+    if tournament is None:
+        return 404, {"success": False, "message": f"Tournament with slug {slug} not found"}
+
+    response = StreamingHttpResponse(
+        stream_tournament_events(*tournament), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    # Keep nginx from buffering the events
+    response["X-Accel-Buffering"] = "no"
+    return response
+
+
+@router.get(
+    "/{slug}/snapshot",
+    response={200: TournamentSnapshotSchema, 404: ErrorSchema},
+    tags=["tournaments"],
+    auth=None,
+)
+@decorate_view(cache_tournament_response(tournament_from_path("slug")))
+def get_tournament_snapshot(request: HttpRequest, slug: str) -> tuple[int, dict[str, Any]]:
+    """
+    Everything a tournament page shows, in one response: the tournament, its teams and fields,
+    its stages and its matches. Stages and matches refer to teams and fields by id, so each
+    team is sent once. The snapshot is cached as a whole until the tournament's version changes.
+    """
+    tournament = Tournament.objects.filter(slug=slug).first()
+    if tournament is None:
+        return 404, {"success": False, "message": f"Tournament with slug {slug} not found"}
+
+    return 200, {
+        "version": tournament.version,
+        "tournament": tournament,
+        "teams": tournament.teams.order_by("id"),
+        "fields": TournamentField.objects.filter(tournament=tournament).order_by("name"),
+        "pools": Pool.objects.filter(tournament=tournament).order_by("sequence_number", "id"),
+        "cross_pools": CrossPool.objects.filter(tournament=tournament).order_by("id"),
+        "brackets": Bracket.objects.filter(tournament=tournament).order_by("sequence_number", "id"),
+        "position_pools": PositionPool.objects.filter(tournament=tournament).order_by(
+            "sequence_number", "id"
+        ),
+        "matches": Match.objects.filter(tournament=tournament).order_by(
+            "time", "sequence_number", "id"
+        ),
+    }
+
+
+@router.get(
+    "/{tournament_slug}/leaderboard",
+    response=list[PlayerStatsSchema],
+    tags=["tournaments"],
+    auth=None,
+)
+@paginate(PageNumberPagination)
+def get_tournament_leaderboard(
+    request: HttpRequest, tournament_slug: str, stat: LeaderboardStat = "goals"
+) -> QuerySet[PlayerStats]:
+    """
+    Players of a tournament ranked by a stat of their match events, read from the player
+    stats that are kept up to date as stat-keepers sync the events
+    """
+    return (
+        PlayerStats.objects.filter(tournament__slug=tournament_slug)
+        .select_related("player__user", "team")
+        .order_by(f"-{stat}", "player_id")
+    )
+
+
 @router.get(
     "/{slug}/me/access", response={200: UserAccessSchema, 404: ErrorSchema}, tags=["tournaments"]
 )
@@ -203,6 +295,7 @@ def update_tournament(
                 setattr(tournament, attr, value)
 
         tournament.save()
+        bump_tournament_version(tournament.id)
         return 200, tournament
     except Tournament.DoesNotExist:
         return 404, {"success": False, "message": f"Tournament with id {tournament_id} not found"}
@@ -276,6 +369,7 @@ def add_team_to_tournament(
         team = get_object_or_404(Team, id=team_id)
 
         tournament.teams.add(team)
+        bump_tournament_version(tournament.id)
         return 200, {
             "success": True,
             "message": f"Team {team.name} added to tournament {tournament.name}",
@@ -308,6 +402,7 @@ def remove_team_from_tournament(
         team = get_object_or_404(Team, id=team_id)
 
         tournament.teams.remove(team)
+        bump_tournament_version(tournament.id)
         return 200, {
             "success": True,
             "message": f"Team {team.name} removed from tournament {tournament.name}",
@@ -341,6 +436,7 @@ def add_volunteer_to_tournament(
         user = get_object_or_404(User, id=user_id)
 
         tournament.volunteers.add(user)
+        bump_tournament_version(tournament.id)
         return 200, {
             "success": True,
             "message": f"Volunteer {user.get_full_name()} added to tournament {tournament.name}",
@@ -373,6 +469,7 @@ def remove_volunteer_from_tournament(
         user = get_object_or_404(User, id=user_id)
 
         tournament.volunteers.remove(user)
+        bump_tournament_version(tournament.id)
         return 200, {
             "success": True,
             "message": f"Volunteer {user.get_full_name()} removed from tournament {tournament.name}",
@@ -392,11 +489,11 @@ def list_registrations(
     team_id: int | None = None,
     player_id: int | None = None,
     role: str | None = None,
-) -> list[Registration]:
+) -> QuerySet[Registration]:
     """
     List all registrations with optional filtering
     """
-    qs = Registration.objects.all().select_related("tournament", "team", "player")
+    qs = Registration.objects.select_related("tournament", "team", "player__user").order_by("id")
 
     if tournament_id:
         qs = qs.filter(tournament_id=tournament_id)
@@ -410,7 +507,7 @@ def list_registrations(
     if role:
         qs = qs.filter(role=role)
 
-    return list(qs)
+    return qs
 
 
 @router.get(
@@ -421,12 +518,8 @@ def list_registrations(
 )
 def get_tournament_team_roster(
     request: HttpRequest, tournament_slug: str, team_slug: str
-) -> list[Registration]:
-    print(tournament_slug, team_slug)
-    qs = Registration.objects.all().select_related("tournament", "team", "player")
-    qs = qs.filter(tournament__slug=tournament_slug, team__slug=team_slug)
-    print(list(qs))
-    return list(qs)
+) -> QuerySet[Registration]:
+    return Registration.objects.filter(tournament__slug=tournament_slug, team__slug=team_slug)
 
 
 @router.post(
@@ -537,6 +630,7 @@ def delete_registration(
 
 # Pool endpoints
 @router.get("/{tournament_slug}/pools", response=list[PoolSchema], tags=["pools"], auth=None)
+@decorate_view(cache_tournament_response(tournament_from_path("tournament_slug")))
 def list_pools(
     request: HttpRequest,
     tournament_slug: str,
@@ -603,6 +697,7 @@ def create_pool(
         )
 
         create_pool_matches(tournament, pool)
+        bump_tournament_version(tournament.id)
 
         return 201, pool
     except Tournament.DoesNotExist:
@@ -638,6 +733,7 @@ def update_pool(
                 setattr(pool, attr, value)
 
         pool.save()
+        bump_tournament_version(pool.tournament_id)
         return 200, pool
     except Pool.DoesNotExist:
         return 404, {"success": False, "message": f"Pool with id {pool_id} not found"}
@@ -661,6 +757,7 @@ def delete_pool(request: AuthenticatedHttpRequest, pool_id: int) -> tuple[int, d
     try:
         pool = get_object_or_404(Pool, id=pool_id)
         pool.delete()
+        bump_tournament_version(pool.tournament_id)
         return 200, {"success": True, "message": "Pool deleted successfully"}
     except Pool.DoesNotExist:
         return 404, {"success": False, "message": f"Pool with id {pool_id} not found"}
@@ -672,16 +769,16 @@ def delete_pool(request: AuthenticatedHttpRequest, pool_id: int) -> tuple[int, d
 def list_cross_pools(
     request: HttpRequest,
     tournament_id: int | None = None,
-) -> list[CrossPool]:
+) -> QuerySet[CrossPool]:
     """
     List all cross pools with optional filtering
     """
-    qs = CrossPool.objects.all().select_related("tournament")
+    qs = CrossPool.objects.select_related("tournament").order_by("id")
 
     if tournament_id:
         qs = qs.filter(tournament_id=tournament_id)
 
-    return list(qs)
+    return qs
 
 
 @router.post(
@@ -707,6 +804,7 @@ def create_cross_pool(
             initial_seeding=payload.initial_seeding,
             current_seeding=payload.current_seeding or payload.initial_seeding,
         )
+        bump_tournament_version(tournament.id)
 
         return 201, cross_pool
     except Tournament.DoesNotExist:
@@ -742,6 +840,7 @@ def update_cross_pool(
                 setattr(cross_pool, attr, value)
 
         cross_pool.save()
+        bump_tournament_version(cross_pool.tournament_id)
         return 200, cross_pool
     except CrossPool.DoesNotExist:
         return 404, {"success": False, "message": f"Cross pool with id {cross_pool_id} not found"}
@@ -767,6 +866,7 @@ def delete_cross_pool(
     try:
         cross_pool = get_object_or_404(CrossPool, id=cross_pool_id)
         cross_pool.delete()
+        bump_tournament_version(cross_pool.tournament_id)
         return 200, {"success": True, "message": "Cross pool deleted successfully"}
     except CrossPool.DoesNotExist:
         return 404, {"success": False, "message": f"Cross pool with id {cross_pool_id} not found"}
@@ -776,6 +876,7 @@ def delete_cross_pool(
 @router.get(
     "/{tournament_slug}/brackets", response=list[BracketSchema], tags=["brackets"], auth=None
 )
+@decorate_view(cache_tournament_response(tournament_from_path("tournament_slug")))
 def list_brackets(
     request: HttpRequest,
     tournament_slug: str,
@@ -827,6 +928,7 @@ def create_bracket(
         )
 
         create_bracket_matches(tournament, bracket)
+        bump_tournament_version(tournament.id)
 
         return 201, bracket
     except Tournament.DoesNotExist:
@@ -862,6 +964,7 @@ def update_bracket(
                 setattr(bracket, attr, value)
 
         bracket.save()
+        bump_tournament_version(bracket.tournament_id)
         return 200, bracket
     except Bracket.DoesNotExist:
         return 404, {"success": False, "message": f"Bracket with id {bracket_id} not found"}
@@ -887,6 +990,7 @@ def delete_bracket(
     try:
         bracket = get_object_or_404(Bracket, id=bracket_id)
         bracket.delete()
+        bump_tournament_version(bracket.tournament_id)
         return 200, {"success": True, "message": "Bracket deleted successfully"}
     except Bracket.DoesNotExist:
         return 404, {"success": False, "message": f"Bracket with id {bracket_id} not found"}
@@ -896,16 +1000,17 @@ def delete_bracket(
 @router.get(
     "/position-pools", response=list[PositionPoolSchema], tags=["position-pools"], auth=None
 )
+@decorate_view(cache_tournament_response(tournament_from_query("tournament_id")))
 @paginate(PageNumberPagination)
 def list_position_pools(
     request: HttpRequest,
     tournament_id: int | None = None,
     name: str | None = None,
-) -> list[PositionPool]:
+) -> QuerySet[PositionPool]:
     """
     List all position pools with optional filtering
     """
-    qs = PositionPool.objects.all().select_related("tournament")
+    qs = PositionPool.objects.select_related("tournament").order_by("id")
 
     if tournament_id:
         qs = qs.filter(tournament_id=tournament_id)
@@ -913,7 +1018,7 @@ def list_position_pools(
     if name:
         qs = qs.filter(name=name)
 
-    return list(qs)
+    return qs
 
 
 @router.post(
@@ -946,6 +1051,7 @@ def create_position_pool(
         )
 
         create_position_pool_matches(tournament, position_pool)
+        bump_tournament_version(tournament.id)
 
         return 201, position_pool
     except Tournament.DoesNotExist:
@@ -985,6 +1091,7 @@ def update_position_pool(
                 setattr(position_pool, attr, value)
 
         position_pool.save()
+        bump_tournament_version(position_pool.tournament_id)
         return 200, position_pool
     except PositionPool.DoesNotExist:
         return 404, {
@@ -1017,6 +1124,7 @@ def delete_position_pool(
     try:
         position_pool = get_object_or_404(PositionPool, id=position_pool_id)
         position_pool.delete()
+        bump_tournament_version(position_pool.tournament_id)
         return 200, {"success": True, "message": "Position pool deleted successfully"}
     except PositionPool.DoesNotExist:
         return 404, {
@@ -1060,6 +1168,11 @@ def start_tournament(
 
     tournament.status = Tournament.StatusTypes.LIVE
     tournament.save()
+    bump_tournament_version(tournament.id)
+    publish_tournament_event(
+        tournament.id, "fixtures", {"match_ids": [match.id for match in pool_matches]}
+    )
+    publish_tournament_event(tournament.id, "status", {"status": tournament.status})
 
     return 200, tournament
 
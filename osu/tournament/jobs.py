@@ -0,0 +1,200 @@
+"""
+Queue of the recomputations that follow score submissions, kept in the database.
+
+A submission queues its job in its own transaction, so a job exists exactly when its
+submission was saved, and the run_tournament_jobs worker runs the jobs later. Jobs of a
+tournament run one at a time, in the order they were queued, since each result builds on
+the standings left by the results before it. A queued job takes in the duplicates queued
+after it: a match's result is applied once with its latest score, and a tournament's
+spirit rankings are computed once for all the spirit scores submitted meanwhile.
+
+A job that fails is queued again, up to TOURNAMENT_JOB_MAX_ATTEMPTS runs in all, since the
+jobs behind it build on its result. A match result that fails every run is then applied with
+a full rescan of the tournament's fixtures, like before results were propagated incrementally,
+so that later results do not build on wrong fixtures. Staff see the errors of the jobs.
+
+With TOURNAMENT_JOBS_EAGER, jobs run as soon as they are queued, in the submission's
+transaction, like they did before there was a worker.
+"""
+import logging
+from typing import Any
+
+from django.conf import settings
+from django.utils import timezone
+
+from osu.match.models import Match, TournamentJob
+from osu.tournament.models import Tournament
+from osu.tournament.utils import (
+    populate_fixtures,
+    propagate_fixtures,
+    update_match_score_and_results,
+    update_tournament_spirit_rankings,
+)
+from osu.utils import atomic_with_retries
+from osu.writes import WriteQueueTimeoutError, serialized_writes
+
+logger = logging.getLogger(__name__)
+
+
+def queue_job(
+    tournament_id: int,
+    job_type: TournamentJob.JobType,
+    match_id: int | None = None,
+    payload: dict[str, Any] | None = None,
+) -> TournamentJob:
+    """Queue a job, unless the same job is queued already, which gets the payload instead"""
+    payload = payload or {}
+    queued_jobs = TournamentJob.objects.filter(
+        tournament_id=tournament_id, type=job_type, status=TournamentJob.StatusTypes.QUEUED
+    )
+    if match_id is None:
+        queued_jobs = queued_jobs.filter(match__isnull=True)
+    else:
+        queued_jobs = queued_jobs.filter(match_id=match_id)
+
+    job = queued_jobs.order_by("id").first()
+    # The job is only taken if it is still queued when updated. The update holds its row
+    # until this transaction commits, so a worker cannot claim it before seeing the change.
+    if job is not None and queued_jobs.filter(id=job.id).update(payload=payload):
+        job.payload = payload
+    else:
+        job = TournamentJob.objects.create(
+            tournament_id=tournament_id, type=job_type, match_id=match_id, payload=payload
+        )
+
+    if settings.TOURNAMENT_JOBS_EAGER:
+        run_job(job, raise_errors=True)
+    return job
+
+
+def queue_match_result(match: Match, score_team_1: int, score_team_2: int) -> TournamentJob:
+    return queue_job(
+        match.tournament_id,
+        TournamentJob.JobType.MATCH_RESULT,
+        match.id,
+        {"score_team_1": score_team_1, "score_team_2": score_team_2},
+    )
+
+
+def queue_spirit_rankings(tournament_id: int) -> TournamentJob:
+    return queue_job(tournament_id, TournamentJob.JobType.SPIRIT_RANKINGS)
+
+
+def perform_job(job: TournamentJob, full_rescan: bool = False) -> None:
+    if job.type == TournamentJob.JobType.MATCH_RESULT:
+        match = Match.objects.select_related("tournament").get(jobs=job)
+        update_match_score_and_results(
+            match, job.payload["score_team_1"], job.payload["score_team_2"]
+        )
+        if full_rescan:
+            populate_fixtures(match.tournament_id)
+        else:
+            propagate_fixtures(match)
+
+    elif job.type == TournamentJob.JobType.SPIRIT_RANKINGS:
+        update_tournament_spirit_rankings(Tournament.objects.get(id=job.tournament_id))
+
+
+def recover_job(job: TournamentJob) -> TournamentJob.StatusTypes:
+    """
+    Apply a match result that failed every run with a full rescan of the fixtures, and return
+    the status of the job. Spirit rankings are computed whole by the next job.
+    """
+    if job.type != TournamentJob.JobType.MATCH_RESULT:
+        return TournamentJob.StatusTypes.FAILED
+
+    try:
+        atomic_with_retries(lambda: perform_job(job, full_rescan=True))
+    except Exception:
+        logger.exception("Full rescan for tournament job %s failed", job.id)
+        return TournamentJob.StatusTypes.FAILED
+
+    logger.warning("Tournament job %s was applied with a full rescan", job.id)
+    job.error = f"Applied with a full rescan, after: {job.error}"
+    return TournamentJob.StatusTypes.COMPLETED
+
+
+def run_job(job: TournamentJob, raise_errors: bool = False) -> None:
+    """
+    Run a job in a transaction, retried on conflicts, and record whether it completed. A job
+    that fails is queued again until it has run TOURNAMENT_JOB_MAX_ATTEMPTS times. With
+    SERIALIZE_WRITES, the job waits for its turn to write like requests do, and is queued
+    again if the turn does not come.
+    """
+    job.started_at = job.started_at or timezone.now()
+    try:
+        with serialized_writes():
+            try:
+                atomic_with_retries(lambda: perform_job(job))
+            except Exception as e:
+                if raise_errors:
+                    raise
+                job.attempts += 1
+                job.error = str(e)
+                if job.attempts < settings.TOURNAMENT_JOB_MAX_ATTEMPTS:
+                    logger.warning(
+                        "Tournament job %s failed, and was queued again", job.id, exc_info=True
+                    )
+                    job.status = TournamentJob.StatusTypes.QUEUED
+                    job.started_at = None
+                    job.save(update_fields=["status", "error", "attempts", "started_at"])
+                    return
+
+                logger.exception("Tournament job %s failed %d times", job.id, job.attempts)
+                job.status = recover_job(job)
+            else:
+                job.status = TournamentJob.StatusTypes.COMPLETED
+
+            job.finished_at = timezone.now()
+            job.save(update_fields=["status", "error", "attempts", "started_at", "finished_at"])
+    except WriteQueueTimeoutError:
+        if raise_errors:
+            raise
+        # The job did not start, and runs again once the writers ahead of it are done
+        logger.warning("Tournament job %s got no turn to write, and was queued again", job.id)
+        TournamentJob.objects.filter(id=job.id).update(
+            status=TournamentJob.StatusTypes.QUEUED, started_at=None
+        )
+
+
+def claim_next_job() -> TournamentJob | None:
+    """
+    Mark the oldest queued job of a tournament with no running job as running, and return
+    it. The claim is a conditional update, so that a job is only claimed once.
+    """
+    while True:
+        running_jobs = TournamentJob.objects.filter(status=TournamentJob.StatusTypes.RUNNING)
+        job = (
+            TournamentJob.objects.filter(status=TournamentJob.StatusTypes.QUEUED)
+            .exclude(tournament__in=running_jobs.values("tournament"))
+            .order_by("id")
+            .first()
+        )
+        if job is None:
+            return None
+
+        started_at = timezone.now()
+        claimed = TournamentJob.objects.filter(
+            id=job.id, status=TournamentJob.StatusTypes.QUEUED
+        ).update(status=TournamentJob.StatusTypes.RUNNING, started_at=started_at)
+        if claimed:
+            # The payload of a queued job can be updated until it is claimed
+            job.refresh_from_db()
+            return job
+
+
+def run_queued_jobs() -> int:
+    """Run jobs until none is queued, and return how many runs there were, retries included"""
+    num_jobs = 0
+    while (job := claim_next_job()) is not None:
+        run_job(job)
+        num_jobs += 1
+
+    return num_jobs
+
+
+def requeue_running_jobs() -> int:
+    """Queue the jobs left running by a worker that stopped, to run them again"""
+    return TournamentJob.objects.filter(status=TournamentJob.StatusTypes.RUNNING).update(
+        status=TournamentJob.StatusTypes.QUEUED, started_at=None
+    )
@@ -1,6 +1,7 @@
 from pathlib import Path
 from typing import Any
 
+from django.core.serializers.json import DjangoJSONEncoder
 from django.db import models
 from django.db.models.signals import m2m_changed
 from django.dispatch import receiver
@@ -58,6 +59,9 @@ class Tournament(models.Model):
 
     volunteers = models.ManyToManyField(User, related_name="tournament_volunteer", blank=True)
 
+    # Counter bumped on every change to the tournament's public data, keys its cached pages
+    version = models.PositiveIntegerField(default=0, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -76,6 +80,15 @@ class Tournament(models.Model):
 
             self.slug = unique_slug
 
+        if not self._state.adding and "update_fields" not in kwargs:
+            # The version is only changed by bump_tournament_version, so that saving a
+            # stale instance cannot write back an older version
+            kwargs["update_fields"] = [
+                field.name
+                for field in self._meta.fields
+                if not field.primary_key and field.name != "version"
+            ]
+
         return super().save(*args, **kwargs)
 
 
@@ -165,3 +178,24 @@ class PositionPool(models.Model):
 
     class Meta:
         unique_together = ["name", "tournament"]
+
+
+class TournamentStreamEvent(models.Model):
+    """
+    Event for the live streams of a tournament, saved in the transaction of the change it
+    tells of, so that the streams of every server process read it, whichever process made
+    the change
+    """
+
+    tournament = models.ForeignKey(
+        Tournament, on_delete=models.CASCADE, related_name="stream_events"
+    )
+    name = models.CharField(max_length=20)
+    data = models.JSONField(default=dict, blank=True, encoder=DjangoJSONEncoder)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["tournament", "id"], name="tournament_stream_event_idx"),
+            models.Index(fields=["created_at"], name="stream_event_created_idx"),
+        ]
@@ -1,8 +1,9 @@
 from datetime import date
-from typing import Any
+from typing import Any, ClassVar, Literal
 
 from ninja import ModelSchema, Schema
 
+from osu.match.models import Match, PlayerStats
 from osu.player.models import Player
 from osu.team.models import Team
 from osu.tournament.models import (
@@ -22,6 +23,9 @@ class PlayerSimpleSchema(ModelSchema):
         model = Player
         model_fields = ["id", "slug", "gender"]
 
+    # Relations read by the resolvers, see osu.loading
+    resolver_relations: ClassVar[list[str]] = ["user"]
+
     user_first_name: str
     user_last_name: str
 
@@ -117,6 +121,19 @@ class PositionPoolSchema(ModelSchema):
     tournament: TournamentSimpleSchema
 
 
+# Player stats that leaderboards are ranked by
+LeaderboardStat = Literal["goals", "assists", "blocks", "drops", "throwaways"]
+
+
+class PlayerStatsSchema(ModelSchema):
+    class Config:
+        model = PlayerStats
+        model_fields = ["goals", "assists", "blocks", "drops", "throwaways"]
+
+    player: PlayerSimpleSchema
+    team: TeamSimpleSchema | None
+
+
 class TournamentCreateSchema(Schema):
     name: str
     description: str = ""
@@ -205,6 +222,75 @@ class TournamentDetailSchema(TournamentSimpleSchema):
     spirit_ranking: list[Any] = []
 
 
+# Snapshot of a tournament, whose stages and matches refer to its teams and fields by id
+class SnapshotTournamentSchema(TournamentSimpleSchema):
+    initial_seeding: dict[str, Any] = {}
+    current_seeding: dict[str, Any] = {}
+    spirit_ranking: list[Any] = []
+
+
+class SnapshotPoolSchema(ModelSchema):
+    class Config:
+        model = Pool
+        model_fields = ["id", "sequence_number", "name", "initial_seeding", "results"]
+
+
+class SnapshotCrossPoolSchema(ModelSchema):
+    class Config:
+        model = CrossPool
+        model_fields = ["id", "initial_seeding", "current_seeding"]
+
+
+class SnapshotBracketSchema(ModelSchema):
+    class Config:
+        model = Bracket
+        model_fields = ["id", "sequence_number", "name", "initial_seeding", "current_seeding"]
+
+
+class SnapshotPositionPoolSchema(ModelSchema):
+    class Config:
+        model = PositionPool
+        model_fields = ["id", "sequence_number", "name", "initial_seeding", "results"]
+
+
+class SnapshotMatchSchema(ModelSchema):
+    class Config:
+        model = Match
+        model_fields = [
+            "id",
+            "name",
+            "time",
+            "duration_mins",
+            "score_team_1",
+            "score_team_2",
+            "status",
+            "video_url",
+            "sequence_number",
+            "placeholder_seed_1",
+            "placeholder_seed_2",
+        ]
+
+    team_1_id: int | None
+    team_2_id: int | None
+    field_id: int | None
+    pool_id: int | None
+    cross_pool_id: int | None
+    bracket_id: int | None
+    position_pool_id: int | None
+
+
+class TournamentSnapshotSchema(Schema):
+    version: int
+    tournament: SnapshotTournamentSchema
+    teams: list[TeamSimpleSchema]
+    fields: list[TournamentFieldSchema]
+    pools: list[SnapshotPoolSchema]
+    cross_pools: list[SnapshotCrossPoolSchema]
+    brackets: list[SnapshotBracketSchema]
+    position_pools: list[SnapshotPositionPoolSchema]
+    matches: list[SnapshotMatchSchema]
+
+
 class SuccessSchema(Schema):
     success: bool = True
     message: str = "Operation successful"
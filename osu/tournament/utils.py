@@ -1,10 +1,14 @@
 import os
-from collections import Counter
+from collections import Counter, defaultdict
+from collections.abc import Iterable
 
-from django.db.models import Q
+from django.db import transaction
+from django.db.models import Case, F, Q, QuerySet, Value, When
+from django.utils import timezone
 
 from osu.commons import validation_error_dict
-from osu.match.models import Match
+from osu.events import publish_tournament_event
+from osu.match.models import Match, MatchEvent, MatchSeedSlot, MatchStats, PlayerStats
 from osu.player.models import Player
 from osu.team.models import Team
 from osu.user.models import User
@@ -28,52 +32,115 @@ ROLES_ELIGIBLE_TO_SUBMIT_SCORES = [
 ]
 PLAYER_ROLE = "player"
 
+# Player fields of match events, and the player stats that count them
+PLAYER_STAT_FIELDS = {
+    "scored_by": "goals",
+    "assisted_by": "assists",
+    "block_by": "blocks",
+    "drop_by": "drops",
+    "throwaway_by": "throwaways",
+}
+
+# (team id, opponent id) -> wins, goal difference ("gd") and goals for ("gf") against opponent
+HeadToHeadMatrix = dict[tuple[int, int], dict[str, int]]
+
 
 # Exported Functions ####################
 
 
-def create_pool_matches(tournament: Tournament, pool: Pool) -> None:
+def create_pool_matches(tournament: Tournament, pool: Pool) -> list[Match]:
     pool_seeding_list = list(map(int, pool.initial_seeding.keys()))
+    matches = []
 
     for i, seed_x in enumerate(pool_seeding_list):
         for j, seed_y in enumerate(pool_seeding_list[i + 1 :], i + 1):
-            match = Match(
-                name=f"{pool.name}{i + 1} vs {pool.name}{j + 1}",
-                tournament=tournament,
-                pool=pool,
-                sequence_number=1,
-                placeholder_seed_1=seed_x,
-                placeholder_seed_2=seed_y,
+            matches.append(
+                Match(
+                    name=f"{pool.name}{i + 1} vs {pool.name}{j + 1}",
+                    tournament=tournament,
+                    pool=pool,
+                    sequence_number=1,
+                    placeholder_seed_1=seed_x,
+                    placeholder_seed_2=seed_y,
+                )
             )
 
-            match.save()
+    return bulk_create_matches(matches)
 
 
-def create_bracket_matches(tournament: Tournament, bracket: Bracket) -> None:
+def create_bracket_matches(tournament: Tournament, bracket: Bracket) -> list[Match]:
     seeds = sorted(map(int, bracket.initial_seeding.keys()))
     start, end = seeds[0], seeds[-1]
-    if ((end - start) + 1) % 2 == 0:
-        create_bracket_sequence_matches(tournament, bracket, start, end, 1)
+    if ((end - start) + 1) % 2 != 0:
+        return []
+
+    matches = create_bracket_sequence_matches(tournament, bracket, start, end, 1)
+    return bulk_create_matches(matches)
 
 
-def create_position_pool_matches(tournament: Tournament, position_pool: PositionPool) -> None:
+def create_position_pool_matches(
+    tournament: Tournament, position_pool: PositionPool
+) -> list[Match]:
     position_pool_seeding_list = list(map(int, position_pool.initial_seeding.keys()))
+    matches = []
 
     for i, seed_x in enumerate(position_pool_seeding_list):
         for j, seed_y in enumerate(position_pool_seeding_list[i + 1 :], i + 1):
-            match = Match(
-                name=f"{position_pool.name}{i + 1} vs {position_pool.name}{j + 1}",
-                tournament=tournament,
-                position_pool=position_pool,
-                sequence_number=1,
-                placeholder_seed_1=seed_x,
-                placeholder_seed_2=seed_y,
+            matches.append(
+                Match(
+                    name=f"{position_pool.name}{i + 1} vs {position_pool.name}{j + 1}",
+                    tournament=tournament,
+                    position_pool=position_pool,
+                    sequence_number=1,
+                    placeholder_seed_1=seed_x,
+                    placeholder_seed_2=seed_y,
+                )
+            )
+
+    return bulk_create_matches(matches)
+
+
+def index_match_seeds(matches: list[Match]) -> None:
+    """Add the seed -> match slot index entries of newly created matches"""
+    slots = []
+    for match in matches:
+        stage = get_match_stage(match)
+        if stage is None:
+            continue
+
+        for slot, seed in ((1, match.placeholder_seed_1), (2, match.placeholder_seed_2)):
+            slots.append(
+                MatchSeedSlot(
+                    tournament_id=match.tournament_id,
+                    match=match,
+                    stage=stage,
+                    sequence_number=match.sequence_number,
+                    seed=seed,
+                    slot=slot,
+                )
             )
 
-            match.save()
+    MatchSeedSlot.objects.bulk_create(slots)
+
+
+def reindex_match_seeds(match: Match) -> None:
+    """Rebuild the seed index entries of a match whose stage or seeds may have changed"""
+    MatchSeedSlot.objects.filter(match=match).delete()
+    index_match_seeds([match])
+
+
+def get_seed_slots(tournament_id: int, seeds: list[int]) -> QuerySet[MatchSeedSlot]:
+    """Match slots fed by the given seeds, with their matches loaded"""
+    return (
+        MatchSeedSlot.objects.filter(tournament_id=tournament_id, seed__in=seeds)
+        .select_related("match")
+        .order_by("match_id", "slot")
+    )
 
 
-def sort_tied_teams(tied_teams: list[dict[str, int]], tournament_id: int) -> list[dict[str, int]]:
+def sort_tied_teams(
+    tied_teams: list[dict[str, int]], head_to_head: HeadToHeadMatrix
+) -> list[dict[str, int]]:
     """
     This is the comparator function for comparing pool results
     The order of precedence is as follows:
@@ -89,28 +156,17 @@ def sort_tied_teams(tied_teams: list[dict[str, int]], tournament_id: int) -> lis
         team["id"]: {"wins": 0, "gd": 0, "gf": 0} for team in tied_teams
     }
 
-    # Get all matches between tied teams
+    # Sum the head-to-head stats of each team against the other tied teams
     team_ids = [team["id"] for team in tied_teams]
-    matches = Match.objects.filter(
-        tournament_id=tournament_id, status=Match.StatusTypes.COMPLETED
-    ).filter(Q(team_1__id__in=team_ids, team_2__id__in=team_ids))
-
-    # Calculate head-to-head stats
-    for match in matches:
-        if match.team_1 is None or match.team_2 is None:
-            continue
-
-        # Update wins
-        if match.score_team_1 > match.score_team_2:
-            team_stats[match.team_1.id]["wins"] += 1
-        elif match.score_team_2 > match.score_team_1:
-            team_stats[match.team_2.id]["wins"] += 1
+    for team_id in team_ids:
+        for opponent_id in team_ids:
+            stats = head_to_head.get((team_id, opponent_id))
+            if stats is None:
+                continue
 
-        # Update goal difference and goals for
-        team_stats[match.team_1.id]["gd"] += match.score_team_1 - match.score_team_2
-        team_stats[match.team_2.id]["gd"] += match.score_team_2 - match.score_team_1
-        team_stats[match.team_1.id]["gf"] += match.score_team_1
-        team_stats[match.team_2.id]["gf"] += match.score_team_2
+            team_stats[team_id]["wins"] += stats["wins"]
+            team_stats[team_id]["gd"] += stats["gd"]
+            team_stats[team_id]["gf"] += stats["gf"]
 
     # Sort teams based on criteria
     return sorted(
@@ -126,30 +182,57 @@ def sort_tied_teams(tied_teams: list[dict[str, int]], tournament_id: int) -> lis
     )
 
 
+def get_head_to_head_matrix(tournament_id: int, team_ids: list[int]) -> HeadToHeadMatrix:
+    """
+    Head-to-head stats between the given teams from their completed matches, keyed by
+    (team, opponent), loaded with a single query
+    """
+    head_to_head: HeadToHeadMatrix = {}
+    matches = Match.objects.filter(
+        tournament_id=tournament_id,
+        status=Match.StatusTypes.COMPLETED,
+        team_1_id__in=team_ids,
+        team_2_id__in=team_ids,
+    ).values_list("team_1_id", "team_2_id", "score_team_1", "score_team_2")
+
+    for team_1_id, team_2_id, score_team_1, score_team_2 in matches:
+        for team_id, opponent_id, score_for, score_against in (
+            (team_1_id, team_2_id, score_team_1, score_team_2),
+            (team_2_id, team_1_id, score_team_2, score_team_1),
+        ):
+            stats = head_to_head.setdefault((team_id, opponent_id), {"wins": 0, "gd": 0, "gf": 0})
+            if score_for > score_against:
+                stats["wins"] += 1
+            stats["gd"] += score_for - score_against
+            stats["gf"] += score_for
+
+    return head_to_head
+
+
 def get_new_pool_results(
     old_results: dict[int, dict[str, int]],
     match: Match,
     pool_seeding_list: list[int],
     tournament_seeding: dict[int, int],
 ) -> tuple[dict[int, dict[str, int]], dict[int, int]]:
-    if match.team_1 is None or match.team_2 is None:
+    if match.team_1_id is None or match.team_2_id is None:
         return old_results, tournament_seeding
 
-    old_results[match.team_1.id]["GF"] += match.score_team_1
-    old_results[match.team_1.id]["GA"] += match.score_team_2
+    old_results[match.team_1_id]["GF"] += match.score_team_1
+    old_results[match.team_1_id]["GA"] += match.score_team_2
 
-    old_results[match.team_2.id]["GF"] += match.score_team_2
-    old_results[match.team_2.id]["GA"] += match.score_team_1
+    old_results[match.team_2_id]["GF"] += match.score_team_2
+    old_results[match.team_2_id]["GA"] += match.score_team_1
 
     if match.score_team_1 > match.score_team_2:
-        old_results[match.team_1.id]["wins"] += 1
-        old_results[match.team_2.id]["losses"] += 1
+        old_results[match.team_1_id]["wins"] += 1
+        old_results[match.team_2_id]["losses"] += 1
     elif match.score_team_1 < match.score_team_2:
-        old_results[match.team_2.id]["wins"] += 1
-        old_results[match.team_1.id]["losses"] += 1
+        old_results[match.team_2_id]["wins"] += 1
+        old_results[match.team_1_id]["losses"] += 1
     else:
-        old_results[match.team_1.id]["draws"] += 1
-        old_results[match.team_2.id]["draws"] += 1
+        old_results[match.team_1_id]["draws"] += 1
+        old_results[match.team_2_id]["draws"] += 1
 
     # Create results list with team IDs
     results_list = []
@@ -165,6 +248,17 @@ def get_new_pool_results(
             wins_groups[wins] = []
         wins_groups[wins].append(result)
 
+    # Load the head-to-head stats of all tied teams at once
+    tied_team_ids = [
+        result["id"]
+        for tied_teams in wins_groups.values()
+        if len(tied_teams) > 1
+        for result in tied_teams
+    ]
+    head_to_head = (
+        get_head_to_head_matrix(match.tournament_id, tied_team_ids) if tied_team_ids else {}
+    )
+
     # Sort each tied group separately
     ranked_results = []
     for wins in sorted(wins_groups.keys(), reverse=True):
@@ -173,7 +267,7 @@ def get_new_pool_results(
             ranked_results.extend(tied_teams)
         else:
             # Sort tied teams using head-to-head criteria
-            sorted_tied_teams = sort_tied_teams(tied_teams, match.tournament.id)
+            sorted_tied_teams = sort_tied_teams(tied_teams, head_to_head)
             ranked_results.extend(sorted_tied_teams)
 
     new_results = {}
@@ -204,7 +298,29 @@ def get_new_bracket_seeding(seeding: dict[int, int], match: Match) -> dict[int,
     return seeding
 
 
+def lock_match_standings(match: Match) -> None:
+    """
+    Reload the tournament and the stage of a match with their rows locked until the end of
+    the transaction, so that concurrent results are applied one at a time, each to the
+    standings left by the one before it. The tournament is always locked first, so that
+    two results never wait for each other's locks.
+    """
+    match.tournament = Tournament.objects.select_for_update().get(id=match.tournament_id)
+    if match.pool_id is not None:
+        match.pool = Pool.objects.select_for_update().get(id=match.pool_id)
+    elif match.cross_pool_id is not None:
+        match.cross_pool = CrossPool.objects.select_for_update().get(id=match.cross_pool_id)
+    elif match.bracket_id is not None:
+        match.bracket = Bracket.objects.select_for_update().get(id=match.bracket_id)
+    elif match.position_pool_id is not None:
+        match.position_pool = PositionPool.objects.select_for_update().get(
+            id=match.position_pool_id
+        )
+
+
+@transaction.atomic
 def update_match_score_and_results(match: Match, score_team_1: int, score_team_2: int) -> None:
+    lock_match_standings(match)
     match.score_team_1 = score_team_1
     match.score_team_2 = score_team_2
 
@@ -223,6 +339,167 @@ def update_match_score_and_results(match: Match, score_team_1: int, score_team_2
     match.status = Match.StatusTypes.COMPLETED
     match.save()
 
+    bump_tournament_version(match.tournament_id)
+    publish_tournament_event(
+        match.tournament_id,
+        "score",
+        {
+            "match_id": match.id,
+            "score_team_1": match.score_team_1,
+            "score_team_2": match.score_team_2,
+            "status": match.status,
+        },
+    )
+
+
+def get_possession_after_event(event: MatchEvent, team_ids: tuple[int, int]) -> int:
+    """
+    Team in possession after an event. The blocking team takes over after a block, and the
+    other team receives the pull after a score or takes over after a drop or throwaway.
+    """
+    if event.type == MatchEvent.EventType.BLOCK:
+        return event.team_id
+
+    return team_ids[1] if event.team_id == team_ids[0] else team_ids[0]
+
+
+def apply_match_events(
+    match: Match, stats: MatchStats, events: list[MatchEvent]
+) -> tuple[list[MatchEvent], list[MatchEvent]]:
+    """
+    Add new events to the stats of a match, in the given order. Each event gets the score
+    after it, and the stats the score and possession after the last one, without reading the
+    earlier events. Events whose client id the stats already have are skipped, so that a
+    stat-keeper can resend a batch whose response was lost.
+
+    Expects the stats to be locked with select_for_update in the caller's transaction.
+    Returns the created and the skipped events.
+    """
+    if match.team_1_id is None or match.team_2_id is None:
+        raise ValueError("Events can only be added to a match between two teams")
+
+    team_ids = (match.team_1_id, match.team_2_id)
+    seen_client_ids = set(
+        stats.events.filter(client_id__in=[event.client_id for event in events]).values_list(
+            "client_id", flat=True
+        )
+    )
+
+    created: list[MatchEvent] = []
+    duplicates: list[MatchEvent] = []
+    for event in events:
+        if event.client_id in seen_client_ids:
+            duplicates.append(event)
+            continue
+        seen_client_ids.add(event.client_id)
+
+        if event.type == MatchEvent.EventType.SCORE:
+            if event.team_id == team_ids[0]:
+                stats.score_team_1 += 1
+            else:
+                stats.score_team_2 += 1
+        stats.current_possession_id = get_possession_after_event(event, team_ids)
+
+        event.stats = stats
+        event.current_score_team_1 = stats.score_team_1
+        event.current_score_team_2 = stats.score_team_2
+        created.append(event)
+
+    if created:
+        MatchEvent.objects.bulk_create(created)
+        stats.save(update_fields=["score_team_1", "score_team_2", "current_possession"])
+        add_player_stats(match.tournament_id, created)
+        publish_tournament_event(
+            match.tournament_id,
+            "stats",
+            {
+                "match_id": match.id,
+                "score_team_1": stats.score_team_1,
+                "score_team_2": stats.score_team_2,
+                "current_possession_id": stats.current_possession_id,
+            },
+        )
+
+    return created, duplicates
+
+
+def count_player_stats(
+    events: Iterable[MatchEvent],
+) -> tuple[dict[int, Counter[str]], dict[int, int]]:
+    """Totals of each player's stats over the events, and the team of their last event"""
+    totals: dict[int, Counter[str]] = defaultdict(Counter)
+    teams: dict[int, int] = {}
+    for event in events:
+        for field, stat in PLAYER_STAT_FIELDS.items():
+            player_id = getattr(event, f"{field}_id")
+            if player_id is not None:
+                totals[player_id][stat] += 1
+                teams[player_id] = event.team_id
+
+    return totals, teams
+
+
+def add_player_stats(tournament_id: int, events: list[MatchEvent]) -> None:
+    """
+    Add new events to the stats of their players in the tournament, in two queries whatever the
+    number of players: one creates the missing rows, and one increments the counts in the database
+    so that concurrent syncs of other matches are not lost.
+    """
+    totals, teams = count_player_stats(events)
+    if not totals:
+        return
+
+    PlayerStats.objects.bulk_create(
+        [
+            PlayerStats(tournament_id=tournament_id, player_id=player_id, team_id=teams[player_id])
+            for player_id in totals
+        ],
+        ignore_conflicts=True,
+    )
+    PlayerStats.objects.filter(tournament_id=tournament_id, player_id__in=totals).update(
+        **{
+            stat: F(stat)
+            + Case(
+                *[
+                    When(player_id=player_id, then=Value(counts[stat]))
+                    for player_id, counts in totals.items()
+                    if counts[stat]
+                ],
+                default=Value(0),
+            )
+            for stat in PLAYER_STAT_FIELDS.values()
+            if any(counts[stat] for counts in totals.values())
+        }
+    )
+
+
+@transaction.atomic
+def rebuild_player_stats(tournament_id: int) -> int:
+    """
+    Recompute the player stats of a tournament from all its match events, for example after
+    events were removed. Returns the number of players with stats.
+    """
+    events = (
+        MatchEvent.objects.filter(stats__tournament_id=tournament_id)
+        .only("team", *PLAYER_STAT_FIELDS)
+        .order_by("id")
+    )
+    totals, teams = count_player_stats(events.iterator())
+
+    PlayerStats.objects.filter(tournament_id=tournament_id).delete()
+    PlayerStats.objects.bulk_create(
+        [
+            PlayerStats(
+                tournament_id=tournament_id,
+                player_id=player_id,
+                team_id=teams[player_id],
+                **counts,
+            )
+            for player_id, counts in totals.items()
+        ]
+    )
+    return len(totals)
+
 
 def populate_fixtures(tournament_id: int) -> None:
     pools = Pool.objects.filter(tournament=tournament_id)
@@ -297,28 +574,10 @@ def populate_fixtures(tournament_id: int) -> None:
                 cp.save()
         else:
             for bracket in brackets:
-                if bracket.initial_seeding[next(iter(bracket.initial_seeding.keys()))] == 0:
-                    for key in list(bracket.initial_seeding.keys()):
-                        bracket.initial_seeding[int(key)] = tournament.current_seeding[key]
-                        bracket.current_seeding[int(key)] = tournament.current_seeding[key]
-                    bracket.save()
+                seed_bracket_from_tournament(bracket, tournament)
 
             for position_pool in position_pools:
-                if (
-                    position_pool.initial_seeding[next(iter(position_pool.initial_seeding.keys()))]
-                    == 0
-                ):
-                    for i, key in enumerate(list(position_pool.initial_seeding.keys())):
-                        position_pool.initial_seeding[int(key)] = tournament.current_seeding[key]
-                        position_pool.results[tournament.current_seeding[key]] = {
-                            "rank": i + 1,
-                            "wins": 0,
-                            "losses": 0,
-                            "draws": 0,
-                            "GF": 0,  # Goals For
-                            "GA": 0,  # Goals Against
-                        }
-                    position_pool.save()
+                seed_position_pool_from_tournament(position_pool, tournament)
 
     if cross_pool.count() > 0:
         matches = Match.objects.filter(cross_pool=cross_pool[0])
@@ -435,11 +694,7 @@ def populate_fixtures(tournament_id: int) -> None:
                     is_this_bracket_seeds_cross_pool_matches_complete = False
 
             if is_this_bracket_seeds_cross_pool_matches_complete:
-                if bracket.initial_seeding[next(iter(bracket.initial_seeding.keys()))] == 0:
-                    for key in list(bracket.initial_seeding.keys()):
-                        bracket.initial_seeding[int(key)] = tournament.current_seeding[key]
-                        bracket.current_seeding[int(key)] = tournament.current_seeding[key]
-                    bracket.save()
+                seed_bracket_from_tournament(bracket, tournament)
 
                 next_matches = Match.objects.filter(
                     bracket=bracket, status=Match.StatusTypes.DRAFT, sequence_number=1
@@ -478,21 +733,7 @@ def populate_fixtures(tournament_id: int) -> None:
                 is_this_position_pool_seeds_cross_pool_matches_complete
                 and is_all_pool_matches_complete
             ):
-                if (
-                    position_pool.initial_seeding[next(iter(position_pool.initial_seeding.keys()))]
-                    == 0
-                ):
-                    for i, key in enumerate(list(position_pool.initial_seeding.keys())):
-                        position_pool.initial_seeding[int(key)] = tournament.current_seeding[key]
-                        position_pool.results[tournament.current_seeding[key]] = {
-                            "rank": i + 1,
-                            "wins": 0,
-                            "losses": 0,
-                            "draws": 0,
-                            "GF": 0,  # Goals For
-                            "GA": 0,  # Goals Against
-                        }
-                    position_pool.save()
+                seed_position_pool_from_tournament(position_pool, tournament)
 
                 next_matches = Match.objects.filter(
                     position_pool=position_pool, status=Match.StatusTypes.DRAFT
@@ -570,53 +811,231 @@ def populate_fixtures(tournament_id: int) -> None:
     ):
         tournament.status = Tournament.StatusTypes.COMPLETED
         tournament.save()
+        publish_tournament_event(tournament_id, "status", {"status": tournament.status})
 
+    bump_tournament_version(tournament_id)
 
-def update_tournament_spirit_rankings(tournament: Tournament) -> None:
-    spirit_ranking: list[dict[str, int | float]] = []
-    for team in tournament.teams.all():
-        team_matches = Match.objects.filter(tournament=tournament).filter(
-            Q(team_1=team) | Q(team_2=team)
+
+def propagate_fixtures(match: Match) -> list[Match]:
+    """
+    Incremental counterpart of populate_fixtures for a single completed match.
+
+    Only the rules that the completion of ``match`` can trigger are evaluated, and
+    the next matches of a seed are looked up in the MatchSeedSlot index, so the
+    cost no longer grows with the number of pools, brackets and matches in the
+    tournament. Every downstream match whose teams or status change is
+    written with a single bulk update, and the updated matches are returned.
+    """
+    tournament = Tournament.objects.get(id=match.tournament_id)
+    seeding = {int(k): int(v) for k, v in tournament.current_seeding.items()}
+    updated_matches: dict[int, Match] = {}
+
+    tournament_matches = Match.objects.filter(tournament=tournament)
+    is_all_pool_matches_complete = (
+        not tournament_matches.filter(pool__isnull=False)
+        .exclude(status=Match.StatusTypes.COMPLETED)
+        .exists()
+    )
+    cross_pool = CrossPool.objects.filter(tournament=tournament).first()
+    brackets = list(Bracket.objects.filter(tournament=tournament))
+    position_pools = list(PositionPool.objects.filter(tournament=tournament))
+    cross_pool_stage = MatchSeedSlot.StageTypes.CROSS_POOL
+
+    # Pool standings are final, so each of its seeds moves on to the stage it feeds
+    if match.pool is not None and (
+        not Match.objects.filter(pool=match.pool)
+        .exclude(status=Match.StatusTypes.COMPLETED)
+        .exists()
+    ):
+        seeds = list(map(int, match.pool.initial_seeding.keys()))
+        slots = list(
+            get_seed_slots(tournament.id, seeds)
+            .exclude(stage=MatchSeedSlot.StageTypes.POOL)
+            .filter(sequence_number__in=[1, 2])
         )
-        points = 0.0
-        self_points = 0.0
-        matches_count = 0
 
-        for match in team_matches:
-            if match.team_1 is None or match.team_2 is None:
-                continue
+        for seed in seeds:
+            seed_slots = [slot for slot in slots if slot.seed == seed]
+            # A seed goes to its first cross pool round, otherwise straight on to the
+            # bracket or position pool that it feeds
+            next_slots = (
+                [s for s in seed_slots if s.stage == cross_pool_stage and s.sequence_number == 1]
+                or [s for s in seed_slots if s.stage == cross_pool_stage]
+                or [s for s in seed_slots if s.stage != cross_pool_stage and s.sequence_number == 1]
+            )
+            for slot in next_slots:
+                next_match = updated_matches.get(slot.match_id, slot.match)
+                assign_seed_to_match(next_match, seed, seeding, updated_matches)
 
-            if (
-                match.team_1.id == team.id
-                and match.spirit_score_team_1
-                and match.self_spirit_score_team_1
+    if is_all_pool_matches_complete:
+        if cross_pool is not None:
+            if not cross_pool.initial_seeding:
+                cross_pool.initial_seeding = tournament.current_seeding
+                cross_pool.current_seeding = tournament.current_seeding
+                cross_pool.save()
+        else:
+            for bracket in brackets:
+                seed_bracket_from_tournament(bracket, tournament)
+
+            for position_pool in position_pools:
+                seed_position_pool_from_tournament(position_pool, tournament)
+
+    if cross_pool is not None:
+        # Both seeds of a cross pool match move on to the next round
+        if match.cross_pool_id is not None:
+            seeds = [match.placeholder_seed_1, match.placeholder_seed_2]
+            slots = list(
+                get_seed_slots(tournament.id, seeds).filter(
+                    Q(stage=cross_pool_stage, sequence_number=match.sequence_number + 1)
+                    | Q(
+                        stage__in=[
+                            MatchSeedSlot.StageTypes.BRACKET,
+                            MatchSeedSlot.StageTypes.POSITION_POOL,
+                        ],
+                        sequence_number=1,
+                    )
+                )
+            )
+
+            for seed in seeds:
+                seed_slots = [slot for slot in slots if slot.seed == seed]
+                next_slots = [s for s in seed_slots if s.stage == cross_pool_stage] or seed_slots
+                for slot in next_slots:
+                    next_match = updated_matches.get(slot.match_id, slot.match)
+                    assign_seed_to_match(next_match, seed, seeding, updated_matches)
+
+        # Brackets and position pools open up once all their seeds are out of the cross pool
+        open_cross_pool_seeds: set[int] = set()
+        for seeds_pair in (
+            tournament_matches.filter(cross_pool__isnull=False)
+            .exclude(status=Match.StatusTypes.COMPLETED)
+            .values_list("placeholder_seed_1", "placeholder_seed_2")
+        ):
+            open_cross_pool_seeds.update(seeds_pair)
+
+        ready_brackets = []
+        for bracket in brackets:
+            if open_cross_pool_seeds.isdisjoint(map(int, bracket.initial_seeding.keys())):
+                seed_bracket_from_tournament(bracket, tournament)
+                ready_brackets.append(bracket)
+
+        ready_position_pools = []
+        for position_pool in position_pools:
+            if is_all_pool_matches_complete and open_cross_pool_seeds.isdisjoint(
+                map(int, position_pool.initial_seeding.keys())
             ):
-                points += float(match.spirit_score_team_1.total)
-                self_points += float(match.self_spirit_score_team_1.total)
-
-                matches_count += 1
-            elif (
-                match.team_2.id == team.id
-                and match.spirit_score_team_2
-                and match.self_spirit_score_team_2
+                seed_position_pool_from_tournament(position_pool, tournament)
+                ready_position_pools.append(position_pool)
+
+        if ready_brackets or ready_position_pools:
+            draft_matches = get_tracked_matches(
+                tournament_matches.filter(status=Match.StatusTypes.DRAFT).filter(
+                    Q(bracket__in=ready_brackets, sequence_number=1)
+                    | Q(position_pool__in=ready_position_pools)
+                ),
+                updated_matches,
+            )
+            for next_match in draft_matches:
+                if next_match.status != Match.StatusTypes.DRAFT:
+                    continue
+
+                if next_match.team_1_id is None:
+                    next_match.team_1_id = seeding[next_match.placeholder_seed_1]
+                if next_match.team_2_id is None:
+                    next_match.team_2_id = seeding[next_match.placeholder_seed_2]
+                next_match.status = Match.StatusTypes.SCHEDULED
+                updated_matches[next_match.id] = next_match
+
+    # Bracket winners and losers move on to the next round of the same bracket
+    if match.bracket_id is not None:
+        next_matches = {
+            slot.match_id: updated_matches.get(slot.match_id, slot.match)
+            for slot in get_seed_slots(
+                tournament.id, [match.placeholder_seed_1, match.placeholder_seed_2]
+            ).filter(match__bracket_id=match.bracket_id, sequence_number=match.sequence_number + 1)
+        }
+        for next_match in next_matches.values():
+            if not assign_seed_to_match(
+                next_match, match.placeholder_seed_1, seeding, updated_matches
             ):
-                points += float(match.spirit_score_team_2.total)
-                self_points += float(match.self_spirit_score_team_2.total)
+                assign_seed_to_match(next_match, match.placeholder_seed_2, seeding, updated_matches)
+
+    if updated_matches:
+        now = timezone.now()
+        for updated_match in updated_matches.values():
+            updated_match.updated_at = now
+
+        Match.objects.bulk_update(
+            updated_matches.values(), ["team_1", "team_2", "status", "updated_at"]
+        )
+        publish_tournament_event(
+            tournament.id, "fixtures", {"match_ids": sorted(updated_matches.keys())}
+        )
+
+    if not tournament_matches.exclude(status=Match.StatusTypes.COMPLETED).exists():
+        tournament.status = Tournament.StatusTypes.COMPLETED
+        tournament.save(update_fields=["status", "updated_at"])
+        publish_tournament_event(tournament.id, "status", {"status": tournament.status})
+
+    bump_tournament_version(tournament.id)
+    return list(updated_matches.values())
+
+
+def update_tournament_spirit_rankings(tournament: Tournament) -> None:
+    team_ids = list(tournament.teams.values_list("id", flat=True))
+    points = {team_id: 0.0 for team_id in team_ids}
+    self_points = {team_id: 0.0 for team_id in team_ids}
+    matches_count = {team_id: 0 for team_id in team_ids}
 
-                matches_count += 1
+    # Spirit totals of both teams of every match, joined in a single query
+    matches = Match.objects.filter(
+        tournament=tournament, team_1__isnull=False, team_2__isnull=False
+    ).values_list(
+        "team_1_id",
+        "spirit_score_team_1__total",
+        "self_spirit_score_team_1__total",
+        "team_2_id",
+        "spirit_score_team_2__total",
+        "self_spirit_score_team_2__total",
+    )
+
+    spirit_totals: list[tuple[int, int | None, int | None]] = []
+    for team_1_id, total_1, self_total_1, team_2_id, total_2, self_total_2 in matches:
+        spirit_totals.append((team_1_id, total_1, self_total_1))
+        spirit_totals.append((team_2_id, total_2, self_total_2))
+
+    for team_id, total, self_total in spirit_totals:
+        if team_id not in matches_count or total is None or self_total is None:
+            continue
 
+        points[team_id] += float(total)
+        self_points[team_id] += float(self_total)
+        matches_count[team_id] += 1
+
+    spirit_ranking: list[dict[str, int | float]] = []
+    for team_id in team_ids:
+        count = matches_count[team_id]
         spirit_ranking.append(
             {
-                "team_id": team.id,
-                "points": round(points / matches_count, ndigits=1) if matches_count > 0 else points,
-                "self_points": round(self_points / matches_count, ndigits=1)
-                if matches_count > 0
-                else self_points,
+                "team_id": team_id,
+                "points": round(points[team_id] / count, ndigits=1) if count > 0 else 0.0,
+                "self_points": round(self_points[team_id] / count, ndigits=1) if count > 0 else 0.0,
             }
         )
 
     tournament.spirit_ranking = rank_spirit_scores(spirit_ranking)
-    tournament.save()
+    # Only the rankings are saved, so that the seeding of results applied meanwhile is kept
+    tournament.save(update_fields=["spirit_ranking", "updated_at"])
+
+    bump_tournament_version(tournament.id)
+
+
+def bump_tournament_version(*tournament_ids: int) -> None:
+    """
+    Mark a change to the public data of tournaments, which invalidates their cached pages.
+    Runs in the caller's transaction, so that the new version is only seen with the change.
+    """
+    Tournament.objects.filter(id__in=tournament_ids).update(version=F("version") + 1)
 
 
 def user_tournament_teams(tournament: Tournament, user: User) -> tuple[int | None, set[int]]:
@@ -668,83 +1087,133 @@ def get_default_rules() -> str:
 
 
 def calculate_head_to_head_stats(
-    result1: dict[str, int], result2: dict[str, int], tournament_id: int
+    result1: dict[str, int], result2: dict[str, int], head_to_head: HeadToHeadMatrix
 ) -> tuple[dict[int, int], dict[int, int], dict[int, int]]:
-    matches = Match.objects.filter(
-        Q(
-            team_1=result1["id"],
-            team_2=result2["id"],
-            tournament=tournament_id,
-            status=Match.StatusTypes.COMPLETED,
-        )
-        | Q(
-            team_2=result1["id"],
-            team_1=result2["id"],
-            tournament=tournament_id,
-            status=Match.StatusTypes.COMPLETED,
-        )
-    )
-
     wins = {result1["id"]: 0, result2["id"]: 0}
     goal_diff = {result1["id"]: 0, result2["id"]: 0}  # Goal Diff
     goal_for = {result1["id"]: 0, result2["id"]: 0}  # Goals For
 
-    for match in matches:
-        if match.team_1 is None or match.team_2 is None:
+    for team_id, opponent_id in ((result1["id"], result2["id"]), (result2["id"], result1["id"])):
+        stats = head_to_head.get((team_id, opponent_id))
+        if stats is None:
             continue
 
-        if match.team_1.id == result1["id"]:
-            if match.score_team_1 > match.score_team_2:
-                wins[result1["id"]] += 1
-            elif match.score_team_2 > match.score_team_1:
-                wins[result2["id"]] += 1
-
-            goal_diff[result1["id"]] += match.score_team_1 - match.score_team_2
-            goal_diff[result2["id"]] += match.score_team_2 - match.score_team_1
-
-            goal_for[result1["id"]] += match.score_team_1
-            goal_for[result2["id"]] += match.score_team_2
-        else:
-            if match.score_team_2 > match.score_team_1:
-                wins[result1["id"]] += 1
-            elif match.score_team_1 > match.score_team_2:
-                wins[result2["id"]] += 1
-
-            goal_diff[result1["id"]] += match.score_team_2 - match.score_team_1
-            goal_diff[result2["id"]] += match.score_team_1 - match.score_team_2
-
-            goal_for[result1["id"]] += match.score_team_2
-            goal_for[result2["id"]] += match.score_team_1
+        wins[team_id] += stats["wins"]
+        goal_diff[team_id] += stats["gd"]
+        goal_for[team_id] += stats["gf"]
 
     return wins, goal_diff, goal_for
 
 
 def create_bracket_sequence_matches(
     tournament: Tournament, bracket: Bracket, start: int, end: int, seq_num: int
-) -> None:
+) -> list[Match]:
+    matches = []
     for i in range(0, ((end - start) + 1) // 2):
         seed_1 = start + i
         seed_2 = end - i
 
-        match = Match(
-            name=get_bracket_match_name(start, end, seed_1, seed_2),
-            tournament=tournament,
-            bracket=bracket,
-            sequence_number=seq_num,
-            placeholder_seed_1=seed_1,
-            placeholder_seed_2=seed_2,
+        matches.append(
+            Match(
+                name=get_bracket_match_name(start, end, seed_1, seed_2),
+                tournament=tournament,
+                bracket=bracket,
+                sequence_number=seq_num,
+                placeholder_seed_1=seed_1,
+                placeholder_seed_2=seed_2,
+            )
         )
 
-        match.save()
-
     if end - start > 1:
-        create_bracket_sequence_matches(
+        matches += create_bracket_sequence_matches(
             tournament, bracket, start, start + (((end - start) + 1) // 2) - 1, seq_num + 1
         )
-        create_bracket_sequence_matches(
+        matches += create_bracket_sequence_matches(
             tournament, bracket, start + (((end - start) + 1) // 2), end, seq_num + 1
         )
 
+    return matches
+
+
+def bulk_create_matches(matches: list[Match]) -> list[Match]:
+    """Insert the fixtures of a stage and their seed index entries in one transaction"""
+    with transaction.atomic():
+        created_matches = Match.objects.bulk_create(matches)
+        index_match_seeds(created_matches)
+
+    return created_matches
+
+
+def get_match_stage(match: Match) -> str | None:
+    if match.pool_id is not None:
+        return MatchSeedSlot.StageTypes.POOL
+    if match.cross_pool_id is not None:
+        return MatchSeedSlot.StageTypes.CROSS_POOL
+    if match.bracket_id is not None:
+        return MatchSeedSlot.StageTypes.BRACKET
+    if match.position_pool_id is not None:
+        return MatchSeedSlot.StageTypes.POSITION_POOL
+    return None
+
+
+def get_tracked_matches(matches: QuerySet[Match], updated_matches: dict[int, Match]) -> list[Match]:
+    """Evaluate ``matches``, reusing instances already modified in this propagation"""
+    return [updated_matches.get(m.id, m) for m in matches]
+
+
+def assign_seed_to_match(
+    match: Match, seed: int, seeding: dict[int, int], updated_matches: dict[int, Match]
+) -> bool:
+    """
+    Put the team currently holding ``seed`` into the empty slot of ``match`` fed by
+    that seed, and schedule the match once both teams are known.
+
+    Returns whether a team slot was filled.
+    """
+    is_slot_filled = False
+    if match.placeholder_seed_1 == seed and match.team_1_id is None:
+        match.team_1_id = seeding[seed]
+        is_slot_filled = True
+    elif match.placeholder_seed_2 == seed and match.team_2_id is None:
+        match.team_2_id = seeding[seed]
+        is_slot_filled = True
+
+    if (
+        match.status == Match.StatusTypes.DRAFT
+        and match.team_1_id is not None
+        and match.team_2_id is not None
+    ):
+        match.status = Match.StatusTypes.SCHEDULED
+        updated_matches[match.id] = match
+
+    if is_slot_filled:
+        updated_matches[match.id] = match
+
+    return is_slot_filled
+
+
+def seed_bracket_from_tournament(bracket: Bracket, tournament: Tournament) -> None:
+    if bracket.initial_seeding[next(iter(bracket.initial_seeding.keys()))] == 0:
+        for key in list(bracket.initial_seeding.keys()):
+            bracket.initial_seeding[int(key)] = tournament.current_seeding[key]
+            bracket.current_seeding[int(key)] = tournament.current_seeding[key]
+        bracket.save()
+
+
+def seed_position_pool_from_tournament(position_pool: PositionPool, tournament: Tournament) -> None:
+    if position_pool.initial_seeding[next(iter(position_pool.initial_seeding.keys()))] == 0:
+        for i, key in enumerate(list(position_pool.initial_seeding.keys())):
+            position_pool.initial_seeding[int(key)] = tournament.current_seeding[key]
+            position_pool.results[tournament.current_seeding[key]] = {
+                "rank": i + 1,
+                "wins": 0,
+                "losses": 0,
+                "draws": 0,
+                "GF": 0,  # Goals For
+                "GA": 0,  # Goals Against
+            }
+        position_pool.save()
+
 
 def rank_spirit_scores(scores: list[dict[str, int | float]]) -> list[dict[str, int | float]]:
     spirit_points = sorted({r["points"] for r in scores}, reverse=True)
@@ -770,10 +1239,10 @@ def update_for_pool_or_position_pool(match: Match, pool: Pool | PositionPool) ->
     )
 
     pool.results = new_results
-    pool.save()
+    pool.save(update_fields=["results"])
 
     match.tournament.current_seeding = new_tournament_seeding
-    match.tournament.save()
+    match.tournament.save(update_fields=["current_seeding", "updated_at"])
 
 
 def update_for_bracket_or_cross_pool(
@@ -781,11 +1250,11 @@ def update_for_bracket_or_cross_pool(
 ) -> None:
     seeding = bracket_or_cross_pool.current_seeding
     bracket_or_cross_pool.current_seeding = get_new_bracket_seeding(seeding, match)
-    bracket_or_cross_pool.save()
+    bracket_or_cross_pool.save(update_fields=["current_seeding"])
 
     tournament_seeding = match.tournament.current_seeding
     match.tournament.current_seeding = get_new_bracket_seeding(tournament_seeding, match)
-    match.tournament.save()
+    match.tournament.save(update_fields=["current_seeding", "updated_at"])
 
 
 def validate_seeds_and_teams(
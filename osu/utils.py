@@ -1,5 +1,21 @@
+import binascii
+import json
+import random
+import time
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from collections.abc import Callable
+from typing import Any, TypeVar
+
+from django.db import OperationalError, connection, transaction
 from django.template.defaultfilters import slugify
 
+T = TypeVar("T")
+
+# Runs of a transaction that conflicts with concurrent ones, and the base of the random
+# exponential backoff between them
+TRANSACTION_ATTEMPTS = 5
+TRANSACTION_RETRY_SECONDS = 0.05
+
 
 def slugify_max(text: str, max_length: int = 50) -> str:
     slug = slugify(text)
@@ -10,3 +26,40 @@ def slugify_max(text: str, max_length: int = 50) -> str:
         return trimmed_slug
     # First word is > max_length chars, so we have to break it
     return slug[:max_length]
+
+
+def encode_cursor(values: list[Any]) -> str:
+    """Opaque pagination cursor from the sort key values of the last row of a page"""
+    return urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+
+def decode_cursor(cursor: str, length: int) -> list[Any]:
+    """Sort key values of a cursor, raises ValueError if it was not made by encode_cursor"""
+    try:
+        values = json.loads(urlsafe_b64decode(cursor.encode()))
+    except (binascii.Error, UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError("Invalid cursor") from e
+
+    if not isinstance(values, list) or len(values) != length:
+        raise ValueError("Invalid cursor")
+
+    return values
+
+
+def atomic_with_retries(func: Callable[[], T], attempts: int = TRANSACTION_ATTEMPTS) -> T:
+    """
+    Run the function in a transaction, and run it again if the transaction conflicts with a
+    concurrent one: SQLite fails a write while another connection holds the write lock, and
+    PostgreSQL fails one of two transactions that deadlock. Within an outer transaction, the
+    conflict is raised for the outer transaction to handle.
+    """
+    for attempt in range(attempts):
+        try:
+            with transaction.atomic():
+                return func()
+        except OperationalError:
+            if attempt == attempts - 1 or connection.in_atomic_block:
+                raise
+            time.sleep(random.uniform(0, TRANSACTION_RETRY_SECONDS * 2**attempt))  # noqa: S311
+
+    raise ValueError("A transaction needs at least one attempt")
@@ -0,0 +1,205 @@
+"""
+Optional serialization of the requests that write to the database, across server processes.
+
+SQLite lets one connection write at a time, and the others wait for it in a busy loop that
+favours no one, so at peak a writer can wait out its busy timeout and fail. With
+SERIALIZE_WRITES, requests with unsafe methods and the jobs of the worker instead wait for
+their turn in a first in, first out queue shared by the processes of the machine, and write
+to the database alone. Requests with safe methods are not queued, and still read in parallel.
+
+The queue is a directory with a file per waiting writer, named after a ticket that is taken
+under a file lock. Each writer holds a lock on its own file until it is done, and waits for
+the writer just ahead of it by trying to lock that one's file, with a backoff between tries
+that grows from WRITE_QUEUE_POLL_SECONDS to WRITE_QUEUE_MAX_POLL_SECONDS. The lock is free
+once that writer is done, or once its process exited, since the kernel releases the locks of
+a process that exits, so files left by crashes and restarts are removed by the writers
+behind them. A writer that waits longer than WRITE_QUEUE_TIMEOUT_SECONDS gives up, which is a
+503 for a request.
+
+Each turn reports the depth of the queue it joined and how long it waited, in the
+Server-Timing header of its response and in the log.
+"""
+import fcntl
+import logging
+import threading
+import time
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO
+
+from django.conf import settings
+from django.http import HttpRequest, JsonResponse
+from django.http.response import HttpResponseBase
+
+logger = logging.getLogger(__name__)
+
+SAFE_METHODS = ["GET", "HEAD", "OPTIONS", "TRACE"]
+TICKET_FILE = "ticket"
+
+# Turns already held by the threads, so that writes nested in a turn do not wait for it
+_held = threading.local()
+
+
+@dataclass
+class WriteTurn:
+    depth: int
+    wait_seconds: float
+
+    def server_timing(self) -> str:
+        return f'write-queue;dur={self.wait_seconds * 1000:.1f};desc="depth {self.depth}"'
+
+
+class WriteQueueTimeoutError(Exception):
+    pass
+
+
+@dataclass
+class QueueEntry:
+    """File of a writer in the queue, held open with a lock while the writer is in it"""
+
+    path: Path
+    file: IO[bytes]
+
+    def leave(self) -> None:
+        self.path.unlink(missing_ok=True)
+        # Closing the file releases the lock, which the writer behind waits for
+        self.file.close()
+
+
+class WriteQueue:
+    """First in, first out queue of the writers of the processes that share a directory"""
+
+    def __init__(
+        self,
+        path: Path,
+        poll_seconds: float,
+        timeout_seconds: float,
+        max_poll_seconds: float = 0.05,
+    ) -> None:
+        self.path = path
+        self.poll_seconds = poll_seconds
+        self.max_poll_seconds = max_poll_seconds
+        self.timeout_seconds = timeout_seconds
+
+    def join(self) -> QueueEntry:
+        """Take the next ticket, and add the file of the writer that holds it, locked"""
+        self.path.mkdir(parents=True, exist_ok=True)
+        with open(self.path / TICKET_FILE, "a+") as ticket_file:
+            fcntl.flock(ticket_file, fcntl.LOCK_EX)
+            ticket_file.seek(0)
+            ticket = int(ticket_file.read() or 0)
+            ticket_file.seek(0)
+            ticket_file.truncate()
+            ticket_file.write(str(ticket + 1))
+            ticket_file.flush()
+
+            # Locked before the ticket is released, so that no writer behind sees it unlocked
+            path = self.path / f"{ticket:020d}"
+            file = open(path, "wb")  # noqa: SIM115
+            fcntl.flock(file, fcntl.LOCK_EX)
+        return QueueEntry(path, file)
+
+    def waiting(self) -> list[Path]:
+        """Files of the writers in the queue, in order"""
+        return sorted(entry for entry in self.path.iterdir() if entry.name != TICKET_FILE)
+
+    def wait_for(self, predecessor: Path, deadline: float) -> None:
+        """Wait until the writer of the file is done or gone, and remove its file"""
+        try:
+            file = open(predecessor, "rb")  # noqa: SIM115
+        except FileNotFoundError:
+            return
+
+        with file:
+            delay = self.poll_seconds
+            while True:
+                try:
+                    fcntl.flock(file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                    break
+                except BlockingIOError:
+                    if time.perf_counter() > deadline:
+                        raise WriteQueueTimeoutError(
+                            f"No turn to write after {self.timeout_seconds} s"
+                        ) from None
+                    time.sleep(delay)
+                    delay = min(delay * 2, self.max_poll_seconds)
+            # Left by a writer whose process exited, if it is still there
+            predecessor.unlink(missing_ok=True)
+
+    @contextmanager
+    def turn(self) -> Iterator[WriteTurn]:
+        """Wait for the writers ahead in the queue, and hold the turn until the block exits"""
+        start = time.perf_counter()
+        deadline = start + self.timeout_seconds
+        entry = self.join()
+        try:
+            ahead = [path for path in self.waiting() if path.name < entry.path.name]
+            depth = len(ahead) + 1
+            while ahead:
+                self.wait_for(ahead[-1], deadline)
+                # Writers further ahead may still be in the queue, if the one just ahead exited
+                ahead = [path for path in self.waiting() if path.name < entry.path.name]
+
+            yield WriteTurn(depth=depth, wait_seconds=time.perf_counter() - start)
+        finally:
+            entry.leave()
+
+
+def get_write_queue() -> WriteQueue:
+    return WriteQueue(
+        Path(settings.WRITE_QUEUE_DIR),
+        settings.WRITE_QUEUE_POLL_SECONDS,
+        settings.WRITE_QUEUE_TIMEOUT_SECONDS,
+        settings.WRITE_QUEUE_MAX_POLL_SECONDS,
+    )
+
+
+@contextmanager
+def serialized_writes() -> Iterator[WriteTurn | None]:
+    """
+    Hold a turn of the write queue with SERIALIZE_WRITES, or nothing without it. The turn is
+    None as well within a turn the thread holds already. Raises WriteQueueTimeoutError when the
+    turn does not come in time.
+    """
+    if not settings.SERIALIZE_WRITES or getattr(_held, "turn", False):
+        yield None
+        return
+
+    with get_write_queue().turn() as turn:
+        log = (
+            logger.warning
+            if turn.wait_seconds >= settings.WRITE_QUEUE_SLOW_SECONDS
+            else logger.debug
+        )
+        log("Write waited %.1f ms in a queue of %d", turn.wait_seconds * 1000, turn.depth)
+        _held.turn = True
+        try:
+            yield turn
+        finally:
+            _held.turn = False
+
+
+class WriteQueueMiddleware:
+    """Handle requests with unsafe methods in turns of the write queue"""
+
+    def __init__(self, get_response: Callable[[HttpRequest], HttpResponseBase]) -> None:
+        self.get_response = get_response
+
+    def __call__(self, request: HttpRequest) -> HttpResponseBase:
+        if request.method in SAFE_METHODS:
+            return self.get_response(request)
+
+        try:
+            with serialized_writes() as turn:
+                response = self.get_response(request)
+        except WriteQueueTimeoutError:
+            logger.exception("Write gave up waiting for its turn")
+            response = JsonResponse({"message": "The server is busy, try again"}, status=503)
+            response["Retry-After"] = "1"
+            return response
+
+        if turn is not None:
+            response["Server-Timing"] = turn.server_timing()
+        return response